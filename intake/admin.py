@@ -4,7 +4,14 @@ from intake import models
 
 @admin.register(models.FillablePDF)
 class FillablePDFAdmin(admin.ModelAdmin):
-    pass
+    exclude = ['pdf_hash', 'field_data']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # parse the fields of a newly uploaded pdf up front, rather than on
+        # the first fill
+        if obj.pdf:
+            obj.get_field_data()
 
 
 @admin.register(models.County)
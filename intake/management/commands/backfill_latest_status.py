@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from intake import models
+
+
+class Command(BaseCommand):
+    help = str(
+        "Recomputes each application's latest status update, latest status "
+        "type and status update count from its status updates")
+
+    def handle(self, *args, **options):
+        count = models.Application.refresh_latest_status()
+        models.ApplicationCounts.refresh(
+            models.ApplicationCounts.objects.values_list(
+                'organization_id', flat=True))
+        self.stdout.write(self.style.SUCCESS(
+            "Updated {} applications".format(count)))
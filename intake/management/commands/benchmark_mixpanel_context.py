@@ -0,0 +1,119 @@
+import json
+import time
+
+import user_agents
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from intake.serializers import (
+    ApplicantMixpanelSerializer, RequestSerializer, ViewMixpanelSerializer)
+from intake.services import event_buffer as EventBufferService
+import intake.services.events_service as EventsService
+from intake.tests.factories import FormSubmissionWithOrgsFactory
+from user_accounts.models import Organization
+from user_accounts.serializers import UserMixpanelSerializer
+from user_accounts.tests.factories import app_reviewer
+
+
+USER_AGENT = str(
+    'Mozilla/5.0 (Linux; Android 6.0.1; Z831 Build/MMB29M) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.83 '
+    'Mobile Safari/537.36')
+
+
+class BenchmarkView:
+    pass
+
+
+def drf_event_data(view, applicant):
+    data = ViewMixpanelSerializer(view).data
+    data.update(RequestSerializer(view.request).data)
+    data.update(UserMixpanelSerializer(view.request.user).data)
+    data.update(ApplicantMixpanelSerializer(applicant).data)
+    return data
+
+
+def plain_event_data(view, applicant):
+    data = EventsService.mixpanel_view_data(view)
+    data.update(EventsService.mixpanel_request_data(view.request))
+    data.update(EventsService.mixpanel_user_data(view.request.user))
+    data.update(EventsService.mixpanel_applicant_data(applicant))
+    return data
+
+
+def memoized_event_data(view, applicant):
+    return dict(
+        **EventsService.applicant_context(applicant),
+        **EventsService.mixpanel_data_from_view_request_user(view))
+
+
+def run_benchmark(name, get_event_data, view, applicants, repeat,
+                  collect=False):
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        if collect:
+            EventBufferService.start_collecting()
+        for applicant in applicants:
+            get_event_data(view, applicant)
+        if collect:
+            # no events were added, so nothing is sent
+            EventBufferService.publish_collected()
+        timings.append(time.perf_counter() - start)
+    event_count = len(applicants)
+    return dict(
+        name=name,
+        event_count=event_count,
+        repeat=repeat,
+        seconds_per_event=min(timings) / event_count,
+        mean_seconds_per_event=sum(timings) / len(timings) / event_count)
+
+
+class Command(BaseCommand):
+    help = str(
+        "Times building the mixpanel context data of events, like "
+        "`apps_opened` does for each application, with the DRF "
+        "serializers, with the plain dict serializers, and with the "
+        "plain serializers memoized for the request. Prints the results "
+        "as JSON. Nothing is saved to the database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event-count', type=int, default=100,
+            help='number of events to build, one per application')
+        parser.add_argument(
+            '--repeat', type=int, default=10,
+            help='times to run each benchmark, the fastest run is reported')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = self.run_benchmarks(**options)
+            transaction.set_rollback(True)
+        self.stdout.write(json.dumps(dict(results=results), indent=2))
+
+    def run_benchmarks(self, event_count, repeat, **options):
+        sf_pubdef = Organization.objects.get(slug='sf_pubdef')
+        submissions = [
+            FormSubmissionWithOrgsFactory(organizations=[sf_pubdef])
+            for i in range(event_count)]
+        applicants = [sub.applicant for sub in submissions]
+        request = RequestFactory().get(
+            '/applications/', HTTP_USER_AGENT=USER_AGENT)
+        request.user = app_reviewer('sf_pubdef').user
+        request.user_agent = user_agents.parse(USER_AGENT)
+        request.visitor = applicants[0].visitor
+        request.LANGUAGE_CODE = 'en'
+        view = BenchmarkView()
+        view.request = request
+        return [
+            run_benchmark(
+                'drf_serializers', drf_event_data, view, applicants,
+                repeat),
+            run_benchmark(
+                'plain_serializers', plain_event_data, view, applicants,
+                repeat),
+            run_benchmark(
+                'memoized_per_request', memoized_event_data, view,
+                applicants, repeat, collect=True),
+        ]
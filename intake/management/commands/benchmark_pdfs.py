@@ -0,0 +1,189 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from intake import pdfparser
+from intake.models import get_parser
+from intake.services import pdf_service as PDFService
+from intake.tests import mock
+from intake.tests.factories import FormSubmissionWithOrgsFactory
+from user_accounts.models import Organization
+
+
+DEFAULT_CONCAT_SIZES = [1, 10, 100, 500]
+
+
+class Measurement:
+    """Counts the pdfparser subprocesses and temporary file bytes used while
+    running a benchmark
+    """
+
+    def __init__(self):
+        self.subprocess_count = 0
+        self.tmp_file_bytes = 0
+
+    def count_popen(self, original):
+        def popen(*args, **kwargs):
+            self.subprocess_count += 1
+            return original(*args, **kwargs)
+        return popen
+
+    def count_tmp_files(self, original):
+        def clean_up_tmp_files(parser):
+            for path in parser._tmp_files:
+                if os.path.exists(path):
+                    self.tmp_file_bytes += os.path.getsize(path)
+            return original(parser)
+        return clean_up_tmp_files
+
+    @contextmanager
+    def patches(self):
+        popen = patch.object(
+            pdfparser.subprocess, 'Popen',
+            self.count_popen(subprocess.Popen))
+        clean_up = patch.object(
+            pdfparser.PDFParser, 'clean_up_tmp_files',
+            self.count_tmp_files(pdfparser.PDFParser.clean_up_tmp_files))
+        with popen, clean_up:
+            yield
+
+
+def reset_peak_rss():
+    """Resets the peak resident set size of this process so that it can be
+    measured for one benchmark. This is only possible on Linux, returns
+    whether it was reset.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def get_peak_rss_kb():
+    """Returns the peak resident set size of this process since it was last
+    reset
+    """
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+
+
+def run_benchmark(name, func, repeat=1, **params):
+    measurement = Measurement()
+    timings = []
+    can_measure_rss = reset_peak_rss()
+    with measurement.patches():
+        for i in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return dict(
+        name=name,
+        params=params,
+        repeat=repeat,
+        wall_time_seconds=min(timings),
+        mean_wall_time_seconds=sum(timings) / len(timings),
+        subprocess_count=measurement.subprocess_count // repeat,
+        tmp_file_bytes=measurement.tmp_file_bytes // repeat,
+        peak_rss_kb=get_peak_rss_kb() if can_measure_rss else None)
+
+
+class Command(BaseCommand):
+    help = str(
+        "Times filling, joining and printing pdfs for synthetic "
+        "submissions against the sample fillable pdf, and prints the "
+        "results as JSON. Nothing is saved to the database or to file "
+        "storage. Peak memory is only measured on Linux, and does not "
+        "include the pdfparser subprocesses.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concat-sizes', type=int, nargs='+',
+            default=DEFAULT_CONCAT_SIZES,
+            help='numbers of pdfs to join')
+        parser.add_argument(
+            '--batch-size', type=int, default=10,
+            help='number of submissions to fill, bundle and print at once')
+        parser.add_argument(
+            '--repeat', type=int, default=1,
+            help='times to run each benchmark, the fastest run is reported')
+        parser.add_argument(
+            '--output', help='write the JSON results to this file')
+
+    def handle(self, *args, **options):
+        media_root = tempfile.mkdtemp()
+        try:
+            with override_settings(
+                    MEDIA_ROOT=media_root,
+                    DEFAULT_FILE_STORAGE=(
+                        'django.core.files.storage.FileSystemStorage')):
+                with transaction.atomic():
+                    results = self.run_benchmarks(**options)
+                    transaction.set_rollback(True)
+        finally:
+            shutil.rmtree(media_root)
+        output = json.dumps(dict(results=results), indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def run_benchmarks(
+            self, concat_sizes, batch_size, repeat, **options):
+        sf_pubdef = Organization.objects.get(slug='sf_pubdef')
+        fillable = mock.fillable_pdf(organization=sf_pubdef)
+        submissions = [
+            FormSubmissionWithOrgsFactory(organizations=[sf_pubdef])
+            for i in range(batch_size)]
+        apps = [sub.applications.first() for sub in submissions]
+        # bundles are built from filled pdfs, and filling them there would
+        # email the admins about the missing pdfs
+        PDFService.fill_pdfs_for_applications(apps)
+        # parse the field data up front, as happens when it is uploaded
+        fillable.get_field_data()
+        filled_pdf = fillable.fill(submissions[0])
+        printout_args = [
+            PDFService.get_printout_args_for_application(app)
+            for app in apps]
+        results = [
+            run_benchmark(
+                'single_fill', lambda: fillable.fill(submissions[0]),
+                repeat),
+            run_benchmark(
+                'batch_fill', lambda: fillable.fill_many(submissions),
+                repeat, count=batch_size),
+        ]
+        for size in concat_sizes:
+            results.append(run_benchmark(
+                'concat',
+                lambda: get_parser().join_pdfs([filled_pdf] * size),
+                repeat, count=size))
+        results.extend([
+            run_benchmark(
+                'create_new_pdf_bundle_for_apps',
+                lambda: PDFService.create_new_pdf_bundle_for_apps(
+                    sf_pubdef, apps),
+                repeat, count=batch_size),
+            run_benchmark(
+                'render_printout',
+                lambda: PDFService.render_printout(printout_args[0]),
+                repeat),
+            run_benchmark(
+                'render_printouts',
+                lambda: PDFService.render_printouts(printout_args),
+                repeat, count=batch_size),
+        ])
+        return results
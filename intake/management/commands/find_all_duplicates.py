@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 from intake import models
+from intake.utils import UnionFind
 import intake.services.submissions as SubmissionsService
 
 
@@ -10,42 +12,61 @@ class Command(BaseCommand):
         "DuplicateSubmissionSet objects")
 
     def handle(self, *args, **options):
-        dup_sets = SubmissionsService.find_duplicates(
+        dup_id_sets = SubmissionsService.find_duplicate_id_sets(
             models.FormSubmission.objects.all())
-        self.stdout.write("Found {} duplicate sets".format(len(dup_sets)))
-        existing_dup_sets = models.DuplicateSubmissionSet.objects.all()
+        self.stdout.write("Found {} duplicate sets".format(len(dup_id_sets)))
+        existing_set_ids = dict(models.FormSubmission.objects.filter(
+            duplicate_set_id__isnull=False
+        ).values_list('id', 'duplicate_set_id'))
         self.stdout.write("{} duplicate sets already exist".format(
-            existing_dup_sets.count()))
+            len(set(existing_set_ids.values()))))
+        # merge found sets with existing sets that they overlap
+        groups = UnionFind()
+        found_ids = set()
+        for dup_id_set in dup_id_sets:
+            found_ids |= dup_id_set
+            first, *others = dup_id_set
+            for sub_id in others:
+                groups.union(first, sub_id)
+        for sub_id, dup_set_id in existing_set_ids.items():
+            groups.union(('set', dup_set_id), sub_id)
         count_already_existed = 0
-        dup_set_extensions = {}
+        count_extended = 0
         new_dup_sets = []
-        existing_dup_set_lookups = {
-            frozenset(dup_set.submissions.all()): dup_set
-            for dup_set in existing_dup_sets
-        }
-        for dup_set in dup_sets:
-            found_existing = False
-            for lookup_set, existing in existing_dup_set_lookups.items():
-                if dup_set == lookup_set:
-                    found_existing = True
+        with transaction.atomic():
+            for group in groups.get_sets(min_size=2):
+                sub_ids = {
+                    item for item in group if not isinstance(item, tuple)}
+                if not sub_ids & found_ids:
+                    continue
+                dup_set_ids = sorted(
+                    item[1] for item in group if isinstance(item, tuple))
+                if not dup_set_ids:
+                    new_dup_sets.append(sub_ids)
+                    continue
+                unlinked_ids = {
+                    sub_id for sub_id in sub_ids
+                    if existing_set_ids.get(sub_id) != dup_set_ids[0]}
+                if not unlinked_ids:
                     count_already_existed += 1
-                    break
-                elif dup_set & lookup_set:
-                    dup_set_extensions[existing] = dup_set
-                    found_existing = True
-                    break
-            if not found_existing:
-                new_dup_sets.append(dup_set)
-        for existing, new_dups in dup_set_extensions:
-            existing.submissions.add(*new_dups)
-        self.stdout.write(
-            "{} found duplicate sets were existing".format(
-                count_already_existed))
-        self.stdout.write("Extended {} existing duplicate sets".format(
-            len(dup_set_extensions)))
-        for new_set in new_dup_sets:
-            new_dup_set_object = models.DuplicateSubmissionSet()
-            new_dup_set_object.save()
-            new_dup_set_object.submissions.add(*new_set)
+                    continue
+                count_extended += 1
+                # move everything into the oldest existing set
+                models.FormSubmission.objects.filter(
+                    id__in=unlinked_ids
+                ).update(duplicate_set_id=dup_set_ids[0])
+                models.DuplicateSubmissionSet.objects.filter(
+                    id__in=dup_set_ids[1:]).delete()
+            self.stdout.write(
+                "{} found duplicate sets were existing".format(
+                    count_already_existed))
+            self.stdout.write("Extended {} existing duplicate sets".format(
+                count_extended))
+            for new_set in new_dup_sets:
+                new_dup_set_object = models.DuplicateSubmissionSet()
+                new_dup_set_object.save()
+                models.FormSubmission.objects.filter(
+                    id__in=new_set
+                ).update(duplicate_set_id=new_dup_set_object.id)
         self.stdout.write("Created {} new duplicate sets".format(
             len(new_dup_sets)))
@@ -9,3 +9,5 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         management.call_command('migrate')
         management.call_command('load_essential_data')
+        management.call_command(
+            'refresh_weekly_application_counts', full=True)
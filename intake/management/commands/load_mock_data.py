@@ -1,6 +1,9 @@
 from django.core import management
 from django.core.management.base import BaseCommand
+from intake import models
 from intake.models import pdfs
+from intake.services import search_service as SearchService
+from intake.services import statistics
 from intake.tests import mock
 from project.fixtures_index import ALL_MOCK_DATA_FIXTURES
 
@@ -12,5 +15,9 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         management.call_command(
             'loaddata', *ALL_MOCK_DATA_FIXTURES)
+        # loaddata bypasses FormSubmission.save and StatusUpdate.save
+        SearchService.update_search_text(models.FormSubmission.objects.all())
+        models.Application.refresh_latest_status()
+        statistics.refresh_weekly_application_counts(full=True)
         if pdfs.FillablePDF.objects.count() == 0:
             mock.fillable_pdf()
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from intake import models
+from user_accounts.models import Organization
+
+
+class Command(BaseCommand):
+    help = str(
+        "Recounts the application index tab counts for every organization, "
+        "to correct any drift from changes made outside of the app")
+
+    def handle(self, *args, **options):
+        counts = models.ApplicationCounts.refresh(
+            Organization.objects.values_list('id', flat=True))
+        self.stdout.write(self.style.SUCCESS(
+            "Recounted applications for {} organizations".format(
+                len(counts))))
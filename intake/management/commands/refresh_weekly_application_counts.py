@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from intake.services import statistics
+
+
+class Command(BaseCommand):
+    help = str(
+        "Recounts applications per organization and week for the stats "
+        "page. Only recent weeks are recounted unless --full is given.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true', default=False,
+            help='recount every week, to account for deleted applications')
+
+    def handle(self, *args, **options):
+        count = statistics.refresh_weekly_application_counts(
+            full=options['full'])
+        self.stdout.write(
+            self.style.SUCCESS("Saved {} weekly counts".format(count)))
@@ -1,9 +1,11 @@
 import logging
 from urllib.parse import urlparse
+from django.utils.functional import SimpleLazyObject
 
-from intake.models import Visitor
+from intake.utils import parse_user_agent
 import intake.services.events_service as EventsService
-import user_agents
+import intake.services.event_buffer as EventBufferService
+import intake.services.visitors as VisitorsService
 
 
 logger = logging.getLogger(__name__)
@@ -39,11 +41,26 @@ class MiddlewareBase:
         return None
 
 
+class CollectEventsMiddleware(MiddlewareBase):
+    """Collects the analytics events logged during a request in
+    `request.events`, and sends them after the response is closed so
+    that they don't delay the response
+    """
+
+    def process_request(self, request):
+        request.events = EventBufferService.start_collecting()
+
+
 class UserAgentMiddleware(MiddlewareBase):
 
     def process_request(self, request):
         user_agent_string = request.META.get('HTTP_USER_AGENT', '')
-        request.user_agent = user_agents.parse(user_agent_string)
+        # parsed only if the request uses it. The page_viewed events of
+        # successful responses include browser and os fields, so most
+        # page views still parse it. The time saved on those comes from
+        # parse_user_agent's cache of recently parsed strings.
+        request.user_agent = SimpleLazyObject(
+            lambda: parse_user_agent(user_agent_string))
 
 
 class PersistReferrerMiddleware(MiddlewareBase):
@@ -88,21 +105,11 @@ class CountUniqueVisitorsMiddleware(MiddlewareBase):
 
     def __call__(self, request):
         if not is_a_monitoring_request(request):
-            visitor_id = request.session.get('visitor_id', None)
-            if not visitor_id:
-                visitor = Visitor(
-                    referrer=request.session.get('referrer', ''),
-                    source=request.session.get('source', ''),
-                    ip_address=getattr(request, 'ip_address', ''),
-                    user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                    locale=getattr(request, 'LANGUAGE_CODE', ''))
-                visitor.save()
-                request.visitor = visitor
+            visitor, is_new = VisitorsService.get_visitor_for_request(
+                request)
+            request.visitor = visitor
+            if is_new:
                 EventsService.site_entered(visitor, request)
-                request.session['visitor_id'] = visitor.id
-            else:
-                visitor = Visitor.objects.get(id=visitor_id)
-                request.visitor = visitor
             response = self.get_response(request)
 
             if is_a_valid_response_code(response):
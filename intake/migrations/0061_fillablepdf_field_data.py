@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-01 18:12
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0060_visitor_locale_user_agent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fillablepdf',
+            name='field_data',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='fillablepdf',
+            name='pdf_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-03 21:40
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0061_fillablepdf_field_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prebuiltpdfbundle',
+            name='submission_page_counts',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-07 18:12
+from __future__ import unicode_literals
+
+import hashlib
+from django.db import migrations, models
+
+
+def get_id_set_fingerprint(ids):
+    id_string = ','.join(str(item_id) for item_id in sorted(set(ids)))
+    return hashlib.sha256(id_string.encode('utf-8')).hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    models_and_fields = [
+        ('PrebuiltPDFBundle', 'applications', 'app_ids_fingerprint'),
+        ('ApplicationBundle', 'submissions', 'submission_ids_fingerprint'),
+    ]
+    for model_name, m2m_field_name, fingerprint_field_name in \
+            models_and_fields:
+        Model = apps.get_model('intake', model_name)
+        for obj in Model.objects.using(db_alias).all():
+            ids = getattr(obj, m2m_field_name).values_list('id', flat=True)
+            Model.objects.using(db_alias).filter(id=obj.id).update(
+                **{fingerprint_field_name: get_id_set_fingerprint(ids)})
+
+
+def do_nothing(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0062_prebuiltpdfbundle_submission_page_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationbundle',
+            name='submission_ids_fingerprint',
+            field=models.CharField(
+                blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='prebuiltpdfbundle',
+            name='app_ids_fingerprint',
+            field=models.CharField(
+                blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_fingerprints, do_nothing),
+    ]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-09 17:25
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0063_id_set_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrintoutCacheEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated', models.DateTimeField(auto_now=True, null=True)),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('data_hash', models.CharField(max_length=64)),
+                ('filename', models.TextField()),
+                ('pdf', models.FileField(upload_to='printout_cache/')),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('last_accessed', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='printout_cache_entries', to='intake.FormSubmission')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
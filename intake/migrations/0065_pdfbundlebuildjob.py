@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-11 22:03
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0023_organization_fax_number'),
+        ('intake', '0064_printoutcacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFBundleBuildJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated', models.DateTimeField(auto_now=True, null=True)),
+                ('app_ids', django.contrib.postgres.fields.jsonb.JSONField(default=list)),
+                ('app_ids_fingerprint', models.CharField(blank=True, db_index=True, default='', max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('application_bundle', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='build_jobs', to='intake.ApplicationBundle')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pdf_bundle_build_jobs', to='user_accounts.Organization')),
+                ('prebuilt_pdf_bundle', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='build_jobs', to='intake.PrebuiltPDFBundle')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-14 17:41
+from __future__ import unicode_literals
+
+import re
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+TEXT_SEARCH_FIELDS = [
+    'ssn',
+    'last_four',
+    'drivers_license_or_id',
+    'case_number',
+    'phone_number',
+    'alternate_phone_number',
+    'email'
+]
+
+DIGITS_SEARCH_FIELDS = [
+    'ssn',
+    'last_four',
+    'phone_number',
+    'alternate_phone_number',
+]
+
+
+def get_search_text(submission):
+    values = [' '.join('{} {}'.format(
+        submission.first_name or '',
+        submission.last_name or '').lower().split())]
+    for field_name in TEXT_SEARCH_FIELDS:
+        value = str(getattr(submission, field_name) or '')
+        if field_name in DIGITS_SEARCH_FIELDS:
+            values.append(re.sub(r'\D', '', value))
+        else:
+            values.append(' '.join(value.lower().split()))
+    return '\n'.join(value for value in values if value)
+
+
+def backfill_search_text(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    FormSubmission = apps.get_model('intake', 'FormSubmission')
+    subs = FormSubmission.objects.using(db_alias).only(
+        'id', 'first_name', 'last_name', *TEXT_SEARCH_FIELDS)
+    for sub in subs.iterator():
+        FormSubmission.objects.using(db_alias).filter(id=sub.id).update(
+            search_text=get_search_text(sub))
+
+
+def do_nothing(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0065_pdfbundlebuildjob'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='formsubmission',
+            name='search_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, do_nothing),
+        migrations.RunSQL(
+            'CREATE INDEX intake_formsubmission_search_text_trgm '
+            'ON intake_formsubmission USING gin (search_text gin_trgm_ops);',
+            'DROP INDEX intake_formsubmission_search_text_trgm;'),
+    ]
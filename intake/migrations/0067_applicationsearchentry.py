@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-15 21:06
+from __future__ import unicode_literals
+
+from django.contrib.postgres.operations import CreateExtension
+from django.core.urlresolvers import reverse
+from django.db import migrations, models
+import django.db.models.deletion
+from project.jinja2 import namify
+
+
+def get_full_name(submission):
+    return '{} {}'.format(*[
+        namify(submission.answers.get(key) or '')
+        for key in ['first_name', 'last_name']])
+
+
+def backfill_search_entries(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Application = apps.get_model('intake', 'Application')
+    ApplicationSearchEntry = apps.get_model(
+        'intake', 'ApplicationSearchEntry')
+    applications = Application.objects.using(db_alias).select_related(
+        'form_submission')
+    entries = []
+    for app in applications.iterator():
+        submission = app.form_submission
+        entries.append(ApplicationSearchEntry(
+            application_id=app.id,
+            organization_id=app.organization_id,
+            search_text=submission.search_text,
+            name=get_full_name(submission),
+            url=reverse(
+                'intake-app_detail',
+                kwargs=dict(submission_id=submission.id)),
+            created=app.created))
+    ApplicationSearchEntry.objects.using(db_alias).bulk_create(
+        entries, batch_size=1000)
+
+
+def do_nothing(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0023_organization_fax_number'),
+        ('intake', '0066_formsubmission_search_text'),
+    ]
+
+    operations = [
+        CreateExtension('btree_gin'),
+        migrations.CreateModel(
+            name='ApplicationSearchEntry',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_entry', serialize=False, to='intake.Application')),
+                ('search_text', models.TextField(default='')),
+                ('name', models.TextField(default='')),
+                ('url', models.TextField(default='')),
+                ('created', models.DateTimeField(null=True)),
+                ('organization', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='user_accounts.Organization')),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+        migrations.RunPython(backfill_search_entries, do_nothing),
+        migrations.RunSQL(
+            'CREATE INDEX intake_applicationsearchentry_org_search_text '
+            'ON intake_applicationsearchentry USING gin '
+            '(organization_id, search_text gin_trgm_ops);',
+            'DROP INDEX intake_applicationsearchentry_org_search_text;'),
+    ]
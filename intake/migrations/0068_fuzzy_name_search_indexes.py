@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-16 19:22
+from __future__ import unicode_literals
+
+from django.contrib.postgres.operations import CreateExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0067_applicationsearchentry'),
+    ]
+
+    operations = [
+        CreateExtension('fuzzystrmatch'),
+        migrations.RunSQL(
+            "CREATE INDEX intake_formsubmission_name_trgm "
+            "ON intake_formsubmission USING gin "
+            "((lower(first_name || ' ' || last_name)) gin_trgm_ops);",
+            "DROP INDEX intake_formsubmission_name_trgm;"),
+        migrations.RunSQL(
+            "CREATE INDEX intake_formsubmission_first_name_metaphone "
+            "ON intake_formsubmission (metaphone(first_name, 8));",
+            "DROP INDEX intake_formsubmission_first_name_metaphone;"),
+        migrations.RunSQL(
+            "CREATE INDEX intake_formsubmission_last_name_metaphone "
+            "ON intake_formsubmission (metaphone(last_name, 8));",
+            "DROP INDEX intake_formsubmission_last_name_metaphone;"),
+    ]
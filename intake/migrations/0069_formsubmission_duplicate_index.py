@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-17 23:48
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+NAME_ANSWER_KEYS = ('first_name', 'middle_name', 'last_name')
+
+
+def backfill_duplicate_name_keys(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    FormSubmission = apps.get_model('intake', 'FormSubmission')
+    subs = FormSubmission.objects.using(db_alias).only('id', 'answers')
+    for sub in subs.iterator():
+        name_key = ' '.join(
+            sub.answers.get(key) or '' for key in NAME_ANSWER_KEYS).lower()
+        FormSubmission.objects.using(db_alias).filter(id=sub.id).update(
+            duplicate_name_key=name_key)
+
+
+def do_nothing(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0068_fuzzy_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formsubmission',
+            name='duplicate_name_key',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='formsubmission',
+            name='org_set_fingerprint',
+            field=models.CharField(
+                default='', editable=False, max_length=32),
+        ),
+        migrations.AlterIndexTogether(
+            name='formsubmission',
+            index_together=set([('applicant', 'org_set_fingerprint')]),
+        ),
+        migrations.RunPython(backfill_duplicate_name_keys, do_nothing),
+        migrations.RunSQL(
+            "UPDATE intake_formsubmission SET org_set_fingerprint = ("
+            "SELECT md5(coalesce(string_agg(DISTINCT "
+            "intake_application.organization_id::text, ',' "
+            "ORDER BY intake_application.organization_id::text), '')) "
+            "FROM intake_application WHERE "
+            "intake_application.formsubmission_id = "
+            "intake_formsubmission.id);",
+            migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-18 20:15
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0023_organization_fax_number'),
+        ('intake', '0069_formsubmission_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyApplicationCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('refreshed', models.DateTimeField(default=django.utils.timezone.now)),
+                ('organization', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='user_accounts.Organization')),
+            ],
+            options={
+                'ordering': ['week_start'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='weeklyapplicationcount',
+            unique_together=set([('organization', 'week_start')]),
+        ),
+    ]
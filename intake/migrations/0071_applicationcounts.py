@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-21 17:42
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_accounts', '0023_organization_fax_number'),
+        ('intake', '0070_weeklyapplicationcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationCounts',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread', models.IntegerField(default=0)),
+                ('needs_update', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='application_counts', to='user_accounts.Organization')),
+            ],
+        ),
+    ]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-22 18:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0071_applicationcounts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='latest_status_update',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='intake.StatusUpdate'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='latest_status_type',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='intake.StatusType'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='status_update_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AlterIndexTogether(
+            name='application',
+            index_together=set([('organization', 'status_update_count', 'has_been_opened')]),
+        ),
+        migrations.RunSQL(
+            "UPDATE intake_application AS app SET "
+            "status_update_count = COALESCE(latest.count, 0), "
+            "latest_status_update_id = latest.id, "
+            "latest_status_type_id = latest.status_type_id "
+            "FROM intake_application AS target "
+            "LEFT JOIN LATERAL ("
+            "SELECT id, status_type_id, count(*) OVER () AS count "
+            "FROM intake_statusupdate "
+            "WHERE application_id = target.id "
+            "ORDER BY updated DESC, id DESC LIMIT 1"
+            ") AS latest ON true "
+            "WHERE app.id = target.id;",
+            migrations.RunSQL.noop),
+    ]
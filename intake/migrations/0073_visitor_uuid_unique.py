@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-24 17:42
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0072_application_latest_status'),
+    ]
+
+    operations = [
+        # 0055_visitor_uuid gave every existing visitor the same default
+        # uuid. Keep it on the first visitor of each duplicate set and give
+        # the rest random uuids in one statement, so that the unique
+        # constraint can be added.
+        migrations.RunSQL(
+            "UPDATE intake_visitor SET "
+            "uuid = md5(random()::text || intake_visitor.id::text)::uuid "
+            "FROM (SELECT uuid, min(id) AS first_id FROM intake_visitor "
+            "GROUP BY uuid HAVING count(*) > 1) AS duplicates "
+            "WHERE intake_visitor.uuid = duplicates.uuid "
+            "AND intake_visitor.id <> duplicates.first_id;",
+            migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name='visitor',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
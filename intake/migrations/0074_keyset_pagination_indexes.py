@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-08-25 16:20
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0073_visitor_uuid_unique'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='application',
+            index_together=set([('organization', 'status_update_count', 'has_been_opened'), ('organization', 'created', 'id')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='formsubmission',
+            index_together=set([('applicant', 'org_set_fingerprint'), ('date_received', 'id')]),
+        ),
+    ]
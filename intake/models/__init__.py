@@ -3,12 +3,14 @@ from .county import County, CountyManager
 from .pdfs import (
     get_parser, FillablePDF, FilledPDF)
 from .prebuilt_pdf_bundle import PrebuiltPDFBundle
+from .printout_cache_entry import PrintoutCacheEntry
 from .visitor import Visitor
 from .applicant import Applicant
 from .application import Application
 from .application_transfer import ApplicationTransfer
 from .application_event import ApplicationEvent
 from .application_bundle import ApplicationBundle
+from .pdf_bundle_build_job import PDFBundleBuildJob
 from .application_log_entry import (
     ApplicationLogEntry, ApplicantContactedLogEntry)
 from .form_submission import (
@@ -18,6 +20,9 @@ from .form_submission import (
     MissingAnswersError,
     MissingPDFsError,
 )
+from .application_search_entry import ApplicationSearchEntry
+from .application_counts import ApplicationCounts
+from .weekly_application_count import WeeklyApplicationCount
 from .next_step import NextStep
 from .note import ApplicationNote
 from .status_type import StatusType
@@ -36,7 +41,10 @@ __all__ = [
     Applicant,
     Application,
     ApplicationTransfer,
+    ApplicationSearchEntry,
+    ApplicationCounts,
     ApplicationBundle,
+    PDFBundleBuildJob,
     ApplicationEvent,
     ApplicationNote,
     SubmissionTagLink,
@@ -49,8 +57,10 @@ __all__ = [
     FillablePDF,
     FilledPDF,
     PrebuiltPDFBundle,
+    PrintoutCacheEntry,
     NextStep,
     StatusType,
     StatusUpdate,
     StatusNotification,
+    WeeklyApplicationCount,
 ]
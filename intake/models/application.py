@@ -1,7 +1,24 @@
-from django.db import models
+from django.db import connection, models
+import intake
 from .abstract_base_models import BaseModel
 
 
+REFRESH_LATEST_STATUS_SQL = """
+UPDATE intake_application AS app SET
+    status_update_count = COALESCE(latest.count, 0),
+    latest_status_update_id = latest.id,
+    latest_status_type_id = latest.status_type_id
+FROM intake_application AS target
+LEFT JOIN LATERAL (
+    SELECT id, status_type_id, count(*) OVER () AS count
+    FROM intake_statusupdate
+    WHERE application_id = target.id
+    ORDER BY updated DESC, id DESC
+    LIMIT 1
+) AS latest ON true
+WHERE app.id = target.id"""
+
+
 class Application(BaseModel):
     organization = models.ForeignKey(
         'user_accounts.Organization',
@@ -15,6 +32,96 @@ class Application(BaseModel):
     )
     was_transferred_out = models.BooleanField(default=False)
     has_been_opened = models.BooleanField(default=False)
+    # these are copied from the application's status updates when they are
+    # created, so that the latest status can be found without a join
+    latest_status_update = models.ForeignKey(
+        'intake.StatusUpdate', null=True, blank=True, editable=False,
+        on_delete=models.SET_NULL, related_name='+')
+    latest_status_type = models.ForeignKey(
+        'intake.StatusType', null=True, blank=True, editable=False,
+        on_delete=models.SET_NULL, related_name='+')
+    status_update_count = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        index_together = [
+            ('organization', 'status_update_count', 'has_been_opened'),
+            # the app index pages by applications_service.APPLICATION_KEYSET
+            ('organization', 'created', 'id')]
+
+    # changes to these fields are copied to the ApplicationSearchEntry and
+    # the form submission's org set fingerprint
+    search_entry_fields = ('organization_id', 'form_submission_id', 'created')
+    # changes to these fields change the organization's ApplicationCounts
+    counted_fields = ('organization_id', 'has_been_opened')
+    # these are only written by StatusUpdate.save and refresh_latest_status,
+    # so that saving a stale instance does not overwrite them
+    latest_status_fields = (
+        'latest_status_update', 'latest_status_type', 'status_update_count')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._search_entry_values = self.get_field_values(
+            self.search_entry_fields)
+        self._counted_values = self.get_field_values(self.counted_fields)
+
+    def get_field_values(self, fields):
+        # read from __dict__ to avoid loading deferred fields
+        return [self.__dict__.get(field) for field in fields]
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if not adding and kwargs.get('update_fields') is None:
+            # only the loaded fields, so that deferred fields are not
+            # loaded one query at a time to be saved, and `updated`, which
+            # is set on save
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and
+                (field.attname not in deferred or
+                 getattr(field, 'auto_now', False)) and
+                field.name not in self.latest_status_fields]
+        super().save(*args, **kwargs)
+        values = self.get_field_values(self.search_entry_fields)
+        if adding or values != self._search_entry_values:
+            intake.models.ApplicationSearchEntry.sync_for_application(
+                self, adding=adding)
+            intake.models.FormSubmission.update_org_set_fingerprints(
+                [self.form_submission_id])
+            self._search_entry_values = values
+        counted_values = self.get_field_values(self.counted_fields)
+        if adding or counted_values != self._counted_values:
+            org_ids = {self.organization_id, self._counted_values[0]}
+            org_ids.discard(None)
+            intake.models.ApplicationCounts.refresh(org_ids)
+            self._counted_values = counted_values
+
+    def set_latest_status_update(self, status_update):
+        """Saves a newly created status update as this application's latest
+        status, with one update query
+        """
+        type(self).objects.filter(id=self.id).update(
+            latest_status_update_id=status_update.id,
+            latest_status_type_id=status_update.status_type_id,
+            status_update_count=models.F('status_update_count') + 1)
+        self.latest_status_update = status_update
+        self.latest_status_type_id = status_update.status_type_id
+        self.status_update_count += 1
+
+    @classmethod
+    def refresh_latest_status(cls, application_ids=None):
+        """Recomputes the latest status fields from status updates, for the
+        given application ids or for all applications. Returns the number
+        of applications updated.
+        """
+        sql = REFRESH_LATEST_STATUS_SQL
+        params = []
+        if application_ids is not None:
+            sql += ' AND target.id = ANY(%s)'
+            params.append(list(application_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
 
     def __str__(self):
         return "Sub {} ({}) to {} on {}".format(
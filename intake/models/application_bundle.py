@@ -9,6 +9,7 @@ from django.core.urlresolvers import reverse
 from django.conf import settings
 
 import intake
+from intake.models.signals import sync_id_set_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,10 @@ class ApplicationBundle(models.Model):
                                      related_name='bundles')
     bundled_pdf = models.FileField(upload_to='pdf_bundles/', null=True,
                                    blank=True)
+    # fingerprint of the set of submission ids, see
+    # `sync_id_set_fingerprint`
+    submission_ids_fingerprint = models.CharField(
+        max_length=64, blank=True, default='', db_index=True)
 
     def should_have_a_pdf(self):
         """Returns `True` if `self.organization` has any `FillablePDF`
@@ -62,3 +67,7 @@ class ApplicationBundle(models.Model):
 
     def get_external_url(self):
         return externalize_url(self.get_absolute_url())
+
+
+sync_id_set_fingerprint(
+    ApplicationBundle, 'submissions', 'submission_ids_fingerprint')
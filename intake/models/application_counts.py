@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, models, transaction
+
+
+REFRESH_COUNTS_SQL = """
+INSERT INTO intake_applicationcounts
+    (organization_id, unread, needs_update, total, updated)
+SELECT
+    %(organization_id)s,
+    count(*) FILTER (
+        WHERE NOT has_been_opened AND status_update_count = 0),
+    count(*) FILTER (WHERE status_update_count = 0),
+    count(*),
+    now()
+FROM intake_application
+WHERE organization_id = %(organization_id)s
+ON CONFLICT (organization_id) DO UPDATE SET
+    unread = EXCLUDED.unread,
+    needs_update = EXCLUDED.needs_update,
+    total = EXCLUDED.total,
+    updated = EXCLUDED.updated
+RETURNING unread, needs_update, total
+"""
+
+
+class ApplicationCounts(models.Model):
+    """The number of applications in each app index tab for an
+    organization, so that the tabs can be shown without counting.
+
+    Counts are refreshed whenever applications are created, opened,
+    updated or transferred, and are cached in the default cache.
+    """
+    organization = models.OneToOneField(
+        'user_accounts.Organization', on_delete=models.CASCADE,
+        related_name='application_counts')
+    unread = models.IntegerField(default=0)
+    needs_update = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "Application counts for organization {}".format(
+            self.organization_id)
+
+    @staticmethod
+    def get_cache_key(organization_id):
+        return 'application_counts:{}'.format(organization_id)
+
+    @classmethod
+    def refresh(cls, organization_ids):
+        """Recounts and saves the counts for each organization id, with
+        one query per organization, and returns them in a dict keyed by
+        organization id
+        """
+        counts = {}
+        with connection.cursor() as cursor:
+            for org_id in set(organization_ids):
+                cursor.execute(
+                    REFRESH_COUNTS_SQL, dict(organization_id=org_id))
+                unread, needs_update, total = cursor.fetchone()
+                counts[org_id] = dict(
+                    unread=unread, needs_update=needs_update, total=total)
+        cls.cache_on_commit(counts)
+        return counts
+
+    @classmethod
+    def cache_on_commit(cls, counts):
+        """Caches counts, keyed by organization id, once the current
+        transaction commits. Until then, the organizations' cached counts
+        are deleted, so that a rollback does not leave uncommitted counts
+        in the cache.
+        """
+        values = {
+            cls.get_cache_key(org_id): value
+            for org_id, value in counts.items()}
+        cache.delete_many(list(values.keys()))
+        transaction.on_commit(lambda: cache.set_many(
+            values, settings.APPLICATION_COUNTS_CACHE_TIMEOUT))
+
+    @classmethod
+    def get_for_organization(cls, organization_id):
+        """Returns a dict of 'unread', 'needs_update' and 'total' counts,
+        from the cache, then the database, and only counts applications
+        if neither has them
+        """
+        key = cls.get_cache_key(organization_id)
+        counts = cache.get(key)
+        if counts is None:
+            counts = cls.objects.filter(
+                organization_id=organization_id
+            ).values('unread', 'needs_update', 'total').first()
+            if counts is None:
+                return cls.refresh([organization_id])[organization_id]
+            cls.cache_on_commit({organization_id: counts})
+        return counts
@@ -66,11 +66,16 @@ class ApplicationLogEntry(models.Model):
 
     @classmethod
     def log_opened(cls, submission_ids, user, time=None):
-        intake.models.Application.objects.filter(
+        unopened_apps = intake.models.Application.objects.filter(
             form_submission_id__in=submission_ids,
-            organization__profiles__user=user
-        ).distinct().update(
-            has_been_opened=True)
+            organization__profiles__user=user,
+            has_been_opened=False
+        ).distinct()
+        org_ids = set(
+            unopened_apps.values_list('organization_id', flat=True))
+        unopened_apps.update(has_been_opened=True)
+        if org_ids:
+            intake.models.ApplicationCounts.refresh(org_ids)
         return cls.log_multiple(cls.OPENED, submission_ids, user, time)
 
     @classmethod
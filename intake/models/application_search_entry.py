@@ -0,0 +1,61 @@
+from django.db import models
+import intake
+
+
+class ApplicationSearchEntry(models.Model):
+    """A copy of the data needed to search for and list an application,
+    so that an organization's applications can be searched with one
+    index scan and without fetching each form submission.
+
+    Entries are rebuilt whenever their application or form submission
+    is saved.
+    """
+    application = models.OneToOneField(
+        'intake.Application', on_delete=models.CASCADE, primary_key=True,
+        related_name='search_entry')
+    organization = models.ForeignKey(
+        'user_accounts.Organization', on_delete=models.CASCADE,
+        related_name='+', db_index=False)
+    search_text = models.TextField(default="")
+    name = models.TextField(default="")
+    url = models.TextField(default="")
+    created = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ['-created']
+
+    def __str__(self):
+        return "Search entry for application {}".format(self.application_id)
+
+    @classmethod
+    def from_application(cls, application, submission):
+        return cls(
+            application_id=application.id,
+            organization_id=application.organization_id,
+            search_text=submission.search_text,
+            name=submission.get_full_name(),
+            url=submission.get_absolute_url(),
+            created=application.created)
+
+    @classmethod
+    def sync_for_application(cls, application, adding=False):
+        entry = cls.from_application(
+            application, application.form_submission)
+        entry.save(force_insert=adding)
+        return entry
+
+    @classmethod
+    def sync_for_submissions(cls, submissions):
+        """Replaces the entries for every application of `submissions`
+        """
+        submissions = {sub.id: sub for sub in submissions}
+        applications = intake.models.Application.objects.filter(
+            form_submission_id__in=list(submissions.keys()))
+        entries = [
+            cls.from_application(app, submissions[app.form_submission_id])
+            for app in applications]
+        cls.objects.filter(
+            application__form_submission_id__in=list(submissions.keys())
+        ).delete()
+        cls.objects.bulk_create(entries)
+        return entries
@@ -1,7 +1,10 @@
+import hashlib
+import re
 import uuid
 from urllib.parse import urljoin
 from django.conf import settings
 from django.db import models
+from django.db.models.expressions import RawSQL
 from django.contrib.postgres.fields import JSONField
 from django.utils import timezone as timezone_utils
 from django.core.urlresolvers import reverse
@@ -9,6 +12,7 @@ from taggit.managers import TaggableManager
 import intake
 from intake import anonymous_names
 from intake.constants import SMS, EMAIL
+from intake.utils import coerce_to_ids
 from project.jinja2 import namify
 from formation.fields import MonthlyIncome, HouseholdSize, OnPublicBenefits
 
@@ -24,6 +28,15 @@ FORMSUBMISSION_TEXT_SEARCH_FIELDS = [
     'email'
 ]
 
+# these are stored as digits only, so that '(415) 212-4848' and '4152124848'
+# match each other
+DIGITS_SEARCH_FIELDS = [
+    'ssn',
+    'last_four',
+    'phone_number',
+    'alternate_phone_number',
+]
+
 QUERYABLE_ANSWER_FIELDS = [
     'reasons_for_applying',
     'how_did_you_hear',
@@ -94,6 +107,56 @@ def gen_uuid():
     return uuid.uuid4().hex
 
 
+def normalize_search_text(value):
+    """Lowercases and collapses whitespace"""
+    return ' '.join(str(value or '').lower().split())
+
+
+def normalize_search_digits(value):
+    return re.sub(r'\D', '', str(value or ''))
+
+
+def get_search_text(submission):
+    """Returns the normalized values of the text search fields, one per
+    line, for `FormSubmission.search_text`
+    """
+    values = [normalize_search_text('{} {}'.format(
+        submission.first_name or '', submission.last_name or ''))]
+    for field_name in FORMSUBMISSION_TEXT_SEARCH_FIELDS:
+        if field_name in ('first_name', 'last_name'):
+            continue
+        value = getattr(submission, field_name)
+        if field_name in DIGITS_SEARCH_FIELDS:
+            values.append(normalize_search_digits(value))
+        else:
+            values.append(normalize_search_text(value))
+    return '\n'.join(value for value in values if value)
+
+
+NAME_ANSWER_KEYS = ('first_name', 'middle_name', 'last_name')
+
+
+def join_lowercase_name(name_parts):
+    return ' '.join(name_parts).lower()
+
+
+def get_org_set_fingerprint(organizations):
+    """Returns an md5 hex digest identifying a set of organization ids (or
+    organizations). It matches ORG_SET_FINGERPRINT_SQL, which computes it
+    in the database.
+    """
+    ids = sorted(set(str(org_id) for org_id in coerce_to_ids(organizations)))
+    return hashlib.md5(','.join(ids).encode('utf-8')).hexdigest()
+
+
+ORG_SET_FINGERPRINT_SQL = str(
+    "(SELECT md5(coalesce(string_agg(DISTINCT "
+    "intake_application.organization_id::text, ',' "
+    "ORDER BY intake_application.organization_id::text), '')) "
+    "FROM intake_application WHERE intake_application.formsubmission_id "
+    "= intake_formsubmission.id)")
+
+
 class FormSubmission(models.Model):
 
     text_search_fields = FORMSUBMISSION_TEXT_SEARCH_FIELDS
@@ -168,8 +231,47 @@ class FormSubmission(models.Model):
     date_received = models.DateTimeField(default=timezone_utils.now)
     tags = TaggableManager(through='intake.SubmissionTagLink')
 
+    # normalized copy of the text search fields, maintained on save and
+    # covered by a trigram index for search
+    search_text = models.TextField(default="", editable=False)
+
+    # used to look up possible duplicates from the same applicant without
+    # loading their answers. duplicate_name_key is maintained on save and
+    # org_set_fingerprint whenever applications are added or removed
+    duplicate_name_key = models.TextField(default="", editable=False)
+    org_set_fingerprint = models.CharField(
+        max_length=32, default="", editable=False)
+
     class Meta:
         ordering = ['-date_received']
+        index_together = [
+            ('applicant', 'org_set_fingerprint'),
+            # followups are paged by submissions.FOLLOWUP_KEYSET
+            ('date_received', 'id')]
+
+    @classmethod
+    def update_org_set_fingerprints(cls, submission_ids):
+        cls.objects.filter(id__in=submission_ids).update(
+            org_set_fingerprint=RawSQL(ORG_SET_FINGERPRINT_SQL, ()))
+
+    def get_full_lowercase_name(self):
+        return join_lowercase_name(
+            self.answers.get(key) or '' for key in NAME_ANSWER_KEYS)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        self.search_text = get_search_text(self)
+        self.duplicate_name_key = self.get_full_lowercase_name()
+        update_fields = kwargs.get('update_fields')
+        search_fields_changed = update_fields is None or bool(
+            set(update_fields) & set(self.text_search_fields + ['answers']))
+        if update_fields is not None and search_fields_changed:
+            kwargs['update_fields'] = list(update_fields) + [
+                'search_text', 'duplicate_name_key']
+        super().save(*args, **kwargs)
+        # new submissions don't have applications yet
+        if search_fields_changed and not adding:
+            intake.models.ApplicationSearchEntry.sync_for_submissions([self])
 
     def agency_event_logs(self, event_type):
         '''assumes that self.logs and self.logs.user are prefetched'''
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from django.db import models
+from django.contrib.postgres.fields import JSONField
+from django.core.urlresolvers import reverse
+from intake.models.abstract_base_models import BaseModel
+
+
+class PDFBundleBuildJob(BaseModel):
+    """Tracks the asynchronous build of either a PrebuiltPDFBundle for a set
+    of application ids or the pdf of an ApplicationBundle.
+    See `intake.services.pdf_bundle_jobs`
+    """
+    # includes created, updated from BaseModel
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+    # jobs with these statuses are reused rather than duplicated
+    REUSABLE_STATUSES = (PENDING, RUNNING, DONE)
+    UNFINISHED_STATUSES = (PENDING, RUNNING)
+    # unfinished jobs that have not made progress for this long are
+    # assumed to have been lost, and are failed instead of reused
+    STALE_AFTER = timedelta(minutes=30)
+
+    organization = models.ForeignKey(
+        'user_accounts.Organization', on_delete=models.CASCADE,
+        related_name='pdf_bundle_build_jobs')
+    # used by jobs that build a PrebuiltPDFBundle
+    app_ids = JSONField(default=list)
+    app_ids_fingerprint = models.CharField(
+        max_length=64, blank=True, default='', db_index=True)
+    prebuilt_pdf_bundle = models.ForeignKey(
+        'intake.PrebuiltPDFBundle', on_delete=models.SET_NULL,
+        related_name='build_jobs', null=True, blank=True)
+    # used by jobs that build the pdf of an ApplicationBundle
+    application_bundle = models.ForeignKey(
+        'intake.ApplicationBundle', on_delete=models.CASCADE,
+        related_name='build_jobs', null=True, blank=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    # percent complete, from 0 to 100
+    progress = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    def set_progress(self, status, progress):
+        self.status = status
+        self.progress = progress
+        self.save(update_fields=['status', 'progress', 'updated'])
+
+    def get_status_url(self):
+        return reverse(
+            'intake-pdf_bundle_build_job_status',
+            kwargs=dict(job_id=self.id))
+
+    def get_pdf_url(self):
+        if self.status != self.DONE:
+            return None
+        if self.application_bundle_id:
+            return self.application_bundle.get_pdf_bundle_url()
+        if self.prebuilt_pdf_bundle_id:
+            return self.prebuilt_pdf_bundle.get_absolute_url()
+        return None
+
+    def __str__(self):
+        return 'PDF bundle build job {} for {}: {} ({}%)'.format(
+            self.id, self.organization.name, self.status, self.progress)
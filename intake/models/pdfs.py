@@ -1,6 +1,8 @@
+import hashlib
 import importlib
 
 from django.db import models
+from django.contrib.postgres.fields import JSONField
 
 from intake import pdfparser
 from django.conf import settings
@@ -9,12 +11,30 @@ from django.core.urlresolvers import reverse
 
 
 def get_parser():
-    parser = pdfparser.PDFParser()
+    parser = pdfparser.PDFParser(
+        tmp_path=getattr(settings, 'PDFPARSER_TMP_PATH', None),
+        java_options=getattr(settings, 'PDFPARSER_JAVA_OPTIONS', None),
+        timeout=getattr(settings, 'PDFPARSER_TIMEOUT', None),
+        concurrency=getattr(settings, 'PDFPARSER_CONCURRENCY', 1))
     parser.PDFPARSER_PATH = getattr(settings, 'PDFPARSER_PATH',
                                     'intake/pdfparser.jar')
     return parser
 
 
+# in-process tier of the field data cache, keyed by `FillablePDF.pdf_hash`.
+# The database tier is `FillablePDF.field_data`.
+FIELD_DATA_CACHE = {}
+
+
+def get_file_hash(file_obj):
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in file_obj.chunks():
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
 class FillablePDF(models.Model):
     name = models.CharField(max_length=50)
     pdf = models.FileField(upload_to='pdfs/')
@@ -25,6 +45,10 @@ class FillablePDF(models.Model):
         related_name='pdfs',
         null=True
     )
+    # sha256 of the pdf file contents, used as the field data cache key
+    pdf_hash = models.CharField(max_length=64, blank=True, default='')
+    # output of the pdfparser `get_fields` command for the current pdf
+    field_data = JSONField(null=True, blank=True)
 
     @classmethod
     def get_default_instance(cls):
@@ -41,10 +65,42 @@ class FillablePDF(models.Model):
         module = importlib.import_module(module_path)
         return getattr(module, callable_name)
 
+    def save(self, *args, **kwargs):
+        """Invalidates cached field data if a new pdf file was assigned
+        """
+        if not self.pdf:
+            self.pdf_hash = ''
+            self.field_data = None
+        elif not self.pdf._committed:
+            pdf_hash = get_file_hash(self.pdf)
+            if pdf_hash != self.pdf_hash:
+                self.pdf_hash = pdf_hash
+                self.field_data = None
+        super().save(*args, **kwargs)
+
+    def get_field_data(self):
+        """Returns the parsed field data of this pdf
+
+        Field data is looked up by the hash of the pdf contents, first in
+        process memory, then in `self.field_data`. It is only parsed from the
+        pdf file if neither has it, and then stored in both.
+        """
+        if not self.pdf_hash:
+            self.pdf_hash = get_file_hash(self.pdf)
+            self.field_data = None
+        field_data = FIELD_DATA_CACHE.get(self.pdf_hash)
+        if field_data is not None:
+            return field_data
+        if self.field_data is None:
+            self.field_data = get_parser().get_field_data(self.get_pdf())
+            if self.pk:
+                FillablePDF.objects.filter(pk=self.pk).update(
+                    pdf_hash=self.pdf_hash, field_data=self.field_data)
+        FIELD_DATA_CACHE[self.pdf_hash] = self.field_data
+        return self.field_data
+
     def get_pdf_fields(self):
-        parser = get_parser()
-        data = parser.get_field_data(self.get_pdf())
-        return data['fields']
+        return self.get_field_data()['fields']
 
     def __str__(self):
         return self.name
@@ -61,10 +117,28 @@ class FillablePDF(models.Model):
             submission=submission
         )
 
+    def fill_for_submissions(self, submissions):
+        """Fills out this pdf for many submissions in one batch and saves a
+        FilledPDF instance for each submission
+        """
+        submissions = list(submissions)
+        if not submissions:
+            return []
+        translator = self.get_translator()
+        filled_pdfs, joined = get_parser().batch_fill_pdfs(
+            self.get_pdf(), [translator(sub) for sub in submissions],
+            field_data=self.get_field_data())
+        return [
+            FilledPDF.create_with_pdf_bytes(
+                pdf_bytes=pdf_bytes, original_pdf=self, submission=sub)
+            for pdf_bytes, sub in zip(filled_pdfs, submissions)]
+
     def fill(self, *args, **kwargs):
         parser = get_parser()
         translator = self.get_translator()
-        return parser.fill_pdf(self.get_pdf(), translator(*args, **kwargs))
+        return parser.fill_pdf(
+            self.get_pdf(), translator(*args, **kwargs),
+            field_data=self.get_field_data())
 
     def fill_many(self, data_set, *args, **kwargs):
         if data_set:
@@ -72,9 +146,12 @@ class FillablePDF(models.Model):
             translator = self.get_translator()
             translated = [translator(d, *args, **kwargs)
                           for d in data_set]
+            field_data = self.get_field_data()
             if len(translated) == 1:
-                return parser.fill_pdf(self.get_pdf(), translated[0])
-            return parser.fill_many_pdfs(self.get_pdf(), translated)
+                return parser.fill_pdf(
+                    self.get_pdf(), translated[0], field_data=field_data)
+            return parser.fill_many_pdfs(
+                self.get_pdf(), translated, field_data=field_data)
 
 
 class FilledPDF(models.Model):
@@ -1,9 +1,12 @@
+from collections import OrderedDict
 from django.db import models
+from django.contrib.postgres.fields import JSONField
 from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
 from project.services import query_params
 from intake.constants import PACIFIC_TIME
 from intake.models.abstract_base_models import BaseModel
+from intake.models.signals import sync_id_set_fingerprint
 
 
 class PrebuiltPDFBundle(BaseModel):
@@ -15,6 +18,26 @@ class PrebuiltPDFBundle(BaseModel):
     organization = models.ForeignKey(
         'user_accounts.Organization', related_name='prebuilt_pdf_bundles',
         on_delete=models.PROTECT)
+    # [[form_submission_id, page_count], ...] in the order that each
+    # submission's pages appear in `pdf`. This allows the pdf to be edited
+    # when applications are added or removed instead of rebuilt.
+    submission_page_counts = JSONField(default=list)
+    # fingerprint of the set of application ids, kept in sync whenever
+    # `applications` changes, so that a bundle can be found for an exact
+    # set of applications with one indexed equality lookup
+    app_ids_fingerprint = models.CharField(
+        max_length=64, blank=True, default='', db_index=True)
+
+    def get_page_ranges(self):
+        """Returns an OrderedDict mapping each form_submission_id to a
+        (start, stop) tuple of its page indices in `pdf`
+        """
+        page_ranges = OrderedDict()
+        start = 0
+        for submission_id, page_count in self.submission_page_counts:
+            page_ranges[submission_id] = (start, start + page_count)
+            start += page_count
+        return page_ranges
 
     def set_bytes(self, bytes_):
         if not bytes_:
@@ -42,3 +65,7 @@ class PrebuiltPDFBundle(BaseModel):
                 org_name=self.organization.name,
                 updated=self.updated.astimezone(
                     PACIFIC_TIME).strftime('%Y-%m-%d %H:%M %Z'))
+
+
+sync_id_set_fingerprint(
+    PrebuiltPDFBundle, 'applications', 'app_ids_fingerprint')
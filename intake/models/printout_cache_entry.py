@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils import timezone
+from django.core.files.uploadedfile import SimpleUploadedFile
+from intake.models.abstract_base_models import BaseModel
+
+
+class PrintoutCacheEntry(BaseModel):
+    """A rendered case details printout, stored in file storage under a
+    key derived from everything that affects its contents.
+    See `intake.services.printout_cache`
+    """
+    # includes created, updated from BaseModel
+    key = models.CharField(max_length=64, unique=True)
+    submission = models.ForeignKey(
+        'intake.FormSubmission', on_delete=models.CASCADE,
+        related_name='printout_cache_entries')
+    # hash of the submission data that was rendered, used to invalidate
+    # entries once a submission has been edited
+    data_hash = models.CharField(max_length=64)
+    filename = models.TextField()
+    pdf = models.FileField(upload_to='printout_cache/')
+    size = models.PositiveIntegerField(default=0)
+    last_accessed = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def set_bytes(self, bytes_):
+        self.size = len(bytes_)
+        self.pdf = SimpleUploadedFile(
+            '{}.pdf'.format(self.key), bytes_,
+            content_type='application/pdf')
+
+    def get_bytes(self):
+        self.pdf.open('rb')
+        try:
+            return self.pdf.read()
+        finally:
+            self.pdf.close()
+
+    def __str__(self):
+        return 'Cached printout {} for submission {}'.format(
+            self.filename, self.submission_id)
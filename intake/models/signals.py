@@ -0,0 +1,67 @@
+"""Signal receivers that keep denormalized fields of intake models in sync
+"""
+from django.db.models import signals
+from intake.utils import get_id_set_fingerprint
+
+
+def sync_id_set_fingerprint(model, m2m_field_name, fingerprint_field_name):
+    """Keeps `fingerprint_field_name` on `model` set to the fingerprint of
+    the ids related through `m2m_field_name`, however the relation is
+    changed (from either side) and when related rows are deleted. This
+    allows rows to be found for an exact set of related ids with one
+    indexed equality lookup.
+    """
+    m2m_field = model._meta.get_field(m2m_field_name)
+    reverse_accessor = m2m_field.remote_field.get_accessor_name()
+    changed_ids_attr = '_changed_{}_ids'.format(reverse_accessor)
+
+    def update_fingerprints(ids):
+        for obj in model.objects.filter(id__in=ids):
+            fingerprint = get_id_set_fingerprint(
+                getattr(obj, m2m_field_name).values_list('id', flat=True))
+            model.objects.filter(id=obj.id).update(
+                **{fingerprint_field_name: fingerprint})
+
+    def handle_m2m_changed(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+        if not reverse:
+            if action in ('post_add', 'post_remove', 'post_clear'):
+                update_fingerprints([instance.id])
+                instance.refresh_from_db(fields=[fingerprint_field_name])
+            return
+        # `instance` is on the other side of the relation and the changed
+        # rows are in `pk_set`, except when clearing, where they must be
+        # found before they are removed
+        if action == 'pre_clear':
+            remember_related_ids(instance)
+        elif action == 'post_clear':
+            update_fingerprints(instance.__dict__.pop(changed_ids_attr, []))
+        elif action in ('post_add', 'post_remove'):
+            update_fingerprints(pk_set)
+
+    def remember_related_ids(instance):
+        setattr(instance, changed_ids_attr, list(
+            getattr(instance, reverse_accessor).values_list('id', flat=True)))
+
+    def handle_pre_delete(sender, instance, **kwargs):
+        # deleting a related row, also by cascade, removes its rows from
+        # the through table without sending m2m_changed
+        remember_related_ids(instance)
+
+    def handle_post_delete(sender, instance, **kwargs):
+        update_fingerprints(instance.__dict__.pop(changed_ids_attr, []))
+
+    # the related model may not be loaded yet, ModelSignal accepts its
+    # 'app_label.ModelName' string as a lazy sender
+    related_model = m2m_field.remote_field.model
+    dispatch_uid = '{}.{}.{}'.format(
+        model._meta.label, m2m_field_name, fingerprint_field_name)
+    signals.m2m_changed.connect(
+        handle_m2m_changed, sender=m2m_field.remote_field.through,
+        weak=False, dispatch_uid=dispatch_uid)
+    signals.pre_delete.connect(
+        handle_pre_delete, sender=related_model,
+        weak=False, dispatch_uid=dispatch_uid)
+    signals.post_delete.connect(
+        handle_post_delete, sender=related_model,
+        weak=False, dispatch_uid=dispatch_uid)
@@ -1,4 +1,5 @@
 from django.db import models
+import intake
 from intake.constants import PACIFIC_TIME
 
 
@@ -17,6 +18,15 @@ class StatusUpdate(models.Model):
         related_name='status_updates')
     other_next_step = models.TextField(blank=True)
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            self.application.set_latest_status_update(self)
+            # the application no longer needs a status update
+            intake.models.ApplicationCounts.refresh(
+                [self.application.organization_id])
+
     def __str__(self):
         return "Sub {} {} on {} by {}".format(
             self.application.form_submission.pk,
@@ -24,3 +34,20 @@ class StatusUpdate(models.Model):
             self.updated.astimezone(
                 PACIFIC_TIME).strftime("%b %-d %Y"),
             self.author.profile.name)
+
+
+def refresh_latest_status(sender, instance, **kwargs):
+    """Recomputes the latest status fields of a deleted status update's
+    application, and the counts of its organization
+    """
+    Application = intake.models.Application
+    Application.refresh_latest_status([instance.application_id])
+    intake.models.ApplicationCounts.refresh(
+        Application.objects.filter(
+            id=instance.application_id
+        ).values_list('organization_id', flat=True))
+
+
+models.signals.post_delete.connect(
+    refresh_latest_status, sender=StatusUpdate,
+    dispatch_uid='intake.StatusUpdate.refresh_latest_status')
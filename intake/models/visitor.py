@@ -1,11 +1,11 @@
 import uuid
 from django.db import models
-import user_agents
 from intake.constants import LANGUAGES_LOOKUP
+from intake.utils import parse_user_agent
 
 
 class Visitor(models.Model):
-    uuid = models.UUIDField(default=uuid.uuid4, editable=False)
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     first_visit = models.DateTimeField(auto_now_add=True)
     source = models.TextField(null=True)
     referrer = models.TextField(null=True)
@@ -17,7 +17,7 @@ class Visitor(models.Model):
         return self.uuid.hex
 
     def get_parsed_user_agent(self):
-        return user_agents.parse(self.user_agent)
+        return parse_user_agent(self.user_agent)
 
     def get_language_name_in_english(self):
         return LANGUAGES_LOOKUP.get(
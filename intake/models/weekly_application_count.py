@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils import timezone as timezone_utils
+
+
+class WeeklyApplicationCount(models.Model):
+    """The number of applications an organization received in a week,
+    where weeks start on Monday in Pacific time. Rows without an
+    organization count unique submissions to any organization.
+
+    These are rebuilt by `statistics.refresh_weekly_application_counts`
+    and read by the stats page.
+    """
+    organization = models.ForeignKey(
+        'user_accounts.Organization', on_delete=models.CASCADE, null=True,
+        related_name='+')
+    week_start = models.DateField()
+    count = models.IntegerField(default=0)
+    # when the count was started, applications created after this may be
+    # missing from it
+    refreshed = models.DateTimeField(default=timezone_utils.now)
+
+    class Meta:
+        ordering = ['week_start']
+        unique_together = ('organization', 'week_start')
+
+    def __str__(self):
+        return "{} applications to {} in the week of {}".format(
+            self.count, self.organization_id or 'all organizations',
+            self.week_start)
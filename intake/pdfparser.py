@@ -1,7 +1,26 @@
 import os
+import shutil
 import subprocess
 import json
-from tempfile import mkstemp
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from tempfile import mkstemp, SpooledTemporaryFile
+from PyPDF2 import PdfFileReader, PdfFileWriter
+from PyPDF2.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject)
+
+
+# Every parser command is a short-lived JVM, so these options favor fast
+# startup over long-running throughput: only the quick C1 compiler is used
+# and the single-threaded collector avoids spinning up GC threads.
+DEFAULT_JAVA_OPTIONS = [
+    '-XX:TieredStopAtLevel=1',
+    '-XX:+UseSerialGC',
+]
+
+
+# size of the chunks yielded when streaming parser output
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class PDFParserError(Exception):
@@ -12,25 +31,172 @@ class InvalidOptionError(Exception):
     pass
 
 
+def _get_pdf_reader(pdf):
+    if isinstance(pdf, bytes):
+        pdf = BytesIO(pdf)
+    else:
+        pdf.seek(0)
+    return PdfFileReader(pdf, strict=False)
+
+
+def count_pages(pdf):
+    """Returns the number of pages in a pdf, given as bytes or a file-like
+    object. File-like objects are rewound afterward.
+    """
+    count = _get_pdf_reader(pdf).getNumPages()
+    if not isinstance(pdf, bytes):
+        pdf.seek(0)
+    return count
+
+
+def _get_annotation_ids(pages):
+    annotation_ids = set()
+    for page in pages:
+        for annotation in page.get('/Annots') or []:
+            if isinstance(annotation, IndirectObject):
+                annotation_ids.add(annotation.idnum)
+    return annotation_ids
+
+
+def _keep_field(field, annotation_ids):
+    """Returns True if a form field, or one of its kids, is a widget on
+    one of the kept pages. Page references are removed from the widgets,
+    because the writer would otherwise copy the reader's page objects,
+    and everything they link to, a second time.
+    """
+    field_object = field.getObject()
+    field_object.pop(NameObject('/P'), None)
+    keep = not isinstance(field, IndirectObject) or \
+        field.idnum in annotation_ids
+    for kid in field_object.get('/Kids') or []:
+        keep = _keep_field(kid, annotation_ids) or keep
+    return keep
+
+
+def _add_acroform(writer, readers_and_pages):
+    """Copies the form fields of the kept pages into the writer, which
+    PdfFileWriter.addPage does not do. `readers_and_pages` is a list of
+    (reader, kept pages) tuples.
+    """
+    acroform = None
+    fields = ArrayObject()
+    for reader, pages in readers_and_pages:
+        reader_acroform = reader.trailer['/Root'].get('/AcroForm')
+        if reader_acroform is None:
+            continue
+        reader_acroform = reader_acroform.getObject()
+        if acroform is None:
+            acroform = DictionaryObject(reader_acroform)
+        annotation_ids = _get_annotation_ids(pages)
+        fields.extend(
+            field for field in reader_acroform.get('/Fields') or []
+            if _keep_field(field, annotation_ids))
+    if fields:
+        acroform[NameObject('/Fields')] = fields
+        writer._root_object[NameObject('/AcroForm')] = \
+            writer._addObject(acroform)
+
+
+def remove_page_ranges(pdf, page_ranges):
+    """Returns the bytes of a pdf without the pages in `page_ranges`,
+    a list of (start, stop) page index tuples, where `stop` is exclusive.
+    """
+    removed = set()
+    for start, stop in page_ranges:
+        removed.update(range(start, stop))
+    reader = _get_pdf_reader(pdf)
+    writer = PdfFileWriter()
+    pages = [
+        reader.getPage(index) for index in range(reader.getNumPages())
+        if index not in removed]
+    for page in pages:
+        writer.addPage(page)
+    _add_acroform(writer, [(reader, pages)])
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def merge_pdfs(pdfs, title=None):
+    """Merges the pages of pdfs given as bytes or file-like objects and
+    returns a rewound temporary file of the result. The file is only
+    written to disk if it grows past STREAM_CHUNK_SIZE * 16 bytes.
+    """
+    writer = PdfFileWriter()
+    readers_and_pages = []
+    for pdf in pdfs:
+        reader = _get_pdf_reader(pdf)
+        pages = [
+            reader.getPage(index) for index in range(reader.getNumPages())]
+        for page in pages:
+            writer.addPage(page)
+        readers_and_pages.append((reader, pages))
+    _add_acroform(writer, readers_and_pages)
+    if title:
+        writer.addMetadata({'/Title': title})
+    output = SpooledTemporaryFile(max_size=STREAM_CHUNK_SIZE * 16)
+    writer.write(output)
+    output.seek(0)
+    return output
+
+
+def iter_file_chunks(file_obj):
+    """Yields the contents of an open file in chunks and closes it once it
+    has been read, for use with a StreamingHttpResponse
+    """
+    try:
+        while True:
+            chunk = file_obj.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_obj.close()
+
+
 class PDFParser:
 
-    def __init__(self, tmp_path=None, clean_up=True):
+    def __init__(self, tmp_path=None, clean_up=True, java_options=None,
+                 timeout=None, concurrency=1):
         self.TEMP_FOLDER_PATH = tmp_path
         self._tmp_files = []
         self.clean_up = clean_up
         self.PDFPARSER_PATH = os.environ.get('PDFPARSER_PATH', 'pdfparser.jar')
+        if java_options is None:
+            java_options = DEFAULT_JAVA_OPTIONS
+        self.JAVA_OPTIONS = list(java_options)
+        self.TIMEOUT = timeout
+        # the maximum number of parser processes run at once by batch fills
+        self.CONCURRENCY = max(1, concurrency)
+
+    def _get_local_path(self, file_obj):
+        """Returns the path of a file object that is already stored on the
+        local disk, such as a FieldFile in FileSystemStorage, or None.
+        """
+        try:
+            path = file_obj.path
+        except (AttributeError, NotImplementedError, ValueError):
+            return None
+        if isinstance(path, str) and os.path.isfile(path):
+            return path
+        return None
 
     def _coerce_to_file_path(self, path_or_file_or_bytes):
         """This converts file-like objects and `bytes` into
         existing files and returns a filepath
         if strings are passed in, it is assumed that they are existing
         files
+        file-like objects that already exist on the local disk are used in
+        place rather than copied
         """
         if not isinstance(path_or_file_or_bytes, str):
             if isinstance(path_or_file_or_bytes, bytes):
                 return self._write_tmp_file(
                     bytestring=path_or_file_or_bytes)
             else:
+                local_path = self._get_local_path(path_or_file_or_bytes)
+                if local_path:
+                    return local_path
                 return self._write_tmp_file(
                     file_obj=path_or_file_or_bytes)
         return path_or_file_or_bytes
@@ -38,14 +204,14 @@ class PDFParser:
     def _write_tmp_file(self, file_obj=None, bytestring=None):
         """Take a file-like object or a bytestring,
         create a temporary file and return a file path.
-        file-like objects will be read and written to the tempfile
+        file-like objects will be copied to the tempfile in chunks
         bytes objects will be written directly to the tempfile
         """
         tmp_path = self.TEMP_FOLDER_PATH
         os_int, tmp_fp = mkstemp(dir=tmp_path)
-        with open(tmp_fp, 'wb') as tmp_file:
+        with os.fdopen(os_int, 'wb') as tmp_file:
             if file_obj:
-                tmp_file.write(file_obj.read())
+                shutil.copyfileobj(file_obj, tmp_file, STREAM_CHUNK_SIZE)
             elif bytestring:
                 tmp_file.write(bytestring)
         self._tmp_files.append(tmp_fp)
@@ -75,20 +241,55 @@ class PDFParser:
         if decode is True, the contents will be decoded using the default
         encoding
         """
-        return open(path, 'rb').read()
+        with open(path, 'rb') as file_obj:
+            return file_obj.read()
+
+    def _iter_file_contents(self, path):
+        """given a file path, yield the contents of the file in chunks
+        temporary files are cleaned up once the file has been read, so the
+        output of a command can be streamed without holding it in memory
+        """
+        try:
+            with open(path, 'rb') as file_obj:
+                while True:
+                    chunk = file_obj.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            if self.clean_up:
+                self.clean_up_tmp_files()
+
+    def _get_output(self, output_path, stream):
+        if stream:
+            return self._iter_file_contents(output_path)
+        result = self._get_file_contents(output_path)
+        if self.clean_up:
+            self.clean_up_tmp_files()
+        return result
 
     def run_command(self, args):
         """Run a command to pdftk on the command line.
             `args` is a list of command line arguments.
         This method is reponsible for handling errors that arise from
         pdftk's CLI
+        If the command takes longer than `self.TIMEOUT` seconds, the process
+        is killed and a PDFParserError is raised.
         """
-        args = ['java', '-jar', self.PDFPARSER_PATH] + args
+        command = ['java'] + self.JAVA_OPTIONS + [
+            '-jar', self.PDFPARSER_PATH] + args
         process = subprocess.Popen(
-            args,
+            command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE)
-        out, err = process.communicate()
+        try:
+            out, err = process.communicate(timeout=self.TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise PDFParserError(
+                "'{}' did not finish within {} seconds".format(
+                    args[0], self.TIMEOUT))
         if err:
             raise PDFParserError(err.decode('utf-8'))
         return out.decode('utf-8')
@@ -111,45 +312,106 @@ class PDFParser:
             self._dump_json(answer_fields)
         ])
 
-    def join_pdfs(self, list_of_pdf_paths):
+    def join_pdfs(self, list_of_pdf_paths, stream=False):
+        """Concatenates pdfs and returns the joined pdf bytes
+        If `stream` is True, returns an iterator of byte chunks instead.
+        """
         paths = [self._coerce_to_file_path(p) for p in list_of_pdf_paths]
         output_path = self._write_tmp_file()
         args = ['concat_files'] + paths + [output_path]
         self.run_command(args)
-        result = self._get_file_contents(output_path)
-        if self.clean_up:
-            self.clean_up_tmp_files()
-        return result
+        return self._get_output(output_path, stream)
 
     def get_field_data(self, pdf_file_path):
         pdf_file_path = self._coerce_to_file_path(pdf_file_path)
         string = self.run_command(['get_fields', pdf_file_path])
         return self._load_json(string)
 
-    def fill_pdf(self, pdf_path, answers):
+    def fill_pdf(self, pdf_path, answers, field_data=None, stream=False):
+        """Fills the pdf with answers and returns the filled pdf bytes
+        `field_data` is the output of `get_field_data` for this pdf. If it is
+        not passed, it will be read from the pdf.
+        If `stream` is True, returns an iterator of byte chunks instead.
+        """
         pdf_path = self._coerce_to_file_path(pdf_path)
-        field_data = self.get_field_data(pdf_path)
+        if field_data is None:
+            field_data = self.get_field_data(pdf_path)
         option_check = self._get_name_option_lookup(field_data)
         output_path = self._write_tmp_file()
         self._fill(pdf_path, output_path, option_check, answers)
-        result = self._get_file_contents(output_path)
-        if self.clean_up:
-            self.clean_up_tmp_files()
-        return result
+        return self._get_output(output_path, stream)
 
-    def fill_many_pdfs(self, pdf_path, answers_list):
+    def _fill_to_tmp_files(self, pdf_path, answers_list, field_data=None):
+        """Fills the pdf once for each set of answers and returns the paths
+        of the filled temporary files, in the same order as `answers_list`
 
-        # don't clean up while filling multiple pdfs
+        The template is copied and its fields are read at most once for the
+        whole batch, and up to `self.CONCURRENCY` fills are run at once.
+        """
+        pdf_path = self._coerce_to_file_path(pdf_path)
+        if field_data is None:
+            field_data = self.get_field_data(pdf_path)
+        option_check = self._get_name_option_lookup(field_data)
+        output_paths = [self._write_tmp_file() for answers in answers_list]
+        fill_args = [
+            (pdf_path, output_path, option_check, answers)
+            for output_path, answers in zip(output_paths, answers_list)]
+        if self.CONCURRENCY == 1 or len(fill_args) < 2:
+            for args in fill_args:
+                self._fill(*args)
+        else:
+            with ThreadPoolExecutor(max_workers=self.CONCURRENCY) as pool:
+                futures = [
+                    pool.submit(self._fill, *args) for args in fill_args]
+                for future in futures:
+                    # raises the first error, if any
+                    future.result()
+        return output_paths
+
+    def batch_fill_pdfs(self, pdf_path, answers_list, field_data=None,
+                        join=False):
+        """Fills the pdf once for each set of answers
+
+        Returns a tuple of (filled_pdfs, joined_pdf), where `filled_pdfs` is a
+        list of filled pdf bytes in the same order as `answers_list`. If
+        `join` is True, `joined_pdf` is the bytes of all the filled pdfs
+        concatenated by one `concat_files` call; otherwise it is None.
+        """
+        # don't clean up until the whole batch is done
         _clean_up_setting = self.clean_up
         self.clean_up = False
+        try:
+            output_paths = self._fill_to_tmp_files(
+                pdf_path, answers_list, field_data)
+            filled_pdfs = [
+                self._get_file_contents(path) for path in output_paths]
+            joined_pdf = None
+            if join and len(output_paths) > 1:
+                joined_pdf = self.join_pdfs(output_paths)
+            elif join and output_paths:
+                joined_pdf = filled_pdfs[0]
+        finally:
+            self.clean_up = _clean_up_setting
+            if self.clean_up:
+                self.clean_up_tmp_files()
+        return filled_pdfs, joined_pdf
 
-        pdf_path = self._coerce_to_file_path(pdf_path)
-        field_data = self.get_field_data(pdf_path)
-        option_check = self._get_name_option_lookup(field_data)
-        tmp_filled_pdf_paths = []
-        for answers in answers_list:
-            output_path = self._write_tmp_file()
-            self._fill(pdf_path, output_path, option_check, answers)
-            tmp_filled_pdf_paths.append(output_path)
-        self.clean_up = _clean_up_setting
-        return self.join_pdfs(tmp_filled_pdf_paths)
+    def fill_many_pdfs(self, pdf_path, answers_list, field_data=None,
+                       stream=False):
+
+        # don't clean up while filling multiple pdfs
+        _clean_up_setting = self.clean_up
+        self.clean_up = False
+        try:
+            tmp_filled_pdf_paths = self._fill_to_tmp_files(
+                pdf_path, answers_list, field_data)
+            # joining cleans up once the output is read, which is after
+            # this returns if it is streamed
+            self.clean_up = _clean_up_setting
+            return self.join_pdfs(tmp_filled_pdf_paths, stream=stream)
+        except Exception:
+            if _clean_up_setting:
+                self.clean_up_tmp_files()
+            raise
+        finally:
+            self.clean_up = _clean_up_setting
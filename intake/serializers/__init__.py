@@ -3,10 +3,8 @@ from .view_serializer import ViewMixpanelSerializer
 from .form_submission_serializer import FormSubmissionFollowupListSerializer
 from .applicant_serializer import ApplicantMixpanelSerializer
 from .organization_serializer import OrganizationSerializer
-from .app_index_serializers import (
-    ApplicationIndexSerializer,
-    ApplicationIndexWithTransfersSerializer)
-from .application_serializers import ApplicationAutocompleteSerializer
+from .application_serializers import (
+    ApplicationAutocompleteSerializer, ApplicationSearchEntrySerializer)
 from .status_update_serializer import StatusUpdateSerializer
 from .note_serializer import ApplicationNoteSerializer
 from .tag_serializer import TagSerializer
@@ -21,8 +19,7 @@ __all__ = [
     FormSubmissionFollowupListSerializer,
     OrganizationSerializer,
     ApplicationAutocompleteSerializer,
-    ApplicationIndexSerializer,
-    ApplicationIndexWithTransfersSerializer,
+    ApplicationSearchEntrySerializer,
     ApplicationNoteSerializer,
     StatusUpdateSerializer,
     TagSerializer,
@@ -42,3 +42,10 @@ class ApplicationAutocompleteSerializer(serializers.ModelSerializer):
 
     def get_url(self, instance):
         return instance.form_submission.get_absolute_url()
+
+
+class ApplicationSearchEntrySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = models.ApplicationSearchEntry
+        fields = ['name', 'url']
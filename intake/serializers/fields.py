@@ -68,6 +68,17 @@ class FormattedLocalDateField(LocalDateField):
         return super().to_representation(dt).strftime(self.format)
 
 
+def get_chained_attribute(obj, attribute_accessor_sequence):
+    """Follows a dotted sequence of attributes, such as
+    'profile.organization.name', starting from obj
+    """
+    value = obj
+    for accessor in attribute_accessor_sequence.split('.'):
+        if accessor:
+            value = getattr(value, accessor)
+    return value
+
+
 class ChainableAttributeField(serializers.Field):
 
     def __init__(self, attribute_accessor_sequence, *args, **kwargs):
@@ -76,11 +87,5 @@ class ChainableAttributeField(serializers.Field):
         self.attribute_accessor_sequence = attribute_accessor_sequence
 
     def to_representation(self, obj):
-        value = obj
-        attribute_sequence = getattr(
-            self, 'attribute_accessor_sequence', '').split('.')
-        while attribute_sequence:
-            accessor = attribute_sequence.pop(0)
-            if accessor:
-                value = getattr(value, accessor)
-        return value
+        return get_chained_attribute(
+            obj, getattr(self, 'attribute_accessor_sequence', ''))
@@ -1,15 +1,48 @@
+from rest_framework import serializers
 from .applicant_serializer import ApplicantMixpanelSerializer
+from .fields import ChainableAttributeField, get_chained_attribute
 from .request_serializer import RequestSerializer
 from .view_serializer import ViewMixpanelSerializer
 
 
-def mixpanel_applicant_data(applicant):
-    return ApplicantMixpanelSerializer(applicant).data
+def plain_serializer(serializer_class):
+    """Returns a function that builds the same dict as
+    `serializer_class(obj).data`, for serializers made only of
+    ChainableAttributeFields and SerializerMethodFields, without binding
+    and running DRF fields for every object. The mixpanel data
+    serializers are called for almost every event, so this skips work
+    that they don't need.
+    """
+    serializer = serializer_class()
+    getters = []
+    for name, field in serializer_class._declared_fields.items():
+        if isinstance(field, ChainableAttributeField):
+            getters.append((
+                name, field.attribute_accessor_sequence, None))
+        elif isinstance(field, serializers.SerializerMethodField):
+            method = getattr(serializer, field.method_name or 'get_' + name)
+            getters.append((name, None, method))
+        else:
+            raise TypeError(
+                "{} can't be serialized without DRF".format(field))
 
+    def serialize(obj):
+        if obj is None:
+            # DRF gives the initial values of the writable fields
+            return {
+                name: None for name, accessor, method in getters
+                if not method}
+        data = {}
+        for name, attribute_accessor_sequence, method in getters:
+            if method:
+                data[name] = method(obj)
+            else:
+                data[name] = get_chained_attribute(
+                    obj, attribute_accessor_sequence)
+        return data
+    return serialize
 
-def mixpanel_request_data(request):
-    return RequestSerializer(request).data
 
-
-def mixpanel_view_data(view):
-    return ViewMixpanelSerializer(view).data
+mixpanel_applicant_data = plain_serializer(ApplicantMixpanelSerializer)
+mixpanel_request_data = plain_serializer(RequestSerializer)
+mixpanel_view_data = plain_serializer(ViewMixpanelSerializer)
@@ -0,0 +1,161 @@
+"""A read model for the org user application index.
+
+Each page of the index is filled with two queries, or three for
+organizations that receive transfers, no matter how many status updates
+or transfers the applications have. Rows are plain `__slots__` objects
+rather than serialized dicts, and can be read as attributes in templates
+or with keys like the serialized dicts they replace.
+"""
+from django.core.urlresolvers import reverse
+from django.db import connection
+from intake.constants import PACIFIC_TIME
+
+
+# the latest status is read through Application.latest_status_update, which
+# is kept up to date by StatusUpdate.save and backfilled by migration 0072
+APPLICATION_ROWS_SQL = """
+SELECT
+    app.id, app.has_been_opened, app.was_transferred_out,
+    sub.id, sub.date_received, sub.first_name, sub.last_name,
+    sub.phone_number, sub.email,
+    latest_status_type.display_name, latest_status.updated
+FROM intake_application AS app
+JOIN intake_formsubmission AS sub ON sub.id = app.form_submission_id
+LEFT JOIN intake_statusupdate AS latest_status
+    ON latest_status.id = app.latest_status_update_id
+LEFT JOIN intake_statustype AS latest_status_type
+    ON latest_status_type.id = latest_status.status_type_id
+WHERE app.id = ANY(%s)
+"""
+
+INCOMING_TRANSFER_ROWS_SQL = """
+SELECT
+    transfer.new_application_id, to_org.name, from_org.name,
+    author_profile.name, status_update.updated, transfer.reason
+FROM intake_applicationtransfer AS transfer
+JOIN intake_application AS new_app ON new_app.id = transfer.new_application_id
+JOIN user_accounts_organization AS to_org
+    ON to_org.id = new_app.organization_id
+JOIN intake_statusupdate AS status_update
+    ON status_update.id = transfer.status_update_id
+JOIN intake_application AS old_app
+    ON old_app.id = status_update.application_id
+JOIN user_accounts_organization AS from_org
+    ON from_org.id = old_app.organization_id
+LEFT JOIN user_accounts_userprofile AS author_profile
+    ON author_profile.user_id = status_update.author_id
+WHERE transfer.new_application_id = ANY(%s)
+ORDER BY status_update.updated, transfer.id
+"""
+
+
+def to_local(dt):
+    return dt.astimezone(PACIFIC_TIME) if dt else dt
+
+
+class Row:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name))
+            for name in self.__slots__))
+
+
+class SubmissionRow(Row):
+    __slots__ = (
+        'id', 'local_date_received', 'first_name', 'last_name',
+        'phone_number', 'email')
+
+    def __init__(self, id, date_received, first_name, last_name,
+                 phone_number, email):
+        self.id = id
+        self.local_date_received = to_local(date_received)
+        self.first_name = first_name
+        self.last_name = last_name
+        self.phone_number = phone_number
+        self.email = email
+
+    @property
+    def url(self):
+        return reverse(
+            'intake-app_detail', kwargs=dict(submission_id=self.id))
+
+    @property
+    def printout_url(self):
+        return reverse(
+            'intake-case_printout', kwargs=dict(submission_id=self.id))
+
+
+class LatestStatusRow(Row):
+    __slots__ = ('status_type', 'updated')
+
+    def __init__(self, status_type, updated):
+        self.status_type = status_type
+        self.updated = to_local(updated)
+
+
+class IncomingTransferRow(Row):
+    __slots__ = (
+        'to_organization_name', 'organization_name', 'author_name',
+        'local_date', 'reason')
+
+    def __init__(self, to_organization_name, organization_name, author_name,
+                 updated, reason):
+        self.to_organization_name = to_organization_name
+        self.organization_name = organization_name
+        self.author_name = author_name
+        self.local_date = to_local(updated)
+        self.reason = reason
+
+
+class ApplicationRow(Row):
+    __slots__ = (
+        'id', 'has_been_opened', 'was_transferred_out', 'form_submission',
+        'latest_status', 'incoming_transfers')
+
+    def __init__(self, id, has_been_opened, was_transferred_out,
+                 form_submission, latest_status=None):
+        self.id = id
+        self.has_been_opened = has_been_opened
+        self.was_transferred_out = was_transferred_out
+        self.form_submission = form_submission
+        self.latest_status = latest_status
+        self.incoming_transfers = []
+
+
+def get_application_rows(application_ids, with_transfers=False):
+    """Returns a list of ApplicationRow objects in the same order as
+    `application_ids`. If `with_transfers` is True, each row includes its
+    `incoming_transfers`.
+    """
+    application_ids = list(application_ids)
+    if not application_ids:
+        return []
+    rows = {}
+    with connection.cursor() as cursor:
+        cursor.execute(APPLICATION_ROWS_SQL, [application_ids])
+        for (app_id, has_been_opened, was_transferred_out, sub_id,
+             date_received, first_name, last_name, phone_number, email,
+             status_type, status_updated) in cursor.fetchall():
+            latest_status = None
+            if status_updated is not None:
+                latest_status = LatestStatusRow(status_type, status_updated)
+            rows[app_id] = ApplicationRow(
+                app_id, has_been_opened, was_transferred_out,
+                SubmissionRow(
+                    sub_id, date_received, first_name, last_name,
+                    phone_number, email),
+                latest_status)
+        if with_transfers:
+            cursor.execute(INCOMING_TRANSFER_ROWS_SQL, [application_ids])
+            for app_id, *transfer in cursor.fetchall():
+                rows[app_id].incoming_transfers.append(
+                    IncomingTransferRow(*transfer))
+    return [rows[app_id] for app_id in application_ids if app_id in rows]
@@ -1,7 +1,7 @@
 from django.db.models import Q
 from intake import models, serializers, notifications, tasks
 from intake.services import events_service as EventsService
-from . import pagination
+from . import app_index, pagination
 
 
 def get_applications_for_org(organization):
@@ -35,10 +35,10 @@ def get_applications_for_org(organization):
     return qset.order_by('-created').distinct()
 
 UNREAD_APPLICATIONS_FILTER_KWARGS = dict(
-    has_been_opened=False, status_updates__isnull=True)
+    has_been_opened=False, status_update_count=0)
 
 
-NEEDS_STATUS_UPDATE_FILTER_KWARGS = dict(status_updates__isnull=True)
+NEEDS_STATUS_UPDATE_FILTER_KWARGS = dict(status_update_count=0)
 
 
 def get_unread_applications_for_org(organization):
@@ -46,32 +46,42 @@ def get_unread_applications_for_org(organization):
         **UNREAD_APPLICATIONS_FILTER_KWARGS)
 
 
-def get_applications_for_org_user(user, page_index, **filters):
-    """Paginates and serializes applications for an org user
+# applications are paginated by cursor in this order when no page number
+# is given
+APPLICATION_KEYSET = ('-created', '-id')
+
+
+def get_applications_for_org_user(user, page_index, cursor=None, **filters):
+    """Paginates applications for an org user into app index rows. Without
+    a page_index, pages are found by cursor instead of by page number.
     """
     organization = user.profile.organization
-    query = get_applications_for_org(organization)
-    if filters:
-        query = query.filter(**filters)
-    serializer = serializers.ApplicationIndexSerializer
-    if organization.can_transfer_applications:
-        serializer = \
-            serializers.ApplicationIndexWithTransfersSerializer
-    return pagination.get_serialized_page(query, serializer, page_index)
+    query = models.Application.objects.filter(
+        organization=organization, **filters
+    ).only('id', 'created').order_by(*APPLICATION_KEYSET)
+    if page_index is None:
+        page = pagination.get_cursor_page(query, cursor, APPLICATION_KEYSET)
+    else:
+        page = pagination.get_page(query, page_index)
+    page.object_list = app_index.get_application_rows(
+        [app.id for app in page.object_list],
+        with_transfers=organization.can_transfer_applications)
+    return page
 
 
-def get_all_applications_for_org_user(user, page_index):
-    return get_applications_for_org_user(user, page_index)
+def get_all_applications_for_org_user(user, page_index, cursor=None):
+    return get_applications_for_org_user(user, page_index, cursor)
 
 
-def get_unread_applications_for_org_user(user, page_index):
+def get_unread_applications_for_org_user(user, page_index, cursor=None):
     return get_applications_for_org_user(
-        user, page_index, **UNREAD_APPLICATIONS_FILTER_KWARGS)
+        user, page_index, cursor, **UNREAD_APPLICATIONS_FILTER_KWARGS)
 
 
-def get_applications_needing_updates_for_org_user(user, page_index):
+def get_applications_needing_updates_for_org_user(
+        user, page_index, cursor=None):
     return get_applications_for_org_user(
-        user, page_index, **NEEDS_STATUS_UPDATE_FILTER_KWARGS)
+        user, page_index, cursor, **NEEDS_STATUS_UPDATE_FILTER_KWARGS)
 
 
 def get_status_updates_for_org_user(application):
@@ -164,6 +174,13 @@ def get_valid_application_ids_from_set(application_ids):
         id__in=application_ids).values_list('id', flat=True)
 
 
+def get_application_counts_for_org(organization):
+    """Returns a dict of the precomputed 'unread', 'needs_update' and
+    'total' application counts for an organization
+    """
+    return models.ApplicationCounts.get_for_organization(organization.id)
+
+
 def get_unread_apps_per_org_count(organization):
     return models.Application.objects.filter(
         organization=organization, **UNREAD_APPLICATIONS_FILTER_KWARGS).count()
@@ -2,11 +2,11 @@ import logging
 import intake
 from project.jinja2 import external_reverse
 from intake import notifications
-from intake.utils import is_the_weekend
+from intake.utils import is_the_weekend, get_id_set_fingerprint
 from intake.models import (
     FormSubmission,
     ApplicationBundle, get_parser, ApplicationLogEntry,
-    Application
+    Application, ApplicationCounts
 )
 from user_accounts.models import Organization
 import intake.services.submissions as SubmissionsService
@@ -35,6 +35,7 @@ def mark_opened(bundle, user, send_slack_notification=True):
         form_submission_id__in=submission_ids,
         organization_id=user.profile.organization.id
     ).distinct().update(has_been_opened=True)
+    ApplicationCounts.refresh([user.profile.organization.id])
     EventsService.bundle_opened(bundle, user)
     if send_slack_notification:
         notifications.slack_submissions_viewed.send(
@@ -43,15 +44,15 @@ def mark_opened(bundle, user, send_slack_notification=True):
 
 
 def get_or_create_for_submissions_and_user(submissions, user):
-    query = ApplicationBundle.objects.all()
-    for sub in submissions:
-        query = query.filter(submissions=sub)
+    query = ApplicationBundle.objects.filter(
+        submission_ids_fingerprint=get_id_set_fingerprint(submissions))
     if not user.is_staff:
         query = query.filter(organization=user.profile.organization)
     query = query.first()
     if not query:
+        # the pdf is built by a PDFBundleBuildJob when it is first requested
         query = create_bundle_from_submissions(
-            submissions,
+            submissions, skip_pdf=True,
             organization=user.profile.organization)
     return query
 
@@ -79,8 +80,12 @@ def build_bundled_pdf_if_necessary(bundle):
         ).format(bundle.pk)
         logger.error(msg)
         intake.notifications.slack_simple.send(msg)
-        for submission in submissions:
-            SubmissionsService.fill_pdfs_for_submission(submission)
+        filled_submission_ids = set(
+            filled.submission_id for filled in filled_pdfs)
+        SubmissionsService.fill_pdfs_for_submissions(
+            [sub for sub in submissions
+             if sub.id not in filled_submission_ids],
+            organizations=[bundle.organization])
         filled_pdfs = bundle.get_individual_filled_pdfs()
     if len(filled_pdfs) == 1:
         bundle.set_bundled_pdf_to_bytes(filled_pdfs[0].pdf.read())
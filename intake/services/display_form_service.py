@@ -2,8 +2,13 @@ from formation.forms import (
     display_form_selector, DeclarationLetterDisplay)
 
 
-def instantiate_display_form_with_submission(form_class, submission):
-    """Feed a submission and its associated data into a display form class
+def get_display_form_data(submission):
+    """Returns the data used to instantiate display forms for a submission
+    and whether a declaration letter should be shown.
+
+    This is the only part of instantiating display forms that queries the
+    database, so its results can be handed to `build_display_forms`
+    elsewhere, such as in another process.
     """
     # one query to get all related objects
     orgs = list(submission.organizations.select_related('county'))
@@ -13,11 +18,18 @@ def instantiate_display_form_with_submission(form_class, submission):
         counties=county_slugs,
         organizations=[org.name for org in orgs])
     init_data.update(submission.answers)
+    show_declaration = any(map(lambda o: o.requires_declaration_letter, orgs))
+    return init_data, show_declaration
+
+
+def build_display_forms(form_class, submission, init_data, show_declaration):
+    """Returns a display form and an optional declaration letter display
+    form, without querying the database
+    """
     display_form = form_class(init_data, validate=True)
     display_form.display_only = True
     display_form.display_template_name = "formation/intake_display.jinja"
     display_form.submission = submission
-    show_declaration = any(map(lambda o: o.requires_declaration_letter, orgs))
     if show_declaration:
         declaration_letter_form = DeclarationLetterDisplay(
             init_data, validate=True)
@@ -25,21 +37,41 @@ def instantiate_display_form_with_submission(form_class, submission):
     return display_form, None
 
 
+def instantiate_display_form_with_submission(form_class, submission):
+    """Feed a submission and its associated data into a display form class
+    """
+    return build_display_forms(
+        form_class, submission, *get_display_form_data(submission))
+
+
+def get_display_form_counties_for_user_and_submission(user, submission):
+    """Returns the county slugs used to select the display form class
+    for a user and submission
+    """
+    if not user.is_staff:
+        # get the county for the shared org between user and submission
+        return list(submission.organizations.filter(
+            profiles__user__id=user.id
+        ).values_list('county__slug', flat=True))
+    return list(submission.organizations.values_list(
+        'county__slug', flat=True))
+
+
+def get_display_form_counties_for_application(application):
+    """Returns the county slugs used to select the display form class
+    for an application
+    """
+    return [application.organization.county.slug]
+
+
 def get_display_form_for_user_and_submission(user, submission):
     """
     based on user information, get the correct Form class and return it
     instantiated with the data from submission
     """
-    if not user.is_staff:
-        # get the county for the shared org between user and submission
-        DisplayFormClass = display_form_selector.get_combined_form_class(
-            counties=submission.organizations.filter(
-                profiles__user__id=user.id
-            ).values_list('county__slug', flat=True))
-    else:
-        DisplayFormClass = display_form_selector.get_combined_form_class(
-            counties=submission.organizations.values_list(
-                'county__slug', flat=True))
+    DisplayFormClass = display_form_selector.get_combined_form_class(
+        counties=get_display_form_counties_for_user_and_submission(
+            user, submission))
     return instantiate_display_form_with_submission(
         DisplayFormClass, submission)
 
@@ -49,6 +81,6 @@ def get_display_form_for_application(application):
     destined for
     """
     DisplayFormClass = display_form_selector.get_combined_form_class(
-        counties=[application.organization.county.slug])
+        counties=get_display_form_counties_for_application(application))
     return instantiate_display_form_with_submission(
         DisplayFormClass, application.form_submission)
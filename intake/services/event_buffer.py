@@ -0,0 +1,133 @@
+"""Collects mixpanel events in memory and sends them to the
+`log_events_to_mixpanel` task in batches, instead of queueing one task
+per event.
+
+While a request is handled, its events are collected by an
+EventCollector and are all sent with one task after the response has
+been returned, when Django sends `request_finished`.
+
+Outside of requests, a batch is sent once it has
+settings.MIXPANEL_EVENT_BATCH_SIZE events, or
+settings.MIXPANEL_EVENT_BATCH_SECONDS after its first event, and when
+the process exits.
+"""
+import atexit
+import threading
+import time
+from django.conf import settings
+from django.core.signals import request_finished
+from intake.tasks import log_events_to_mixpanel
+
+
+def make_event(distinct_id, event_name, **data):
+    # record when the event happened, rather than when it is sent
+    data.setdefault('time', int(time.time()))
+    return dict(
+        distinct_id=distinct_id, event_name=event_name, properties=data)
+
+
+class EventCollector:
+    """Collects the events logged while handling one request, to send
+    them together
+    """
+
+    def __init__(self):
+        self.events = []
+        self.context = {}
+
+    def add(self, distinct_id, event_name, **data):
+        self.events.append(make_event(distinct_id, event_name, **data))
+
+    def get_context(self, key, get_data, obj):
+        if key not in self.context:
+            self.context[key] = get_data(obj)
+        return self.context[key]
+
+    def publish(self):
+        events, self.events = self.events, []
+        if events:
+            log_events_to_mixpanel.delay(events)
+
+
+class EventBuffer:
+
+    def __init__(self):
+        self.events = []
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def add(self, distinct_id, event_name, **data):
+        event = make_event(distinct_id, event_name, **data)
+        with self.lock:
+            self.events.append(event)
+            is_full = len(self.events) >= settings.MIXPANEL_EVENT_BATCH_SIZE
+            if not is_full and self.timer is None:
+                self.timer = threading.Timer(
+                    settings.MIXPANEL_EVENT_BATCH_SECONDS, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if is_full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            events, self.events = self.events, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if events:
+            log_events_to_mixpanel.delay(events)
+
+
+_buffer = EventBuffer()
+_local = threading.local()
+
+
+def log_event(distinct_id, event_name, **data):
+    """Adds an event to the current request's collector, or to the buffer
+    outside of requests. Takes the same arguments as `log_to_mixpanel`.
+    """
+    collector = getattr(_local, 'collector', None)
+    if collector is not None:
+        collector.add(distinct_id, event_name, **data)
+    else:
+        _buffer.add(distinct_id, event_name, **data)
+
+
+def get_context(key, get_data, obj):
+    """Returns `get_data(obj)`, which is computed once per `key` during a
+    request. Returned dicts are shared, and should be copied rather than
+    changed.
+    """
+    collector = getattr(_local, 'collector', None)
+    if collector is None or key is None:
+        return get_data(obj)
+    return collector.get_context(key, get_data, obj)
+
+
+def start_collecting():
+    """Starts collecting events for a request in this thread, and returns
+    the EventCollector
+    """
+    publish_collected()
+    _local.collector = EventCollector()
+    return _local.collector
+
+
+def publish_collected(**kwargs):
+    """Sends the events collected in this thread and stops collecting.
+    This receives `request_finished`, which is sent when the server closes
+    the response.
+    """
+    collector = getattr(_local, 'collector', None)
+    _local.collector = None
+    if collector is not None:
+        collector.publish()
+
+
+def flush():
+    _buffer.flush()
+
+
+request_finished.connect(publish_collected)
+atexit.register(flush)
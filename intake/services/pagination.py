@@ -1,4 +1,9 @@
+import base64
+import binascii
+import json
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import connection
+from django.db.models import Q
 
 
 def get_page(qset, page_index, max_count_per_page=25, min_count_per_page=5):
@@ -19,3 +24,147 @@ def get_serialized_page(qset, serializer, page_index, **kwargs):
     page = get_page(qset, page_index, **kwargs)
     page.object_list = serializer(page.object_list, many=True).data
     return page
+
+
+class CursorPage:
+    """A page of results found by keyset pagination, which filters on the
+    ordering fields of the last row seen instead of using an offset, so
+    that every page costs about the same as the first.
+
+    It has the parts of `django.core.paginator.Page` used by the app
+    indexes, plus opaque `next_cursor` and `previous_cursor` tokens and
+    an `estimated_count` of all the results.
+    """
+    is_cursor_page = True
+
+    def __init__(self, object_list, estimated_count,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.estimated_count = estimated_count
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<CursorPage of {} results>'.format(len(self.object_list))
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(direction, values):
+    data = json.dumps([direction, values], default=str)
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, keyset):
+    """Returns a (direction, values) tuple from a cursor token, or None if
+    the token is missing or invalid. Dates are left as strings, which
+    the model fields parse when filtering.
+    """
+    if not cursor:
+        return None
+    try:
+        direction, values = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if direction not in ('next', 'previous') or \
+            not isinstance(values, list) or len(values) != len(keyset):
+        return None
+    return direction, values
+
+
+def get_keyset_filter(keyset, values, direction):
+    """Returns a Q object for the rows after `values` in the ordering given
+    by `keyset`, or before them if the direction is 'previous'. For
+    ('-created', '-id') this is `created < x OR (created = x AND id < y)`
+    """
+    keyset_filter = Q()
+    equal_filter = Q()
+    for field, value in zip(keyset, values):
+        is_descending = field.startswith('-')
+        field_name = field.lstrip('-')
+        if is_descending == (direction == 'next'):
+            lookup = '__lt'
+        else:
+            lookup = '__gt'
+        keyset_filter |= equal_filter & Q(**{field_name + lookup: value})
+        equal_filter &= Q(**{field_name: value})
+    return keyset_filter
+
+
+def reverse_ordering(keyset):
+    return [
+        field[1:] if field.startswith('-') else '-' + field
+        for field in keyset]
+
+
+def get_keyset_values(obj, keyset):
+    return [getattr(obj, field.lstrip('-')) for field in keyset]
+
+
+def estimate_count(qset):
+    """Returns the planner's estimate of the number of rows in a queryset,
+    which uses table statistics instead of counting rows
+    """
+    sql, params = qset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']['Plan Rows']
+
+
+def get_cursor_page(qset, cursor, keyset, max_count_per_page=25):
+    """Returns a CursorPage of results from a queryset ordered by `keyset`,
+    a sequence of field names which must end with a unique field, such
+    as ('-created', '-id'). An empty or invalid cursor returns the first
+    page.
+    """
+    decoded = decode_cursor(cursor, keyset)
+    direction = 'next'
+    page_qset = qset.order_by(*keyset)
+    if decoded:
+        direction, values = decoded
+        page_qset = page_qset.filter(
+            get_keyset_filter(keyset, values, direction))
+        if direction == 'previous':
+            page_qset = page_qset.order_by(*reverse_ordering(keyset))
+    results = list(page_qset[:max_count_per_page + 1])
+    has_more = len(results) > max_count_per_page
+    results = results[:max_count_per_page]
+    if direction == 'previous':
+        results.reverse()
+    next_cursor = None
+    previous_cursor = None
+    if results:
+        if has_more or direction == 'previous':
+            next_cursor = encode_cursor(
+                'next', get_keyset_values(results[-1], keyset))
+        if decoded and (has_more or direction == 'next'):
+            previous_cursor = encode_cursor(
+                'previous', get_keyset_values(results[0], keyset))
+    return CursorPage(
+        results, estimate_count(qset), next_cursor, previous_cursor)
+
+
+def get_serialized_cursor_page(qset, serializer, cursor, keyset, **kwargs):
+    page = get_cursor_page(qset, cursor, keyset, **kwargs)
+    page.object_list = serializer(page.object_list, many=True).data
+    return page
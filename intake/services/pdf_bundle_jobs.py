@@ -0,0 +1,131 @@
+import logging
+from django.db import transaction
+from django.utils import timezone
+from project import alerts
+from intake import models, tasks
+from intake.utils import get_id_set_fingerprint
+from user_accounts.models import Organization
+import intake.services.pdf_service as PDFService
+import intake.services.bundles as BundlesService
+
+
+logger = logging.getLogger(__name__)
+
+
+def fail_stale_jobs(jobs):
+    """Marks unfinished jobs that have not been updated within
+    PDFBundleBuildJob.STALE_AFTER as failed. Their task was most likely
+    lost, for example when a worker was killed.
+    """
+    now = timezone.now()
+    jobs.filter(
+        status__in=models.PDFBundleBuildJob.UNFINISHED_STATUSES,
+        updated__lt=now - models.PDFBundleBuildJob.STALE_AFTER
+    ).update(
+        status=models.PDFBundleBuildJob.FAILED,
+        error='Stopped making progress', updated=now)
+
+
+def get_reusable_jobs(**filters):
+    jobs = models.PDFBundleBuildJob.objects.filter(**filters)
+    fail_stale_jobs(jobs)
+    return jobs.filter(
+        status__in=models.PDFBundleBuildJob.REUSABLE_STATUSES
+    ).order_by('-created')
+
+
+def start_job(job):
+    """Saves a new job and runs it in a task once the job is committed,
+    so that the worker can always read it
+    """
+    job.save()
+    transaction.on_commit(
+        lambda: tasks.run_pdf_bundle_build_job.delay(job.id))
+    return job
+
+
+def get_or_start_job_for_app_ids(organization, app_ids):
+    """Returns a job that builds a PrebuiltPDFBundle for exactly `app_ids`,
+    reusing an unfailed job for the same set of ids if one exists
+    """
+    fingerprint = get_id_set_fingerprint(app_ids)
+    with transaction.atomic():
+        # concurrent requests for the same organization wait here, so
+        # that only one of them starts a job
+        Organization.objects.select_for_update().get(id=organization.id)
+        jobs = get_reusable_jobs(app_ids_fingerprint=fingerprint)
+        for job in jobs:
+            # a finished job is only useful if its bundle still exists
+            if job.status != job.DONE or job.prebuilt_pdf_bundle_id:
+                return job
+        job = start_job(models.PDFBundleBuildJob(
+            organization=organization, app_ids=sorted(app_ids),
+            app_ids_fingerprint=fingerprint))
+    alerts.send_email_to_admins(
+        subject='Missing Prebuilt PDF Bundle',
+        message='Querying with ids \n{}\ndid not return a prebuilt pdf. '
+                'Building one in the background.'.format(app_ids))
+    job.refresh_from_db()
+    return job
+
+
+def get_or_start_job_for_application_bundle(bundle):
+    """Returns a job that builds the pdf of an ApplicationBundle, reusing
+    an unfailed job for the same bundle if one exists
+    """
+    with transaction.atomic():
+        # concurrent requests for the same bundle wait here
+        models.ApplicationBundle.objects.select_for_update().get(
+            id=bundle.id)
+        job = get_reusable_jobs(application_bundle=bundle).first()
+        if job:
+            return job
+        job = start_job(models.PDFBundleBuildJob(
+            organization_id=bundle.organization_id,
+            application_bundle=bundle))
+    job.refresh_from_db()
+    return job
+
+
+def build_prebuilt_pdf_bundle(job):
+    apps = models.Application.objects.filter(
+        id__in=job.app_ids
+    ).select_related('form_submission', 'organization').order_by('id')
+    # filling is the slowest step, so it is done first to report progress
+    PDFService.fill_any_unfilled_pdfs_for_app_ids(job.app_ids)
+    job.set_progress(job.RUNNING, 50)
+    job.prebuilt_pdf_bundle = PDFService.get_or_build_pdf_bundle_for_apps(
+        job.organization, list(apps))
+
+
+def build_application_bundle_pdf(job):
+    BundlesService.build_bundled_pdf_if_necessary(job.application_bundle)
+
+
+def run_job(job_id):
+    """Builds the pdf for a job and records its progress. Jobs that have
+    already finished are not run again.
+    """
+    job = models.PDFBundleBuildJob.objects.select_related(
+        'organization', 'application_bundle').get(id=job_id)
+    if job.is_finished():
+        return job
+    job.set_progress(job.RUNNING, 0)
+    try:
+        if job.application_bundle_id:
+            build_application_bundle_pdf(job)
+        else:
+            build_prebuilt_pdf_bundle(job)
+    except Exception as err:
+        logger.exception('Failed to run {}'.format(job))
+        job.status = job.FAILED
+        job.error = repr(err)
+        job.save()
+        alerts.send_email_to_admins(
+            subject='PDF bundle build job failed',
+            message='{}\n{}'.format(job, job.error))
+        return job
+    job.status = job.DONE
+    job.progress = 100
+    job.save()
+    return job
@@ -1,9 +1,16 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
 from django.db.models import Count
 from project import alerts
-from intake import models, exceptions, utils
+from intake import models, exceptions, utils, pdfparser
 import intake.services.applications_service as AppsService
 from user_accounts.models import Organization
 import intake.services.display_form_service as DisplayFormService
+import intake.services.printout_cache as PrintoutCacheService
+from formation.forms import display_form_selector
 from printing.pdf_form_display import PDFFormDisplay
 
 
@@ -24,20 +31,60 @@ def fill_pdf_for_application(application_id):
         submission=app.form_submission)
 
 
+def fill_pdfs_for_applications(applications):
+    """Creates Filled PDFs for many applications, filling each organization's
+    FillablePDF once for its whole batch of applications.
+    Raises an error if any organization lacks a fillable pdf or if it has
+    no file loaded.
+    """
+    apps_by_org_id = {}
+    for app in applications:
+        apps_by_org_id.setdefault(app.organization_id, []).append(app)
+    fillables_by_org_id = {}
+    for fillable in models.FillablePDF.objects.filter(
+            organization_id__in=apps_by_org_id.keys()).order_by('pk'):
+        fillables_by_org_id.setdefault(fillable.organization_id, fillable)
+    for org_id, apps in apps_by_org_id.items():
+        fillable_pdf = fillables_by_org_id.get(org_id)
+        if not fillable_pdf or not fillable_pdf.pdf:
+            raise exceptions.MissingFillablePDFError(
+                "{org_name} lacks a pdf to fill for {apps}".format(
+                    org_name=apps[0].organization.name,
+                    apps=', '.join(str(app) for app in apps)))
+    filled_pdfs = []
+    for org_id, apps in apps_by_org_id.items():
+        filled_pdfs.extend(
+            fillables_by_org_id[org_id].fill_for_submissions(
+                app.form_submission for app in apps))
+    return filled_pdfs
+
+
 def get_prebuilt_pdf_bundle_for_app_id_set(app_ids):
-    # match the number of IDs
+    if not app_ids:
+        return None
     # order_by('created') is used to create deterministic results
     # for testing purposes
-    matching_bundles = models.PrebuiltPDFBundle.objects.annotate(
-        app_count=Count('applications')
-    ).filter(app_count=len(app_ids)).order_by('created')
-    # ensure it includes each ID
-    for app_id in app_ids:
-        matching_bundles = matching_bundles.filter(applications__id=app_id)
-    return matching_bundles.first()
+    return models.PrebuiltPDFBundle.objects.filter(
+        app_ids_fingerprint=utils.get_id_set_fingerprint(app_ids)
+    ).order_by('created').first()
+
+
+def get_submission_page_counts(filled_pdfs):
+    """Returns [[form_submission_id, page_count], ...] for FilledPDFs that
+    are ordered so that the pdfs of each submission are adjacent
+    """
+    page_counts = []
+    for filled in filled_pdfs:
+        count = pdfparser.count_pages(filled.pdf)
+        if page_counts and page_counts[-1][0] == filled.submission_id:
+            page_counts[-1][1] += count
+        else:
+            page_counts.append([filled.submission_id, count])
+    return page_counts
 
 
 def set_bytes_to_filled_pdfs(instance, filled_pdfs):
+    instance.submission_page_counts = get_submission_page_counts(filled_pdfs)
     if len(filled_pdfs) == 0:
         instance.pdf = None
     elif len(filled_pdfs) == 1:
@@ -49,57 +96,126 @@ def set_bytes_to_filled_pdfs(instance, filled_pdfs):
     instance.save()
 
 
+def get_filled_pdfs_for_apps(apps):
+    """Returns FilledPDFs for the given applications, with the pdfs of each
+    submission adjacent to each other
+    """
+    return list(models.FilledPDF.objects.filter(
+        submission_id__in=[app.form_submission_id for app in apps]
+    ).order_by('submission_id', 'pk'))
+
+
 def fill_any_unfilled_pdfs_for_app_ids(app_ids):
-    apps_without_pdfs = models.Application.objects.annotate(
+    apps_without_pdfs = list(models.Application.objects.annotate(
         filled_pdf_count=Count('form_submission__filled_pdfs')
-    ).filter(id__in=app_ids, filled_pdf_count=0)
+    ).filter(
+        id__in=app_ids, filled_pdf_count=0
+    ).select_related('form_submission', 'organization'))
     # build individual filled pdfs if necessary
-    for app in apps_without_pdfs:
-        fill_pdf_for_application(app.id)
     if apps_without_pdfs:
+        fill_pdfs_for_applications(apps_without_pdfs)
         message = '{} apps did not have PDFs:\n'.format(len(apps_without_pdfs))
         message += '\n'.join([str(app) for app in apps_without_pdfs])
         alerts.send_email_to_admins(
             subject='No FilledPDFs for Applications', message=message)
 
 
-def get_or_create_prebuilt_pdf_for_app_ids(app_ids):
-    prebuilt = get_prebuilt_pdf_bundle_for_app_id_set(app_ids)
-    if not prebuilt:
-        subject = 'Missing Prebuilt PDF Bundle'
-        message = \
-            'Querying with ids \n{}\ndid not return a prebuilt pdf'.format(
-                app_ids)
-        alerts.send_email_to_admins(subject=subject, message=message)
-        prebuilt = update_pdf_bundle_for_san_francisco()
-    return prebuilt
-
-
 def create_new_pdf_bundle_for_apps(org, apps):
     app_ids = [app.id for app in apps]
     pdf_bundle = models.PrebuiltPDFBundle(organization_id=org.id)
     pdf_bundle.save()
     pdf_bundle.applications.add(*apps)
     fill_any_unfilled_pdfs_for_app_ids(app_ids)
-    filled_pdfs = models.FilledPDF.objects.filter(
-        submission__applications__id__in=app_ids)
+    filled_pdfs = get_filled_pdfs_for_apps(apps)
     set_bytes_to_filled_pdfs(pdf_bundle, filled_pdfs)
     return pdf_bundle
 
 
+def get_latest_editable_pdf_bundle(org):
+    """Returns the newest PrebuiltPDFBundle for an org that has a pdf with
+    known page ranges, or None
+    """
+    return models.PrebuiltPDFBundle.objects.filter(
+        organization_id=org.id
+    ).exclude(pdf='').exclude(
+        submission_page_counts=[]
+    ).order_by('-created').first()
+
+
+def derive_pdf_bundle_for_apps(org, previous_bundle, apps):
+    """Creates a PrebuiltPDFBundle for `apps` by editing the pdf of
+    `previous_bundle` rather than rebuilding it from every FilledPDF.
+
+    Pages for submissions that are no longer in `apps` are removed and
+    filled pdfs for newly added apps are appended, so the work done depends
+    on the number of changed applications, not on the total.
+    """
+    sub_ids = set(app.form_submission_id for app in apps)
+    previous_page_ranges = previous_bundle.get_page_ranges()
+    removed_page_ranges = [
+        page_range
+        for sub_id, page_range in previous_page_ranges.items()
+        if sub_id not in sub_ids]
+    kept_page_counts = [
+        [sub_id, page_count]
+        for sub_id, page_count in previous_bundle.submission_page_counts
+        if sub_id in sub_ids]
+    new_apps = [
+        app for app in apps
+        if app.form_submission_id not in previous_page_ranges]
+    fill_any_unfilled_pdfs_for_app_ids([app.id for app in new_apps])
+    new_filled_pdfs = get_filled_pdfs_for_apps(new_apps)
+
+    pdf_bundle = models.PrebuiltPDFBundle(organization_id=org.id)
+    pdf_bundle.save()
+    pdf_bundle.applications.add(*apps)
+    pdfs = []
+    if kept_page_counts:
+        if removed_page_ranges:
+            pdfs.append(pdfparser.remove_page_ranges(
+                previous_bundle.pdf, removed_page_ranges))
+        else:
+            previous_bundle.pdf.seek(0)
+            pdfs.append(previous_bundle.pdf.read())
+    pdfs.extend(filled.pdf for filled in new_filled_pdfs)
+    pdf_bundle.submission_page_counts = \
+        kept_page_counts + get_submission_page_counts(new_filled_pdfs)
+    if len(pdfs) == 0:
+        pdf_bundle.pdf = None
+    elif len(pdfs) == 1:
+        pdf = pdfs[0]
+        pdf_bundle.set_bytes(pdf if isinstance(pdf, bytes) else pdf.read())
+    else:
+        pdf_bundle.set_bytes(models.get_parser().join_pdfs(pdfs))
+    pdf_bundle.save()
+    return pdf_bundle
+
+
+def get_or_build_pdf_bundle_for_apps(org, apps):
+    """Returns the PrebuiltPDFBundle for exactly `apps`, building it if
+    necessary, by editing the latest bundle if possible
+    """
+    pdf_bundle = get_prebuilt_pdf_bundle_for_app_id_set(
+        [app.id for app in apps])
+    if not pdf_bundle:
+        previous_bundle = get_latest_editable_pdf_bundle(org)
+        if previous_bundle:
+            pdf_bundle = derive_pdf_bundle_for_apps(
+                org, previous_bundle, apps)
+        else:
+            pdf_bundle = create_new_pdf_bundle_for_apps(org, apps)
+    return pdf_bundle
+
+
 def update_pdf_bundle_for_san_francisco():
     """Gets or creates a PrebuiltPDFBundle for San Francisco
         links it to all the unread applications
-        and rebuilds the PDF
+        and builds the PDF, by editing the latest bundle if possible
     """
     sf_pubdef = Organization.objects.get(slug='sf_pubdef')
     unread_apps = AppsService.get_unread_applications_for_org(sf_pubdef)
     if unread_apps.count() > 0:
-        app_ids = [app.id for app in unread_apps]
-        pdf_bundle = get_prebuilt_pdf_bundle_for_app_id_set(app_ids)
-        if not pdf_bundle:
-            pdf_bundle = create_new_pdf_bundle_for_apps(sf_pubdef, unread_apps)
-        return pdf_bundle
+        return get_or_build_pdf_bundle_for_apps(sf_pubdef, unread_apps)
 
 
 def rebuild_pdf_bundle_for_removed_application(application_id):
@@ -121,77 +237,157 @@ def get_applicant_name(form):
     )
 
 
-def get_printout_for_submission(user, submission):
-    # get the correct form
-    form, letter = DisplayFormService.get_display_form_for_user_and_submission(
-        user, submission)
-    # use the form to serialize the submission
-    pdf_display = PDFFormDisplay(form, letter)
-    canvas, pdf = pdf_display.render(
+def get_printout_args(counties, submission):
+    """Returns the picklable arguments needed by `render_printout` to draw
+    the case details for a submission. All the database queries happen
+    here, so that rendering can be done in other processes.
+    """
+    init_data, show_declaration = DisplayFormService.get_display_form_data(
+        submission)
+    return counties, submission, init_data, show_declaration
+
+
+def get_printout_args_for_submission(user, submission):
+    return get_printout_args(
+        DisplayFormService.get_display_form_counties_for_user_and_submission(
+            user, submission),
+        submission)
+
+
+def get_printout_args_for_application(application):
+    return get_printout_args(
+        DisplayFormService.get_display_form_counties_for_application(
+            application),
+        application.form_submission)
+
+
+def render_printout(printout_args):
+    """Returns the filename and pdf bytes of the case details for one
+    submission, given the output of `get_printout_args`
+    """
+    counties, submission, init_data, show_declaration = printout_args
+    DisplayFormClass = display_form_selector.get_combined_form_class(
+        counties=counties)
+    form, letter = DisplayFormService.build_display_forms(
+        DisplayFormClass, submission, init_data, show_declaration)
+    canvas, pdf = PDFFormDisplay(form, letter).render(
         title=get_applicant_name(form) + " - Case Details")
     filename = '{}-{}-{}-CaseDetails.pdf'.format(
         form.last_name.get_display_value(),
         form.first_name.get_display_value(),
         submission.id)
-    pdf.seek(0)
-    return filename, pdf.read()
+    return filename, pdf.getvalue()
+
+
+_printout_executor = None
+_printout_executor_lock = threading.Lock()
+
+
+def get_printout_executor():
+    """Returns a pool of settings.PRINTOUT_PROCESSES processes that is
+    kept for the life of this process, so that requests don't wait for
+    worker processes to start
+    """
+    global _printout_executor
+    with _printout_executor_lock:
+        if _printout_executor is None:
+            _printout_executor = ProcessPoolExecutor(
+                max_workers=settings.PRINTOUT_PROCESSES)
+        return _printout_executor
+
+
+def reset_printout_executor():
+    global _printout_executor
+    with _printout_executor_lock:
+        if _printout_executor is not None:
+            _printout_executor.shutdown(wait=False)
+        _printout_executor = None
+
+
+def render_printouts(printout_args_list):
+    """Renders each printout separately, in the shared pool of processes
+    if settings.PRINTOUT_PROCESSES is more than one, and returns a list of
+    (filename, pdf bytes) tuples in the same order
+    """
+    processes = getattr(settings, 'PRINTOUT_PROCESSES', 1)
+    if processes > 1 and len(printout_args_list) > 1:
+        try:
+            return list(get_printout_executor().map(
+                render_printout, printout_args_list))
+        except BrokenProcessPool:
+            # a worker died, so start a new pool for the next request
+            reset_printout_executor()
+    return [render_printout(args) for args in printout_args_list]
+
+
+def get_printouts(printout_args_list):
+    """Returns a (filename, pdf bytes) tuple for each item of
+    `printout_args_list`, from the printout cache where possible. Only
+    the printouts that are not cached are rendered.
+    """
+    keys = [
+        get_printout_key(printout_args)
+        for printout_args in printout_args_list]
+    printouts = PrintoutCacheService.get_cached_printouts(keys)
+    missing = OrderedDict(
+        (key, printout_args)
+        for key, printout_args in zip(keys, printout_args_list)
+        if key not in printouts)
+    rendered = render_printouts(list(missing.values()))
+    for (key, printout_args), printout in zip(missing.items(), rendered):
+        counties, submission, init_data, show_declaration = printout_args
+        PrintoutCacheService.cache_printout(
+            key, submission, init_data, *printout)
+        printouts[key] = printout
+    return [printouts[key] for key in keys]
+
+
+def get_printout_key(printout_args):
+    return PrintoutCacheService.get_printout_key(*printout_args)
+
+
+def get_printout(printout_args):
+    return get_printouts([printout_args])[0]
 
 
 def get_printout_for_application(application):
-    form, letter = DisplayFormService.get_display_form_for_application(
-        application)
-    pdf_display = PDFFormDisplay(form, letter)
-    canvas, pdf = pdf_display.render(
-        title=get_applicant_name(form) + "- Case Details")
-    filename = '{}-{}-{}-CaseDetails.pdf'.format(
-        form.last_name.get_display_value(),
-        form.first_name.get_display_value(),
-        application.form_submission_id)
-    pdf.seek(0)
-    return filename, pdf.read()
-
-
-def concatenated_printout(form_letter_tuples):
-    canvas = None
-    pdf_file = None
-    count = len(form_letter_tuples)
-    for i, form_letter_tuple in enumerate(form_letter_tuples):
-        if i == 0:
-            pdf_display = PDFFormDisplay(*form_letter_tuple)
-            canvas, pdf_file = pdf_display.render(save=False)
-        else:
-            pdf_display = PDFFormDisplay(*form_letter_tuple, canvas=canvas)
-            if i == (count - 1):
-                canvas, pdf = pdf_display.render(
-                    save=True,
-                    title="{} Applications from Code for America".format(
-                        count))
-            else:
-                canvas, pdf = pdf_display.render(save=False)
+    return get_printout(get_printout_args_for_application(application))
+
+
+def concatenated_printout(printout_args_list):
+    """Returns a filename and an iterator over the chunks of one pdf
+    containing the case details of every submission. The pdf is complete
+    before the first chunk, and is read from a spooled temporary file so
+    that large printouts are not held in memory while they are sent.
+    """
+    count = len(printout_args_list)
+    pdf_file = pdfparser.merge_pdfs(
+        [pdf for filename, pdf in get_printouts(printout_args_list)],
+        title="{} Applications from Code for America".format(count))
     today = utils.get_todays_date()
     filename = '{}-{}-Applications-CodeForAmerica.pdf'.format(
         today.strftime('%Y-%m-%d'), count)
-    pdf_file.seek(0)
-    return filename, pdf_file.read()
+    return filename, pdfparser.iter_file_chunks(pdf_file)
 
 
 def get_concatenated_printout_for_bundle(user, bundle):
     submissions = list(bundle.submissions.all())
     count = len(submissions)
     if count == 1:
-        return get_printout_for_submission(user, submissions[0])
+        filename, pdf = get_printout_for_submission(user, submissions[0])
+        return filename, iter([pdf])
     else:
         return concatenated_printout([
-            DisplayFormService.get_display_form_for_user_and_submission(
-                user, submission)
+            get_printout_args_for_submission(user, submission)
             for submission in submissions])
 
 
 def get_concatenated_printout_for_applications(applications):
     count = len(applications)
     if count == 1:
-        return get_printout_for_application(applications[0])
+        filename, pdf = get_printout_for_application(applications[0])
+        return filename, iter([pdf])
     else:
         return concatenated_printout([
-            DisplayFormService.get_display_form_for_application(app)
+            get_printout_args_for_application(app)
             for app in applications])
@@ -0,0 +1,118 @@
+import datetime
+import hashlib
+import json
+import logging
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from intake import models, utils
+from intake.constants import PACIFIC_TIME
+
+
+logger = logging.getLogger(__name__)
+
+# bump this whenever the printout layout changes, to stop serving
+# printouts that were rendered by older code
+PRINTOUT_VERSION = 1
+
+
+def get_hash(data):
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def get_printout_data_hash(init_data):
+    """Returns a hash of the submission data drawn on a printout"""
+    return get_hash(init_data)
+
+
+def get_printout_key(
+        counties, submission, init_data, show_declaration):
+    """Returns a key for a printout, taking the same arguments as
+    `pdf_service.render_printout`. The combined form class is determined
+    by the sorted county slugs, so those are used as its signature.
+    Printouts show how many days ago the submission was received, so the
+    key also changes each day.
+    """
+    return get_hash(dict(
+        version=PRINTOUT_VERSION,
+        submission_id=submission.id,
+        data_hash=get_printout_data_hash(init_data),
+        form_class=sorted(counties),
+        has_letter=bool(show_declaration),
+        render_date=utils.get_todays_date()))
+
+
+def get_start_of_today():
+    return PACIFIC_TIME.localize(datetime.datetime.combine(
+        utils.get_todays_date(), datetime.time()))
+
+
+def get_cached_printouts(keys):
+    """Returns a dict mapping each cached key to a (filename, bytes) tuple
+    and marks the entries as recently used
+    """
+    entries = list(models.PrintoutCacheEntry.objects.filter(key__in=keys))
+    printouts = {}
+    for entry in entries:
+        try:
+            printouts[entry.key] = (entry.filename, entry.get_bytes())
+        except (IOError, OSError):
+            logger.warning('Missing file for {}'.format(entry))
+            delete_entries([entry])
+    if printouts:
+        models.PrintoutCacheEntry.objects.filter(
+            key__in=list(printouts.keys())
+        ).update(last_accessed=timezone.now())
+    return printouts
+
+
+def cache_printout(key, submission, init_data, filename, pdf_bytes):
+    """Stores a rendered printout, and removes any printouts of older
+    versions of the same submission's data, or from earlier days
+    """
+    data_hash = get_printout_data_hash(init_data)
+    delete_entries(models.PrintoutCacheEntry.objects.filter(
+        submission_id=submission.id).exclude(
+            data_hash=data_hash, created__gte=get_start_of_today()))
+    entry = models.PrintoutCacheEntry(
+        key=key, submission_id=submission.id, data_hash=data_hash,
+        filename=filename)
+    entry.set_bytes(pdf_bytes)
+    try:
+        with transaction.atomic():
+            entry.save()
+    except IntegrityError:
+        # another request cached the same printout first
+        entry.pdf.delete(save=False)
+        return None
+    evict_if_necessary()
+    return entry
+
+
+def delete_entries(entries):
+    for entry in entries:
+        entry.pdf.delete(save=False)
+        entry.delete()
+
+
+def evict_if_necessary():
+    """Deletes the least recently used printouts until the cache is no
+    larger than settings.PRINTOUT_CACHE_MAX_BYTES
+    """
+    max_bytes = getattr(settings, 'PRINTOUT_CACHE_MAX_BYTES', None)
+    if max_bytes is None:
+        return
+    total = models.PrintoutCacheEntry.objects.aggregate(
+        total=Sum('size'))['total'] or 0
+    if total <= max_bytes:
+        return
+    evicted = []
+    for entry in models.PrintoutCacheEntry.objects.order_by(
+            'last_accessed').only('id', 'pdf', 'size').iterator():
+        if total <= max_bytes:
+            break
+        evicted.append(entry)
+        total -= entry.size
+    delete_entries(evicted)
@@ -1,21 +1,78 @@
-from django.db.models import Q
+import re
+import Levenshtein
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
 from intake import models
+from intake.models.form_submission import (
+    get_search_text, normalize_search_text, normalize_search_digits)
+import intake.services.submissions as SubmissionsService
+
+
+# fuzzy name search finds at most this many candidates using indexes,
+# then ranks them in python by Levenshtein ratio
+FUZZY_CANDIDATES_LIMIT = 100
+FUZZY_RESULTS_LIMIT = 20
+FUZZY_NAME_CUTOFF = 0.7
+FUZZY_MAX_QUERY_WORDS = 4
+
+# queries made only of digits and the punctuation of phone numbers and
+# ssns, such as '(415) 212-4848', are also searched as digits
+DIGITS_QUERY_PATTERN = re.compile(r'^[\d\s\-().]*\d[\d\s\-().]*$')
+
+# the FormSubmission columns shown in followup search results, see
+# FormSubmissionFollowupListSerializer. Only the name keys of `answers`
+# are loaded, for `get_full_name`.
+FOLLOWUP_RESULT_FIELDS = ('id', 'date_received', 'phone_number', 'email')
+NAME_ANSWERS_SQL = str(
+    "jsonb_build_object("
+    "'first_name', intake_formsubmission.answers->'first_name', "
+    "'last_name', intake_formsubmission.answers->'last_name')")
+
+# these expressions match the indexes added in migration 0068
+NAME_SEARCH_SQL = str(
+    "lower(intake_formsubmission.first_name || ' ' || "
+    "intake_formsubmission.last_name)")
+METAPHONE_MATCH_SQL = str(
+    "metaphone(intake_formsubmission.{}, 8) = ANY(ARRAY("
+    "SELECT metaphone(word, 8) FROM unnest(%s::text[]) AS word))")
+FUZZY_CANDIDATE_WHERE = str(
+    "({first_name_sounds_like} OR {last_name_sounds_like} "
+    "OR %s <%% {name})").format(
+        first_name_sounds_like=METAPHONE_MATCH_SQL.format('first_name'),
+        last_name_sounds_like=METAPHONE_MATCH_SQL.format('last_name'),
+        name=NAME_SEARCH_SQL)
+
+
+def get_search_filter(query_string, field_name='search_text'):
+    """Returns a Q object matching `FormSubmission.search_text` against
+    a lowercased version of the query_string, and a digits-only version if
+    the query_string looks like a phone number or ssn.
+
+    `search_text` has a trigram index, so these `LIKE '%...%'` queries
+    do not need to scan every submission.
+    """
+    text = normalize_search_text(query_string)
+    search_filter = Q(**{field_name + '__contains': text})
+    if DIGITS_QUERY_PATTERN.match(query_string or ''):
+        digits = normalize_search_digits(query_string)
+        search_filter |= Q(**{field_name + '__contains': digits})
+    return search_filter
+
+
+def get_search_rank(query_string, field_name='search_text'):
+    return TrigramSimilarity(field_name, normalize_search_text(query_string))
 
 
 def filter_submissions_with_querystring(submissions_queryset, query_string):
-    """Filters a FormSubmission queryset based on a query_string
+    """Filters a FormSubmission queryset based on a query_string, ordering
+    the closest matches first
     """
     return submissions_queryset.filter(
-            Q(first_name__icontains=query_string) |
-            Q(last_name__icontains=query_string) |
-            Q(ssn__icontains=query_string) |
-            Q(last_four__icontains=query_string) |
-            Q(drivers_license_or_id__icontains=query_string) |
-            Q(phone_number__icontains=query_string) |
-            Q(alternate_phone_number__icontains=query_string) |
-            Q(email__icontains=query_string) |
-            Q(case_number__icontains=query_string)
-    )
+        get_search_filter(query_string)
+    ).annotate(
+        search_rank=get_search_rank(query_string)
+    ).order_by('-search_rank', '-date_received')
 
 
 def get_submissions_with_querystring(query_string):
@@ -27,8 +84,137 @@ def get_submissions_with_querystring(query_string):
 
 def get_applications_with_query_string(query_string):
     """Returns an Application queryset filtered down to those
-        which have a form_submission matching the query_string
+        which have a form_submission matching the query_string,
+        ordering the closest matches first
     """
-    matching_subs = get_submissions_with_querystring(query_string)
+    field_name = 'form_submission__search_text'
     return models.Application.objects.filter(
-        form_submission_id__in=matching_subs.values_list('id', flat=True))
+        get_search_filter(query_string, field_name)
+    ).annotate(
+        search_rank=get_search_rank(query_string, field_name)
+    ).order_by('-search_rank', '-created')
+
+
+def get_search_entries_with_query_string(query_string, organization_id=None):
+    """Returns an ApplicationSearchEntry queryset matching the query_string,
+        ordering the closest matches first. If an organization_id is given,
+        only that organization's entries are searched, which uses the
+        combined organization and search text index.
+    """
+    entries = models.ApplicationSearchEntry.objects.all()
+    if organization_id is not None:
+        entries = entries.filter(organization_id=organization_id)
+    return entries.filter(
+        get_search_filter(query_string)
+    ).annotate(
+        search_rank=get_search_rank(query_string)
+    ).order_by('-search_rank', '-created')
+
+
+def update_search_text(submissions_queryset):
+    """Recomputes `search_text` and the application search entries for
+    submissions that were saved without `FormSubmission.save`, such as
+    those loaded from fixtures
+    """
+    for sub in submissions_queryset.iterator():
+        search_text = get_search_text(sub)
+        if search_text != sub.search_text:
+            models.FormSubmission.objects.filter(id=sub.id).update(
+                search_text=search_text)
+    models.ApplicationSearchEntry.sync_for_submissions(submissions_queryset)
+
+
+def get_fuzzy_name_score(query_name, name_parts):
+    """Scores a lowercase query against a submission's name parts. This
+    is the best of the Levenshtein ratio against the full lowercase name
+    used by SubmissionsService, and the average ratio of each query word
+    against its closest word in the name, so that a misspelled last name
+    on its own still matches.
+    """
+    full_name = SubmissionsService.join_lowercase_name(name_parts)
+    name_words = full_name.split()
+    if not name_words:
+        return 0.0
+    query_words = query_name.split()
+    word_score = sum(
+        max(Levenshtein.ratio(query_word, name_word)
+            for name_word in name_words)
+        for query_word in query_words) / len(query_words)
+    return max(Levenshtein.ratio(query_name, full_name), word_score)
+
+
+def get_fuzzy_name_matches(
+        submissions_queryset, query_string, limit=FUZZY_RESULTS_LIMIT,
+        cutoff=FUZZY_NAME_CUTOFF):
+    """Returns up to `limit` (submission id, score) tuples for submissions
+    whose names are similar to the query_string, best matches first.
+
+    Candidates are submissions where a name sounds like a word in the
+    query (by metaphone key) or where the query is similar to the name
+    (by trigram word similarity), both of which are indexed. Only their
+    name answers are fetched for ranking.
+    """
+    query_name = normalize_search_text(query_string)
+    words = query_name.split()[:FUZZY_MAX_QUERY_WORDS]
+    if not words:
+        return []
+    candidates = submissions_queryset.extra(
+        where=[FUZZY_CANDIDATE_WHERE],
+        params=[words, words, query_name]
+    ).annotate(
+        name_similarity=RawSQL(
+            "word_similarity(%s, {})".format(NAME_SEARCH_SQL),
+            (query_name,)),
+        **{
+            'answer_' + key: SubmissionsService.get_name_answer_sql(key)
+            for key in SubmissionsService.NAME_ANSWER_KEYS}
+    ).order_by('-name_similarity').values_list(
+        'id', *[
+            'answer_' + key for key in SubmissionsService.NAME_ANSWER_KEYS]
+    )[:FUZZY_CANDIDATES_LIMIT]
+    matches = []
+    for sub_id, *name_parts in candidates:
+        score = get_fuzzy_name_score(
+            query_name, [part or '' for part in name_parts])
+        if score >= cutoff:
+            matches.append((sub_id, score))
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches[:limit]
+
+
+def fuzzy_filter_submissions_with_querystring(
+        submissions_queryset, query_string):
+    """Returns a list of submissions from the queryset with names similar
+    to the query_string, best matches first. Only the fields shown in
+    followup search results are loaded.
+    """
+    scores = dict(get_fuzzy_name_matches(submissions_queryset, query_string))
+    if not scores:
+        return []
+    submissions = submissions_queryset.filter(
+        id__in=list(scores.keys())
+    ).only(*FOLLOWUP_RESULT_FIELDS).annotate(
+        name_answers=RawSQL(NAME_ANSWERS_SQL, ()))
+    for submission in submissions:
+        # setting the deferred field keeps it from being loaded
+        submission.answers = submission.name_answers
+    return sorted(submissions, key=lambda sub: scores[sub.id], reverse=True)
+
+
+def get_fuzzy_search_entries(query_string, organization_id=None):
+    """Returns a list of ApplicationSearchEntry objects for applications
+    with names similar to the query_string, best matches first
+    """
+    submissions = models.FormSubmission.objects.all()
+    entries = models.ApplicationSearchEntry.objects.all()
+    if organization_id is not None:
+        submissions = submissions.filter(
+            applications__organization_id=organization_id)
+        entries = entries.filter(organization_id=organization_id)
+    scores = dict(get_fuzzy_name_matches(submissions, query_string))
+    entries = entries.filter(
+        application__form_submission_id__in=list(scores.keys())
+    ).annotate(form_submission_id=F('application__form_submission_id'))
+    return sorted(
+        entries, key=lambda entry: scores[entry.form_submission_id],
+        reverse=True)
@@ -3,6 +3,9 @@ This module handles queries to retrieve common statistics
 """
 from datetime import datetime, timedelta
 from collections import Counter
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
 from intake import models, constants, utils
 from user_accounts.models import Organization
 
@@ -33,39 +36,129 @@ def as_year_week(dt):
     return dt.strftime('%Y-%W-1')
 
 
-def get_app_dates_sub_ids_org_ids():
-    return models.Application.objects.values_list(
-        'form_submission__date_received', 'form_submission_id',
-        'organization_id'
-    ).order_by('-form_submission__date_received')
+# weeks start on Monday in Pacific time, the same weeks as `as_year_week`
+WEEK_START_SQL = str(
+    "date_trunc('week', intake_formsubmission.date_received "
+    "AT TIME ZONE 'US/Pacific')::date")
 
+# both filter on the plain date_received column so that its index is used
+ORG_WEEKLY_COUNTS_SQL = str(
+    "SELECT intake_application.organization_id, {week}, count(*) "
+    "FROM intake_application JOIN intake_formsubmission "
+    "ON intake_formsubmission.id = intake_application.formsubmission_id "
+    "WHERE intake_formsubmission.date_received >= %s "
+    "GROUP BY 1, 2").format(week=WEEK_START_SQL)
 
-def rollup_subs(app_dates_sub_ids_org_ids):
-    """Reduces results down to unique sub & datetime pairs
+ALL_WEEKLY_COUNTS_SQL = str(
+    "SELECT NULL, {week}, count(*) FROM intake_formsubmission "
+    "WHERE intake_formsubmission.date_received >= %s "
+    "AND EXISTS (SELECT 1 FROM intake_application "
+    "WHERE intake_application.formsubmission_id = intake_formsubmission.id) "
+    "GROUP BY 2").format(week=WEEK_START_SQL)
+
+EARLIEST_WEEK = datetime(1970, 1, 5).date()
+
+
+def get_week_start(dt):
+    """Returns the date of the Monday starting the Pacific time week of a
+    date or datetime
+    """
+    if isinstance(dt, datetime):
+        dt = dt.astimezone(constants.PACIFIC_TIME).date()
+    return dt - timedelta(days=dt.weekday())
+
+
+def get_week_start_datetime(week_start):
+    """Returns the aware datetime of midnight in Pacific time on a week start
+    date
     """
-    return set(
-        (row[0], row[1])
-        for row in app_dates_sub_ids_org_ids)
+    return constants.PACIFIC_TIME.localize(
+        datetime.combine(week_start, datetime.min.time()))
 
 
-def counts_by_week(datetimes):
-    return Counter(
-        as_year_week(dt.astimezone(constants.PACIFIC_TIME))
-        for dt in datetimes)
+def get_refresh_start_week():
+    """Returns the first week that may have changed since counts were last
+    refreshed, or None if they have never been refreshed
+    """
+    last_refreshed = models.WeeklyApplicationCount.objects.aggregate(
+        last_refreshed=Max('refreshed'))['last_refreshed']
+    if not last_refreshed:
+        return None
+    earliest_changed_app = models.Application.objects.filter(
+        updated__gte=last_refreshed
+    ).aggregate(
+        earliest=Min('form_submission__date_received'))['earliest']
+    this_week = get_week_start(timezone.now())
+    if not earliest_changed_app:
+        return this_week
+    return min(this_week, get_week_start(earliest_changed_app))
+
+
+def refresh_weekly_application_counts(full=False):
+    """Recounts applications per organization and week, and unique
+    submissions per week, with one GROUP BY query each.
+
+    Unless `full` is True, only weeks that may have changed since the last
+    refresh are recounted. Deleted applications only disappear from the
+    counts on a full refresh.
+    """
+    start_week = None if full else get_refresh_start_week()
+    start_week = start_week or EARLIEST_WEEK
+    refreshed = timezone.now()
+    received_since = get_week_start_datetime(start_week)
+    rows = []
+    with connection.cursor() as cursor:
+        for sql in (ORG_WEEKLY_COUNTS_SQL, ALL_WEEKLY_COUNTS_SQL):
+            cursor.execute(sql, [received_since])
+            rows.extend(cursor.fetchall())
+    with transaction.atomic():
+        models.WeeklyApplicationCount.objects.filter(
+            week_start__gte=start_week).delete()
+        models.WeeklyApplicationCount.objects.bulk_create([
+            models.WeeklyApplicationCount(
+                organization_id=org_id, week_start=week_start, count=count,
+                refreshed=refreshed)
+            for org_id, week_start, count in rows])
+    return len(rows)
+
+
+def get_weekly_counts():
+    """Returns a dict of organization id (None for all organizations) to
+    a Counter of week start dates. The counts are filled by the
+    refresh_weekly_application_counts command, which runs on release and
+    on a schedule, never during a request.
+    """
+    weekly_counts = {}
+    for org_id, week_start, count in \
+            models.WeeklyApplicationCount.objects.values_list(
+                'organization_id', 'week_start', 'count'):
+        weekly_counts.setdefault(org_id, Counter())[week_start] = count
+    return weekly_counts
 
 
 def make_weekly_totals(week_counter, year_weeks):
     return sorted([
         {
             'date': row[1].strftime('%Y-%m-%d'),
-            'count': week_counter[row[0]]
+            'count': week_counter[get_week_start(row[1])]
         }
         for row in year_weeks
     ], key=lambda d: d['date'])
 
 
+def make_org_datum(org, week_counter, year_weeks):
+    weekly_totals = make_weekly_totals(week_counter, year_weeks)
+    return {
+        'org': org,
+        'total': sum(week_counter.values()),
+        'apps_this_week': weekly_totals[-1]['count'],
+        'apps_last_week': weekly_totals[-2]['count'],
+        'weekly_totals': weekly_totals
+    }
+
+
 def get_org_data_dict():
-    """
+    """Reads the counts saved by `refresh_weekly_application_counts`
     [
       {
         'org': {
@@ -85,26 +178,11 @@ def get_org_data_dict():
         Organization.objects.filter(
             is_receiving_agency=True, is_live=True).values(
                 'name', 'slug', 'id').order_by('name'))
-    app_data = get_app_dates_sub_ids_org_ids()
-    week_counter = counts_by_week(
-        row[0] for row in rollup_subs(app_data))
-    weekly_totals = make_weekly_totals(week_counter, year_weeks)
-    org_data = [{
-        'org': {'name': 'Total (All Organizations)', 'slug': 'all'},
-        'total': models.FormSubmission.objects.count(),
-        'apps_this_week': weekly_totals[-1]['count'],
-        'apps_last_week': weekly_totals[-2]['count'],
-        'weekly_totals': weekly_totals
-    }]
+    weekly_counts = get_weekly_counts()
+    org_data = [make_org_datum(
+        {'name': 'Total (All Organizations)', 'slug': 'all'},
+        weekly_counts.get(None, Counter()), year_weeks)]
     for org in orgs:
-        org_datum = {'org': org}
-        week_counter = counts_by_week(
-            row[0] for row in app_data
-            if row[2] == org['id'])
-        org_datum['weekly_totals'] = make_weekly_totals(
-            week_counter, year_weeks)
-        org_datum['total'] = sum(week_counter.values())
-        org_datum['apps_this_week'] = org_datum['weekly_totals'][-1]['count']
-        org_datum['apps_last_week'] = org_datum['weekly_totals'][-2]['count']
-        org_data.append(org_datum)
+        org_data.append(make_org_datum(
+            org, weekly_counts.get(org['id'], Counter()), year_weeks))
     return org_data
@@ -1,13 +1,16 @@
 import itertools
 from django.utils.translation import ugettext_lazy as _
 import Levenshtein
+from django.db.models.expressions import RawSQL
 import intake.services.events_service as EventsService
 from intake import models, serializers, notifications, tasks
 from intake.constants import SMS, EMAIL
 from . import pagination
 from intake.service_objects import ConfirmationNotification
+from intake.utils import UnionFind
 from intake.models.form_submission import (
-    FORMSUBMISSION_TEXT_SEARCH_FIELDS, QUERYABLE_ANSWER_FIELDS, DOLLAR_FIELDS)
+    FORMSUBMISSION_TEXT_SEARCH_FIELDS, QUERYABLE_ANSWER_FIELDS, DOLLAR_FIELDS,
+    NAME_ANSWER_KEYS, join_lowercase_name, get_org_set_fingerprint)
 
 
 class MissingAnswersError(Exception):
@@ -34,6 +37,9 @@ def create_submission(form, organizations, applicant_id):
         existing = address.get(component, None)
         if existing:
             setattr(submission, component, existing)
+    # add_orgs_to_sub saves the same fingerprint, setting it here allows
+    # duplicates to be checked without reloading the submission
+    submission.org_set_fingerprint = get_org_set_fingerprint(organizations)
     submission.save()
 
     submission.organizations.add_orgs_to_sub(*organizations)
@@ -51,14 +57,33 @@ def send_to_newapps_bundle_if_needed(submission, organizations):
 def fill_pdfs_for_submission(submission, organizations=None):
     """Checks for and creates any needed `FilledPDF` objects
     """
+    fill_pdfs_for_submissions([submission], organizations)
+
+
+def fill_pdfs_for_submissions(submissions, organizations=None):
+    """Creates any needed `FilledPDF` objects for many submissions,
+    filling each `FillablePDF` once for the whole batch
+    """
+    submissions = list(submissions)
+    if not submissions:
+        return
     if organizations:
         fillables = models.FillablePDF.objects.filter(
             organization_id__in=[org.id for org in organizations])
-    else:
-        fillables = models.FillablePDF.objects.filter(
-            organization__submissions=submission)
+        for fillable in fillables:
+            fillable.fill_for_submissions(submissions)
+        return
+    sub_ids_by_org_id = {}
+    for sub_id, org_id in models.Application.objects.filter(
+            form_submission_id__in=[sub.id for sub in submissions]
+            ).values_list('form_submission_id', 'organization_id'):
+        sub_ids_by_org_id.setdefault(org_id, set()).add(sub_id)
+    fillables = models.FillablePDF.objects.filter(
+        organization_id__in=sub_ids_by_org_id.keys())
     for fillable in fillables:
-        fillable.fill_for_submission(submission)
+        sub_ids = sub_ids_by_org_id[fillable.organization_id]
+        fillable.fill_for_submissions(
+            sub for sub in submissions if sub.id in sub_ids)
 
 
 def get_latest_submission_from_applicant(applicant_id):
@@ -102,20 +127,37 @@ def get_submissions_for_staff_user():
     )
 
 
-def get_submissions_for_followups(page_index):
+# followups are paginated by cursor in this order when no page number is
+# given
+FOLLOWUP_KEYSET = ('-date_received', '-id')
+
+
+def get_submissions_for_followups(page_index, cursor=None):
     query = get_submissions_for_staff_user()
     serializer = serializers.FormSubmissionFollowupListSerializer
+    if page_index is None:
+        return pagination.get_serialized_cursor_page(
+            query, serializer, cursor, FOLLOWUP_KEYSET)
     return pagination.get_serialized_page(query, serializer, page_index)
 
 
 def check_for_existing_duplicates(submission, applicant_id):
-    dups = []
-    other_subs = models.FormSubmission.objects.filter(
-        applicant_id=applicant_id).exclude(id=submission.id)
-    for other in other_subs:
-        if are_duplicates(submission, other):
-            dups.append(other)
-    return dups
+    """Returns (id, duplicate_set_id) tuples for earlier submissions from
+    the same applicant that are duplicates of `submission`.
+
+    Candidates are found with one indexed lookup on applicant and org set
+    fingerprint, and only their name keys are loaded to compare names.
+    """
+    candidates = models.FormSubmission.objects.filter(
+        applicant_id=applicant_id,
+        org_set_fingerprint=submission.org_set_fingerprint
+    ).exclude(id=submission.id).order_by().values_list(
+        'id', 'duplicate_name_key', 'duplicate_set_id')
+    name = submission.duplicate_name_key
+    return [
+        (other_id, dup_set_id)
+        for other_id, other_name, dup_set_id in candidates
+        if Levenshtein.ratio(name, other_name) > NAME_DIFFERENCE_THRESHOLD]
 
 
 def link_with_any_duplicates(submission, applicant_id):
@@ -127,37 +169,110 @@ def link_with_any_duplicates(submission, applicant_id):
     duplicates = check_for_existing_duplicates(submission, applicant_id)
     if duplicates:
         dup_set_id = None
-        unadded_duplicates = []
-        for dup in duplicates:
-            if dup.duplicate_set_id:
-                dup_set_id = dup.duplicate_set_id
+        unadded_duplicate_ids = []
+        for dup_id, dup_dup_set_id in duplicates:
+            if dup_dup_set_id:
+                dup_set_id = dup_dup_set_id
             else:
-                unadded_duplicates.append(dup)
+                unadded_duplicate_ids.append(dup_id)
         if not dup_set_id:
             new_dup_set = models.DuplicateSubmissionSet()
             new_dup_set.save()
-            new_dup_set.submissions.add(*unadded_duplicates)
             dup_set_id = new_dup_set.id
+        models.FormSubmission.objects.filter(
+            id__in=unadded_duplicate_ids + [submission.id]
+        ).update(duplicate_set_id=dup_set_id)
         submission.duplicate_set_id = dup_set_id
-        submission.save()
         return dup_set_id
     return False
 
 
+def get_name_answer_sql(key):
+    return RawSQL("intake_formsubmission.answers->>%s", (key,))
+
+
+def get_lowercase_names(search_space):
+    """Returns a dict of submission id to a tuple of the lowercase full
+    name (as in `get_full_lowercase_name`), first name and last name,
+    reading only the name keys of each submission's answers
+    """
+    aliases = ['answer_' + key for key in NAME_ANSWER_KEYS]
+    rows = search_space.order_by().annotate(**{
+        alias: get_name_answer_sql(key)
+        for alias, key in zip(aliases, NAME_ANSWER_KEYS)
+    }).values_list('id', *aliases)
+    names = {}
+    for sub_id, *parts in rows:
+        first, middle, last = (part or '' for part in parts)
+        names[sub_id] = (
+            join_lowercase_name([first, middle, last]),
+            first.lower(), last.lower())
+    return names
+
+
+def get_org_sets(search_space):
+    """Returns a dict of submission id to a frozenset of its organization
+    ids, using one query
+    """
+    org_ids = {}
+    applications = models.Application.objects.filter(
+        form_submission_id__in=search_space.order_by().values('id')
+    ).values_list('form_submission_id', 'organization_id')
+    for sub_id, org_id in applications:
+        org_ids.setdefault(sub_id, set()).add(org_id)
+    return {sub_id: frozenset(ids) for sub_id, ids in org_ids.items()}
+
+
+DUPLICATE_BLOCK_PREFIX_LENGTH = 3
+
+
+def get_duplicate_blocking_keys(name, org_set):
+    """Duplicates must go to the same organizations and have very similar
+    names, which almost always share a first or last name prefix. So only
+    submissions sharing one of these keys need to be compared.
+    """
+    full_name, first_name, last_name = name
+    length = DUPLICATE_BLOCK_PREFIX_LENGTH
+    return [
+        (org_set, 'first', first_name[:length]),
+        (org_set, 'last', last_name[:length])]
+
+
+def find_duplicate_id_sets(search_space):
+    """Returns a list of sets of ids of duplicate submissions.
+
+    Instead of comparing every pair of submissions, submissions are
+    grouped into blocks by organizations and name prefix, and names are
+    only compared within each block. Matching pairs are merged into sets
+    with a union-find structure.
+    """
+    names = get_lowercase_names(search_space)
+    org_sets = get_org_sets(search_space)
+    blocks = {}
+    for sub_id, name in names.items():
+        org_set = org_sets.get(sub_id, frozenset())
+        for key in get_duplicate_blocking_keys(name, org_set):
+            blocks.setdefault(key, []).append(sub_id)
+    groups = UnionFind()
+    for block in blocks.values():
+        for a, b in itertools.combinations(block, 2):
+            if groups.find(a) == groups.find(b):
+                continue
+            ratio = Levenshtein.ratio(names[a][0], names[b][0])
+            if ratio > NAME_DIFFERENCE_THRESHOLD:
+                groups.union(a, b)
+    return groups.get_sets(min_size=2)
+
+
 def find_duplicates(search_space):
-    duplicate_sets = []
-    for pair in itertools.combinations(search_space, 2):
-        if are_duplicates(*pair):
-            pair_set = set(pair)
-            attached_to_existing_set = False
-            for dup_set in duplicate_sets:
-                if dup_set & pair_set:
-                    dup_set |= pair_set
-                    attached_to_existing_set = True
-                    break
-            if not attached_to_existing_set:
-                duplicate_sets.append(pair_set)
-    return duplicate_sets
+    """Returns a list of sets of duplicate submissions from search_space
+    """
+    id_sets = find_duplicate_id_sets(search_space)
+    submissions = search_space.in_bulk(
+        [sub_id for id_set in id_sets for sub_id in id_set])
+    return [
+        set(submissions[sub_id] for sub_id in id_set)
+        for id_set in id_sets]
 
 
 NAME_DIFFERENCE_THRESHOLD = 0.8
@@ -175,10 +290,7 @@ def are_duplicates(a, b):
 
 
 def get_full_lowercase_name(sub):
-    return ' '.join([
-        sub.answers.get(key, '')
-        for key in ('first_name', 'middle_name', 'last_name')]
-    ).lower()
+    return sub.get_full_lowercase_name()
 
 
 def get_name_similarity_ratio(a, b):
@@ -0,0 +1,170 @@
+"""Attaches visitors to requests without querying for them on every page
+view.
+
+A visitor's uuid, source and referrer are kept in the session, and
+`request.visitor` is a LazyVisitor that only loads the Visitor when
+another attribute is read. Loaded visitors are kept in a process wide
+LRU cache of settings.VISITOR_CACHE_SIZE visitors.
+
+New visitors are not saved during the request that creates them.
+They are inserted together after the response, when Django sends
+`request_finished`, or as soon as something needs their row.
+"""
+import atexit
+import threading
+import uuid
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils.functional import LazyObject, empty
+from intake.models import Visitor
+from intake.utils import LRUCache
+
+
+SESSION_KEY = 'visitor'
+SESSION_FIELDS = ('source', 'referrer')
+VISITOR_FIELDS = ('referrer', 'source', 'ip_address', 'user_agent', 'locale')
+
+_pending = []
+_pending_lock = threading.Lock()
+# held while pending visitors are inserted, so that a thread that needs
+# a visitor's row waits for another thread that is inserting it
+_saving_lock = threading.Lock()
+_cache = LRUCache(getattr(settings, 'VISITOR_CACHE_SIZE', 0))
+
+
+class LazyVisitor(LazyObject):
+    """Stands in for a Visitor. Reading `uuid`, `source`, `referrer`, or
+    calling `get_uuid()` uses the session data, anything else loads the
+    Visitor with `get_visitor()`.
+    """
+
+    def __init__(self, data, get_visitor):
+        self.__dict__['_data'] = data
+        self.__dict__['_get_visitor'] = get_visitor
+        super().__init__()
+
+    def _setup(self):
+        self._wrapped = self._get_visitor()
+
+    def __getattr__(self, name):
+        if self._wrapped is empty and name in self._data:
+            return self._data[name]
+        return super().__getattr__(name)
+
+    def get_uuid(self):
+        return self.uuid.hex
+
+
+def get_visitor_fields(request):
+    """The fields of a Visitor created for this request
+    """
+    return dict(
+        referrer=request.session.get('referrer', ''),
+        source=request.session.get('source', ''),
+        ip_address=getattr(request, 'ip_address', ''),
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        locale=getattr(request, 'LANGUAGE_CODE', ''))
+
+
+def get_session_data(visitor):
+    data = dict(uuid=visitor.get_uuid())
+    for field in SESSION_FIELDS:
+        data[field] = getattr(visitor, field)
+    return data
+
+
+def save_visitor(visitor):
+    saved, created = Visitor.objects.get_or_create(
+        uuid=visitor.uuid, defaults={
+            field: getattr(visitor, field) for field in VISITOR_FIELDS})
+    visitor.id = saved.id
+
+
+def save_pending_visitors(**kwargs):
+    """Inserts the visitors created since the last call. This receives
+    `request_finished`.
+    """
+    with _saving_lock:
+        with _pending_lock:
+            visitors = _pending[:]
+            del _pending[:]
+        if not visitors:
+            return
+        try:
+            with transaction.atomic():
+                Visitor.objects.bulk_create(visitors)
+        except IntegrityError:
+            # some were already created by get_visitor, in another process
+            for visitor in visitors:
+                save_visitor(visitor)
+    for visitor in visitors:
+        _cache.set(visitor.get_uuid(), visitor)
+
+
+def create_visitor(**fields):
+    """Returns a LazyVisitor for a new Visitor, which is saved later by
+    save_pending_visitors
+    """
+    visitor = Visitor(uuid=uuid.uuid4(), **fields)
+    with _pending_lock:
+        _pending.append(visitor)
+
+    def get_saved_visitor():
+        if visitor.pk is None:
+            save_pending_visitors()
+        if visitor.pk is None:
+            # the insert that took it from the pending visitors failed
+            save_visitor(visitor)
+        return visitor
+    return get_lazy_visitor(get_session_data(visitor), get_saved_visitor)
+
+
+def get_visitor(visitor_uuid, **defaults):
+    """Returns the Visitor with this uuid hex from the cache or the
+    database. If it has not been saved, it is created from `defaults`.
+    """
+    visitor = _cache.get(visitor_uuid)
+    if visitor is None:
+        visitor = Visitor.objects.filter(uuid=visitor_uuid).first()
+        if visitor is None:
+            # it may be waiting to be inserted by this process
+            save_pending_visitors()
+            visitor, created = Visitor.objects.get_or_create(
+                uuid=visitor_uuid, defaults=defaults)
+        _cache.set(visitor_uuid, visitor)
+    return visitor
+
+
+def get_lazy_visitor(data, get_visitor):
+    data = dict(data, uuid=uuid.UUID(data['uuid']))
+    return LazyVisitor(data, get_visitor)
+
+
+def get_visitor_for_request(request):
+    """Returns a LazyVisitor for the visitor in the session, and whether
+    the visitor is new
+    """
+    data = request.session.get(SESSION_KEY)
+    if not data:
+        visitor_id = request.session.get('visitor_id')
+        if not visitor_id:
+            visitor = create_visitor(**get_visitor_fields(request))
+            request.session[SESSION_KEY] = get_session_data(visitor)
+            return visitor, True
+        # sessions from before the visitor data was kept in them
+        visitor = Visitor.objects.get(id=visitor_id)
+        data = get_session_data(visitor)
+        request.session[SESSION_KEY] = data
+        _cache.set(data['uuid'], visitor)
+    return get_lazy_visitor(data, lambda: get_visitor(
+        data['uuid'], **get_visitor_fields(request))), False
+
+
+# insert before Django's own receiver closes the connection at the end of
+# the request, rather than opening a new one that is left open until the
+# next request
+request_finished.disconnect(close_old_connections)
+request_finished.connect(save_pending_visitors)
+request_finished.connect(close_old_connections)
+atexit.register(save_pending_visitors)
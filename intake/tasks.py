@@ -2,12 +2,29 @@ from celery import shared_task
 from django.core import mail
 from requests import request
 import intake.services.pdf_service as PDFService
+import project.services.mixpanel_service as MixpanelService
 from project.services.mixpanel_service import log_to_mixpanel
 
 
+# seconds to wait before the first retry of a failed batch of events,
+# doubling with each retry
+MIXPANEL_RETRY_DELAY = 10
+MIXPANEL_MAX_RETRIES = 6
+
 log_to_mixpanel = shared_task(log_to_mixpanel)
 
 
+@shared_task(bind=True, max_retries=MIXPANEL_MAX_RETRIES)
+def log_events_to_mixpanel(self, events):
+    try:
+        MixpanelService.log_events_to_mixpanel(events)
+    except MixpanelService.UnsentEventsError as error:
+        # only retry the events that were not sent
+        raise self.retry(
+            args=[error.events], exc=error,
+            countdown=MIXPANEL_RETRY_DELAY * 2 ** self.request.retries)
+
+
 @shared_task
 def celery_request(*args, **kwargs):
     request(*args, **kwargs)
@@ -27,3 +44,10 @@ def remove_application_pdfs(application_id):
 @shared_task
 def send_email(*args, **kwargs):
     mail.send_mail(*args, **kwargs)
+
+
+@shared_task
+def run_pdf_bundle_build_job(job_id):
+    # imported here because the service imports these tasks
+    import intake.services.pdf_bundle_jobs as PDFBundleJobsService
+    PDFBundleJobsService.run_job(job_id)
@@ -1,5 +1,6 @@
 from django.test import TestCase
 from intake import models
+from intake.tests import factories
 from user_accounts import models as user_account_models
 from django.db import IntegrityError
 
@@ -43,3 +44,88 @@ class TestApplication(TestCase):
         self.assertTrue(application.updated)
         self.assertTrue(application.created)
         self.assertEqual(application.was_transferred_out, False)
+        self.assertEqual(application.status_update_count, 0)
+        self.assertIsNone(application.latest_status_update)
+
+
+class TestApplicationLatestStatus(TestCase):
+
+    fixtures = [
+        'counties', 'groups',
+        'organizations', 'mock_profiles',
+        'mock_2_submissions_to_a_pubdef', 'template_options'
+    ]
+
+    def setUp(self):
+        self.application = models.Application.objects.filter(
+            organization__slug='a_pubdef').first()
+
+    def test_new_status_updates_are_copied_to_application(self):
+        status_updates = factories.StatusUpdateFactory.create_batch(
+            2, application=self.application)
+        application = models.Application.objects.get(id=self.application.id)
+        self.assertEqual(2, application.status_update_count)
+        self.assertEqual(
+            status_updates[-1].id, application.latest_status_update_id)
+        self.assertEqual(
+            status_updates[-1].status_type_id,
+            application.latest_status_type_id)
+
+    def test_saving_stale_instance_keeps_latest_status(self):
+        stale = models.Application.objects.get(id=self.application.id)
+        status_update = factories.StatusUpdateFactory.create(
+            application=self.application)
+        stale.has_been_opened = True
+        stale.save()
+        application = models.Application.objects.get(id=self.application.id)
+        self.assertTrue(application.has_been_opened)
+        self.assertEqual(1, application.status_update_count)
+        self.assertEqual(
+            status_update.id, application.latest_status_update_id)
+
+    def test_refresh_latest_status(self):
+        status_update = factories.StatusUpdateFactory.create(
+            application=self.application)
+        models.Application.objects.update(
+            status_update_count=0, latest_status_update=None,
+            latest_status_type=None)
+        models.Application.refresh_latest_status([self.application.id])
+        application = models.Application.objects.get(id=self.application.id)
+        self.assertEqual(1, application.status_update_count)
+        self.assertEqual(
+            status_update.id, application.latest_status_update_id)
+        self.assertEqual(
+            status_update.status_type_id, application.latest_status_type_id)
+        other = models.Application.objects.exclude(
+            id=self.application.id).first()
+        self.assertEqual(0, other.status_update_count)
+
+    def test_deleting_status_update_refreshes_latest_status(self):
+        status_updates = factories.StatusUpdateFactory.create_batch(
+            2, application=self.application)
+        status_updates[-1].delete()
+        application = models.Application.objects.get(id=self.application.id)
+        self.assertEqual(1, application.status_update_count)
+        self.assertEqual(
+            status_updates[0].id, application.latest_status_update_id)
+        status_updates[0].delete()
+        application = models.Application.objects.get(id=self.application.id)
+        self.assertEqual(0, application.status_update_count)
+        self.assertIsNone(application.latest_status_update_id)
+        counts = models.ApplicationCounts.objects.get(
+            organization_id=application.organization_id)
+        self.assertEqual(
+            models.Application.objects.filter(
+                organization_id=application.organization_id,
+                status_update_count=0).count(),
+            counts.needs_update)
+
+    def test_saving_deferred_instance_only_saves_loaded_fields(self):
+        application = models.Application.objects.only(
+            'id', 'was_transferred_out').get(id=self.application.id)
+        application.was_transferred_out = True
+        with self.assertNumQueries(1):
+            application.save()
+        self.assertTrue(
+            models.Application.objects.get(
+                id=self.application.id).was_transferred_out)
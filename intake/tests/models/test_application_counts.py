@@ -0,0 +1,113 @@
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from intake import models
+from intake.tests import factories
+from user_accounts.models import Organization
+
+
+class TestApplicationCounts(TestCase):
+
+    fixtures = [
+        'counties', 'organizations', 'groups', 'mock_profiles',
+        'mock_2_submissions_to_a_pubdef', 'template_options']
+
+    def setUp(self):
+        self.org = Organization.objects.get(slug='a_pubdef')
+
+    def get_expected_counts(self):
+        apps = models.Application.objects.filter(organization=self.org)
+        return dict(
+            unread=apps.filter(
+                has_been_opened=False, status_updates__isnull=True).count(),
+            needs_update=apps.filter(status_updates__isnull=True).count(),
+            total=apps.count())
+
+    def get_saved_counts(self):
+        return models.ApplicationCounts.objects.filter(
+            organization=self.org
+        ).values('unread', 'needs_update', 'total').first()
+
+    def test_refresh_saves_counts(self):
+        counts = models.ApplicationCounts.refresh([self.org.id])
+        expected = self.get_expected_counts()
+        self.assertEqual(expected, counts[self.org.id])
+        self.assertEqual(expected, self.get_saved_counts())
+        self.assertEqual(2, expected['total'])
+
+    def test_get_for_organization_creates_missing_counts(self):
+        counts = models.ApplicationCounts.get_for_organization(self.org.id)
+        self.assertEqual(self.get_expected_counts(), counts)
+        self.assertTrue(
+            models.ApplicationCounts.objects.filter(
+                organization=self.org).exists())
+
+    def test_get_for_organization_does_not_count_applications(self):
+        models.ApplicationCounts.refresh([self.org.id])
+        with self.assertNumQueries(1):
+            counts = models.ApplicationCounts.get_for_organization(
+                self.org.id)
+        self.assertEqual(self.get_expected_counts(), counts)
+
+    def test_new_applications_are_counted(self):
+        models.ApplicationCounts.refresh([self.org.id])
+        factories.FormSubmissionWithOrgsFactory(organizations=[self.org])
+        self.assertEqual(3, self.get_saved_counts()['total'])
+        self.assertEqual(self.get_expected_counts(), self.get_saved_counts())
+
+    def test_opening_an_application_updates_counts(self):
+        models.ApplicationCounts.refresh([self.org.id])
+        app = models.Application.objects.filter(
+            organization=self.org, has_been_opened=False).first()
+        app.has_been_opened = True
+        app.save()
+        self.assertEqual(self.get_expected_counts(), self.get_saved_counts())
+        self.assertEqual(1, self.get_saved_counts()['unread'])
+
+    def test_logging_opened_applications_updates_counts(self):
+        models.ApplicationCounts.refresh([self.org.id])
+        user = self.org.profiles.first().user
+        sub_ids = models.Application.objects.filter(
+            organization=self.org).values_list('form_submission_id', flat=True)
+        models.ApplicationLogEntry.log_opened(list(sub_ids), user)
+        self.assertEqual(self.get_expected_counts(), self.get_saved_counts())
+        self.assertEqual(0, self.get_saved_counts()['unread'])
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_rolled_back_counts_are_not_cached(self):
+        key = models.ApplicationCounts.get_cache_key(self.org.id)
+        cache.set(key, self.get_expected_counts())
+        try:
+            with transaction.atomic():
+                factories.FormSubmissionWithOrgsFactory(
+                    organizations=[self.org])
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(
+            self.get_expected_counts(),
+            models.ApplicationCounts.get_for_organization(self.org.id))
+
+    def test_status_updates_update_counts(self):
+        models.ApplicationCounts.refresh([self.org.id])
+        app = models.Application.objects.filter(organization=self.org).first()
+        factories.StatusUpdateFactory(application=app)
+        self.assertEqual(self.get_expected_counts(), self.get_saved_counts())
+        self.assertEqual(1, self.get_saved_counts()['needs_update'])
+
+    def test_removing_orgs_updates_counts(self):
+        models.ApplicationCounts.refresh([self.org.id])
+        sub = models.FormSubmission.objects.filter(
+            applications__organization=self.org).first()
+        sub.organizations.remove_orgs_from_sub(self.org)
+        self.assertEqual(1, self.get_saved_counts()['total'])
+
+    def test_reconcile_command_refreshes_all_orgs(self):
+        call_command('reconcile_application_counts')
+        self.assertEqual(
+            Organization.objects.count(),
+            models.ApplicationCounts.objects.count())
+        self.assertEqual(self.get_expected_counts(), self.get_saved_counts())
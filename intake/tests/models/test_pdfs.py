@@ -1,11 +1,72 @@
+from unittest.mock import patch
 from django.test import TestCase
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from intake import models, constants
+from intake.models import pdfs
+from intake.tests import factories
 from user_accounts import models as auth_models
 import intake.services.submissions as SubmissionsService
 
 
+FAKE_FIELD_DATA = {'fields': [{'name': 'first_name', 'options': None}]}
+
+
+class TestFillablePDF(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        pdfs.FIELD_DATA_CACHE.clear()
+
+    def test_save_sets_pdf_hash(self):
+        fillable = factories.FillablePDFFactory()
+        self.assertEqual(64, len(fillable.pdf_hash))
+        self.assertIsNone(fillable.field_data)
+
+    @patch('intake.models.pdfs.get_parser')
+    def test_get_field_data_only_parses_once(self, get_parser):
+        get_parser.return_value.get_field_data.return_value = FAKE_FIELD_DATA
+        fillable = factories.FillablePDFFactory()
+        self.assertEqual(FAKE_FIELD_DATA, fillable.get_field_data())
+        self.assertEqual(FAKE_FIELD_DATA, fillable.get_field_data())
+        get_parser.return_value.get_field_data.assert_called_once_with(
+            fillable.pdf)
+        fillable.refresh_from_db()
+        self.assertEqual(FAKE_FIELD_DATA, fillable.field_data)
+
+    @patch('intake.models.pdfs.get_parser')
+    def test_get_field_data_reads_from_db_before_parsing(self, get_parser):
+        fillable = factories.FillablePDFFactory()
+        fillable.field_data = FAKE_FIELD_DATA
+        fillable.save()
+        fillable = models.FillablePDF.objects.get(pk=fillable.pk)
+        self.assertEqual(FAKE_FIELD_DATA, fillable.get_field_data())
+        get_parser.assert_not_called()
+
+    def test_new_pdf_file_invalidates_field_data(self):
+        fillable = factories.FillablePDFFactory()
+        fillable.field_data = FAKE_FIELD_DATA
+        fillable.save()
+        fillable.pdf = SimpleUploadedFile(
+            content=b'new content', name="new.pdf",
+            content_type="application/pdf")
+        fillable.save()
+        self.assertIsNone(fillable.field_data)
+        self.assertNotEqual(
+            factories.FillablePDFFactory().pdf_hash, fillable.pdf_hash)
+
+    @patch('intake.models.FillablePDF.get_translator')
+    @patch('intake.models.pdfs.get_parser')
+    def test_fill_passes_cached_field_data(self, get_parser, get_translator):
+        fillable = factories.FillablePDFFactory()
+        fillable.field_data = FAKE_FIELD_DATA
+        fillable.save()
+        fillable.fill(submission=None)
+        get_parser.return_value.get_field_data.assert_not_called()
+        args, kwargs = get_parser.return_value.fill_pdf.call_args
+        self.assertEqual(FAKE_FIELD_DATA, kwargs['field_data'])
+
+
 class TestFilledPDF(TestCase):
 
     def test_get_absolute_url(self):
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from user_accounts.tests.factories import FakeOrganizationFactory
 from intake.tests.factories import FormSubmissionWithOrgsFactory
-from intake import models
+from intake import models, utils
 
 
 class TestPrebuiltPDFBundle(TestCase):
@@ -42,3 +42,51 @@ class TestPrebuiltPDFBundle(TestCase):
         # pull from db to ensure cahnges persist
         fetched = models.PrebuiltPDFBundle.objects.first()
         self.assertFalse(fetched.pdf)
+
+    def test_get_page_ranges(self):
+        prebuilt = models.PrebuiltPDFBundle(
+            organization=FakeOrganizationFactory(),
+            submission_page_counts=[[4, 2], [2, 1], [9, 3]])
+        self.assertEqual(
+            [(4, (0, 2)), (2, (2, 3)), (9, (3, 6))],
+            list(prebuilt.get_page_ranges().items()))
+
+    def test_app_ids_fingerprint_follows_applications(self):
+        fake_org = FakeOrganizationFactory()
+        subs = FormSubmissionWithOrgsFactory.create_batch(
+            3, organizations=[fake_org], answers={})
+        apps = list(models.Application.objects.filter(
+            form_submission__in=subs).order_by('id'))
+        prebuilt = models.PrebuiltPDFBundle(organization=fake_org)
+        prebuilt.save()
+        prebuilt.applications.add(*apps)
+        self.assertEqual(
+            utils.get_id_set_fingerprint(reversed(apps)),
+            prebuilt.app_ids_fingerprint)
+        prebuilt.applications.remove(apps[0])
+        fetched = models.PrebuiltPDFBundle.objects.get(id=prebuilt.id)
+        self.assertEqual(
+            utils.get_id_set_fingerprint(apps[1:]),
+            fetched.app_ids_fingerprint)
+        # changes from the application side also update the fingerprint
+        apps[1].prebuilt_multiapp_pdfs.clear()
+        fetched = models.PrebuiltPDFBundle.objects.get(id=prebuilt.id)
+        self.assertEqual(
+            utils.get_id_set_fingerprint(apps[2:]),
+            fetched.app_ids_fingerprint)
+
+    def test_app_ids_fingerprint_follows_deleted_submissions(self):
+        fake_org = FakeOrganizationFactory()
+        subs = FormSubmissionWithOrgsFactory.create_batch(
+            2, organizations=[fake_org], answers={})
+        apps = list(models.Application.objects.filter(
+            form_submission__in=subs).order_by('id'))
+        prebuilt = models.PrebuiltPDFBundle(organization=fake_org)
+        prebuilt.save()
+        prebuilt.applications.add(*apps)
+        # deleting the submission deletes its application by cascade
+        apps[0].form_submission.delete()
+        fetched = models.PrebuiltPDFBundle.objects.get(id=prebuilt.id)
+        self.assertEqual(
+            utils.get_id_set_fingerprint(apps[1:]),
+            fetched.app_ids_fingerprint)
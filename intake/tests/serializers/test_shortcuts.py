@@ -0,0 +1,37 @@
+from django.test import TestCase
+from django.core.urlresolvers import reverse
+from intake.serializers import (
+    ApplicantMixpanelSerializer, RequestSerializer,
+    mixpanel_applicant_data, mixpanel_request_data)
+from intake.tests.factories import ApplicantFactory
+from user_accounts.serializers import (
+    UserMixpanelSerializer, mixpanel_user_data)
+from user_accounts.tests.factories import app_reviewer
+
+
+class TestPlainSerializers(TestCase):
+
+    def test_request_data_matches_serializer(self):
+        request = self.client.get(
+            reverse('intake-home'), {'q': 'yes'},
+            HTTP_ACCEPT_LANGUAGE='es-ni').wsgi_request
+        self.assertEqual(
+            dict(RequestSerializer(request).data),
+            mixpanel_request_data(request))
+
+    def test_applicant_data_matches_serializer(self):
+        applicant = ApplicantFactory()
+        self.assertEqual(
+            dict(ApplicantMixpanelSerializer(applicant).data),
+            mixpanel_applicant_data(applicant))
+
+    def test_user_data_matches_serializer(self):
+        user = app_reviewer('sf_pubdef').user
+        self.assertEqual(
+            dict(UserMixpanelSerializer(user).data),
+            mixpanel_user_data(user))
+
+    def test_missing_applicant_matches_serializer(self):
+        self.assertEqual(
+            dict(ApplicantMixpanelSerializer(None).data),
+            mixpanel_applicant_data(None))
@@ -5,12 +5,12 @@ from django.utils import timezone
 from django.test import TestCase
 from django.contrib.auth.models import User
 from user_accounts.models import Organization
-from collections import OrderedDict
 from intake import models
 from intake.tests.base_testcases import (
     DeluxeTransactionTestCase, ALL_APPLICATION_FIXTURES)
 from intake.tests import factories
 import intake.services.applications_service as AppsService
+from intake.services import app_index
 import intake.services.transfers_service as TransferService
 from user_accounts.tests.factories import \
     FakeOrganizationFactory, UserProfileFactory
@@ -23,21 +23,21 @@ class TestGetApplicationsIndexForOrgUser(TestCase):
     def test_all_results_for_org_who_cant_transfer(self):
         user = User.objects.filter(
             profile__organization__county__slug='solano').first()
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(5):
             results = AppsService.get_all_applications_for_org_user(user, 1)
         self.assertTrue(results.object_list)
         for thing in results:
-            self.assertTrue(isinstance(thing, OrderedDict))
+            self.assertTrue(isinstance(thing, app_index.ApplicationRow))
 
     def test_all_results_for_org_who_can_transfer(self):
         user = User.objects.filter(
             profile__organization__county__slug='alameda').first()
-        with self.assertNumQueries(7):
+        with self.assertNumQueries(6):
             results = AppsService.get_all_applications_for_org_user(user, 1)
         self.assertTrue(results.object_list)
         for thing in results:
-            self.assertTrue(isinstance(thing, OrderedDict))
-            self.assertIn('incoming_transfers', thing)
+            self.assertTrue(isinstance(thing, app_index.ApplicationRow))
+            self.assertTrue(isinstance(thing.incoming_transfers, list))
 
     def test_all_results_for_org_who_has_outgoing_transfers(self):
         user = User.objects.filter(
@@ -47,7 +47,7 @@ class TestGetApplicationsIndexForOrgUser(TestCase):
             organization__county__slug='alameda').first()
         TransferService.transfer_application(
             user, application, to_org, 'food replicator malfunction')
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             results = AppsService.get_all_applications_for_org_user(user, 1)
         self.assertTrue(
             any([
@@ -65,7 +65,7 @@ class TestGetApplicationsIndexForOrgUser(TestCase):
                 author, application, to_org, 'temporal anomalies')
         user = User.objects.filter(
             profile__organization__slug='ebclc')[0]
-        with self.assertNumQueries(16):
+        with self.assertNumQueries(6):
             results = AppsService.get_all_applications_for_org_user(user, 1)
         transferred_apps = [
             app for app in results if app['incoming_transfers']]
@@ -78,6 +78,48 @@ class TestGetApplicationsIndexForOrgUser(TestCase):
         self.assertEqual(
             transfer['reason'], 'temporal anomalies')
 
+    def test_queries_per_page_do_not_depend_on_status_updates(self):
+        user = User.objects.filter(
+            profile__organization__slug='a_pubdef').first()
+        to_org = Organization.objects.get(slug='ebclc')
+        for application in models.Application.objects.filter(
+                organization__slug='a_pubdef'):
+            factories.StatusUpdateFactory.create_batch(
+                3, application=application)
+            TransferService.transfer_application(
+                user, application, to_org, 'temporal anomalies')
+        ebclc_user = User.objects.filter(
+            profile__organization__slug='ebclc').select_related(
+                'profile__organization').first()
+        # estimated count, page of ids, rows, and incoming transfers
+        with self.assertNumQueries(4):
+            results = AppsService.get_all_applications_for_org_user(
+                ebclc_user, None)
+        self.assertTrue(results.object_list)
+        for app in results:
+            self.assertEqual(1, len(app.incoming_transfers))
+            transfer = app.incoming_transfers[0]
+            self.assertEqual('temporal anomalies', transfer.reason)
+            self.assertEqual(
+                user.profile.organization.name, transfer.organization_name)
+
+    def test_latest_status_is_most_recent_status_update(self):
+        user = User.objects.filter(
+            profile__organization__slug='a_pubdef').first()
+        application = models.Application.objects.filter(
+            organization__slug='a_pubdef').first()
+        factories.StatusUpdateFactory.create_batch(
+            3, application=application)
+        latest = application.status_updates.latest('updated')
+        rows = app_index.get_application_rows([application.id])
+        self.assertEqual(1, len(rows))
+        self.assertEqual(
+            latest.status_type.display_name, rows[0].latest_status.status_type)
+        self.assertEqual(latest.updated, rows[0].latest_status.updated)
+        self.assertEqual(
+            application.form_submission.get_absolute_url(),
+            rows[0].form_submission.url)
+
     def test_all_results_are_in_proper_order(self):
         user = User.objects.filter(
             profile__organization__slug='cc_pubdef').first()
@@ -104,7 +146,7 @@ class TestGetApplicationsIndexForOrgUser(TestCase):
             user, 1)
         self.assertFalse(
             any([
-                app['status_updates'] for app in results
+                app['latest_status'] for app in results
             ]))
 
     def all_results_include_unread_apps(self):
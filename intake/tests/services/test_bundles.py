@@ -87,8 +87,9 @@ class TestBuildBundledPdfIfNecessary(TestCase):
         slack.assert_called_once_with(error_msg)
         self.assertEqual(
             len(mock_bundle.get_individual_filled_pdfs.mock_calls), 2)
-        self.assertEqual(
-            len(SubService.fill_pdfs_for_submission.mock_calls), 2)
+        SubService.fill_pdfs_for_submissions.assert_called_once_with(
+            mock_bundle.submissions.all.return_value,
+            organizations=[mock_bundle.organization])
         mock_bundle.save.assert_called_once_with()
 
     @patch('intake.notifications.slack_simple.send')
@@ -130,7 +131,8 @@ class TestBuildBundledPdfIfNecessary(TestCase):
         mock_bundle = Mock(pk=2)
         mock_bundle.should_have_a_pdf.return_value = True
         # one is not prefilled
-        mock_bundle.get_individual_filled_pdfs.return_value = [Mock()]
+        mock_bundle.get_individual_filled_pdfs.return_value = [
+            Mock(submission_id=mock_submissions[0].id)]
         mock_bundle.submissions.all.return_value = mock_submissions
         mock_bundle.organization.pk = 1
         # run
@@ -141,8 +143,8 @@ class TestBuildBundledPdfIfNecessary(TestCase):
         self.assertEqual(
             len(mock_bundle.get_individual_filled_pdfs.mock_calls), 2)
         mock_bundle.save.assert_called_once_with()
-        SubService.fill_pdfs_for_submission.assert_has_calls(
-            [call(mock_sub) for mock_sub in mock_submissions], any_order=True)
+        SubService.fill_pdfs_for_submissions.assert_called_once_with(
+            mock_submissions[1:], organizations=[mock_bundle.organization])
 
 
 class TestGetOrgsThatMightNeedABundleEmailToday(TestCase):
@@ -299,3 +301,36 @@ class TestCountUnreadsAndSendNotificationsToOrgs(TestCase):
             unread_count=0,
             update_count=3,
             all_count=3)
+
+
+class TestGetOrCreateForSubmissionsAndUser(TestCase):
+
+    fixtures = ['counties', 'organizations', 'groups', 'mock_profiles']
+
+    def setUp(self):
+        self.user = auth_models.UserProfile.objects.filter(
+            organization__slug='sf_pubdef').first().user
+        self.subs = [
+            app.form_submission for app in make_apps_for('sf_pubdef')]
+
+    def test_gets_bundle_with_exact_submission_set(self):
+        expected = BundlesService.create_bundle_from_submissions(
+            self.subs, skip_pdf=True,
+            organization=self.user.profile.organization)
+        BundlesService.create_bundle_from_submissions(
+            self.subs[:2], skip_pdf=True,
+            organization=self.user.profile.organization)
+        with self.assertNumQueries(1):
+            result = BundlesService.get_or_create_for_submissions_and_user(
+                list(reversed(self.subs)), self.user)
+        self.assertEqual(expected, result)
+
+    @patch('intake.services.bundles.build_bundled_pdf_if_necessary')
+    def test_creates_bundle_if_only_a_superset_exists(self, build_pdf):
+        superset = BundlesService.create_bundle_from_submissions(
+            self.subs, skip_pdf=True,
+            organization=self.user.profile.organization)
+        result = BundlesService.get_or_create_for_submissions_and_user(
+            self.subs[:2], self.user)
+        self.assertNotEqual(superset, result)
+        self.assertEqual(set(self.subs[:2]), set(result.submissions.all()))
@@ -0,0 +1,89 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch, ANY
+from django.test import override_settings
+from intake.services import event_buffer
+from intake.services.event_buffer import EventBuffer, EventCollector
+
+
+@patch('intake.services.event_buffer.log_events_to_mixpanel')
+class TestEventBuffer(TestCase):
+
+    @override_settings(
+        MIXPANEL_EVENT_BATCH_SIZE=3, MIXPANEL_EVENT_BATCH_SECONDS=60)
+    def test_sends_full_batches(self, task):
+        buffer = EventBuffer()
+        buffer.add('a', 'tested', count=1)
+        buffer.add('b', 'tested', count=2)
+        task.delay.assert_not_called()
+        buffer.add('c', 'tested', count=3)
+        self.assertEqual(1, task.delay.call_count)
+        events = task.delay.call_args[0][0]
+        self.assertEqual(
+            ['a', 'b', 'c'], [event['distinct_id'] for event in events])
+        self.assertEqual(
+            [1, 2, 3], [event['properties']['count'] for event in events])
+        for event in events:
+            self.assertIn('time', event['properties'])
+        self.assertIsNone(buffer.timer)
+
+    @override_settings(
+        MIXPANEL_EVENT_BATCH_SIZE=50, MIXPANEL_EVENT_BATCH_SECONDS=0.01)
+    def test_sends_batches_after_a_delay(self, task):
+        buffer = EventBuffer()
+        buffer.add('a', 'tested')
+        timer = buffer.timer
+        timer.join(1)
+        self.assertEqual(1, len(task.delay.call_args[0][0]))
+        self.assertEqual([], buffer.events)
+
+    def test_flush_without_events_does_nothing(self, task):
+        EventBuffer().flush()
+        task.delay.assert_not_called()
+
+
+@patch('intake.services.event_buffer.log_events_to_mixpanel')
+class TestEventCollector(TestCase):
+
+    def tearDown(self):
+        event_buffer._local.collector = None
+
+    def test_publishes_all_events_in_one_task(self, task):
+        collector = EventCollector()
+        collector.add('a', 'tested', count=1)
+        collector.add('a', 'tested', count=2)
+        task.delay.assert_not_called()
+        collector.publish()
+        task.delay.assert_called_once_with([
+            event_buffer.make_event('a', 'tested', count=1, time=ANY),
+            event_buffer.make_event('a', 'tested', count=2, time=ANY)])
+        self.assertEqual([], collector.events)
+
+    def test_publish_without_events_does_nothing(self, task):
+        EventCollector().publish()
+        task.delay.assert_not_called()
+
+    def test_log_event_uses_active_collector(self, task):
+        collector = event_buffer.start_collecting()
+        event_buffer.log_event('a', 'tested')
+        self.assertEqual(1, len(collector.events))
+        task.delay.assert_not_called()
+        event_buffer.publish_collected()
+        self.assertEqual(1, len(task.delay.call_args[0][0]))
+        self.assertIsNone(event_buffer._local.collector)
+
+    def test_start_collecting_publishes_leftover_events(self, task):
+        event_buffer.start_collecting()
+        event_buffer.log_event('a', 'tested')
+        event_buffer.start_collecting()
+        self.assertEqual(1, task.delay.call_count)
+
+    def test_context_is_computed_once_per_request(self, task):
+        get_data = Mock(return_value={'a': 1})
+        event_buffer.start_collecting()
+        for i in range(3):
+            self.assertEqual(
+                {'a': 1}, event_buffer.get_context('key', get_data, i))
+        get_data.assert_called_once_with(0)
+        event_buffer.publish_collected()
+        event_buffer.get_context('key', get_data, 1)
+        self.assertEqual(2, get_data.call_count)
@@ -24,3 +24,64 @@ class TestGetPaginatedSerializerClass(TestCase):
         self.assertEqual(results.has_next(), True)
         self.assertEqual(results.has_previous(), True)
         self.assertEqual(results.has_other_pages(), True)
+
+
+class TestGetCursorPage(TestCase):
+
+    fixtures = ALL_APPLICATION_FIXTURES
+
+    keyset = ('-date_received', '-id')
+
+    def get_expected_ids(self):
+        return list(models.FormSubmission.objects.order_by(
+            *self.keyset).values_list('id', flat=True))
+
+    def get_page(self, cursor=None):
+        return services.pagination.get_cursor_page(
+            models.FormSubmission.objects.all(), cursor, self.keyset,
+            max_count_per_page=2)
+
+    def test_pages_through_all_results_in_order(self):
+        ids = []
+        page = self.get_page()
+        self.assertFalse(page.has_previous())
+        ids.extend(sub.id for sub in page)
+        while page.has_next():
+            page = self.get_page(page.next_cursor)
+            self.assertTrue(page.has_previous())
+            ids.extend(sub.id for sub in page)
+        self.assertEqual(self.get_expected_ids(), ids)
+
+    def test_previous_cursor_returns_previous_page(self):
+        first_page = self.get_page()
+        second_page = self.get_page(first_page.next_cursor)
+        page = self.get_page(second_page.previous_cursor)
+        self.assertEqual(
+            [sub.id for sub in first_page], [sub.id for sub in page])
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_invalid_cursor_returns_first_page(self):
+        page = self.get_page('not a cursor')
+        self.assertEqual(
+            self.get_expected_ids()[:2], [sub.id for sub in page])
+
+    def test_deep_pages_do_not_count_or_offset(self):
+        page = self.get_page()
+        page = self.get_page(page.next_cursor)
+        with self.assertNumQueries(2) as context:
+            self.get_page(page.next_cursor)
+        for query in context.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'])
+            self.assertNotIn('OFFSET', query['sql'])
+
+    def test_serialized_cursor_page(self):
+        serializer = serializers.FormSubmissionFollowupListSerializer
+        results = services.pagination.get_serialized_cursor_page(
+            models.FormSubmission.objects.all(), serializer, None,
+            self.keyset, max_count_per_page=2)
+        self.assertEqual(2, len(results))
+        for thing in results:
+            self.assertTrue(isinstance(thing, OrderedDict))
+        self.assertTrue(results.has_next())
+        self.assertTrue(isinstance(results.estimated_count, int))
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+from django.test import TestCase
+from django.utils import timezone
+from user_accounts.models import Organization
+from intake import models
+from intake.services import pdf_bundle_jobs as PDFBundleJobsService
+from intake.tests import factories
+
+
+def run_now(func):
+    # TestCase transactions are never committed, so on_commit callbacks
+    # would never run
+    func()
+
+
+@patch('django.db.transaction.on_commit', run_now)
+@patch('project.alerts.send_email_to_admins')
+class TestGetOrStartJobForAppIds(TestCase):
+
+    def setUp(self):
+        self.sf = Organization.objects.get(slug='sf_pubdef')
+        self.app_ids = factories.make_app_ids_for_sf()
+
+    @patch('intake.tasks.run_pdf_bundle_build_job.delay')
+    def test_starts_one_job_per_id_set(self, delay, admin_alert):
+        job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        delay.assert_called_once_with(job.id)
+        same_job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, list(reversed(self.app_ids)))
+        self.assertEqual(job, same_job)
+        self.assertEqual(1, delay.call_count)
+        self.assertEqual(1, admin_alert.call_count)
+
+    @patch('intake.tasks.run_pdf_bundle_build_job.delay')
+    def test_failed_jobs_are_not_reused(self, delay, admin_alert):
+        job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        job.set_progress(job.FAILED, 0)
+        new_job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        self.assertNotEqual(job, new_job)
+        self.assertEqual(2, delay.call_count)
+
+    @patch('intake.tasks.run_pdf_bundle_build_job.delay')
+    def test_stale_jobs_are_failed_and_replaced(self, delay, admin_alert):
+        job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        models.PDFBundleBuildJob.objects.filter(id=job.id).update(
+            status=job.RUNNING,
+            updated=timezone.now() - job.STALE_AFTER - job.STALE_AFTER)
+        new_job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        self.assertNotEqual(job, new_job)
+        self.assertEqual(2, delay.call_count)
+        job.refresh_from_db()
+        self.assertEqual(job.FAILED, job.status)
+
+    @patch('intake.services.pdf_service.get_or_build_pdf_bundle_for_apps')
+    @patch('intake.services.pdf_service.fill_any_unfilled_pdfs_for_app_ids')
+    def test_runs_job_to_completion(
+            self, fill_pdfs, build_bundle, admin_alert):
+        prebuilt = factories.PrebuiltPDFBundleFactory()
+        prebuilt.applications.add(*self.app_ids)
+        build_bundle.return_value = prebuilt
+        job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        fill_pdfs.assert_called_once_with(sorted(self.app_ids))
+        self.assertEqual(job.DONE, job.status)
+        self.assertEqual(100, job.progress)
+        self.assertEqual(prebuilt, job.prebuilt_pdf_bundle)
+        self.assertEqual(prebuilt.get_absolute_url(), job.get_pdf_url())
+
+    @patch('intake.services.pdf_service.fill_any_unfilled_pdfs_for_app_ids')
+    def test_records_failures(self, fill_pdfs, admin_alert):
+        fill_pdfs.side_effect = ValueError('bad pdf')
+        job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.sf, self.app_ids)
+        self.assertEqual(job.FAILED, job.status)
+        self.assertIn('bad pdf', job.error)
+        self.assertIsNone(job.get_pdf_url())
+        self.assertEqual(2, admin_alert.call_count)
+
+
+@patch('django.db.transaction.on_commit', run_now)
+class TestGetOrStartJobForApplicationBundle(TestCase):
+
+    @patch('intake.services.bundles.build_bundled_pdf_if_necessary')
+    def test_builds_bundled_pdf(self, build_pdf):
+        sf = Organization.objects.get(slug='sf_pubdef')
+        bundle = models.ApplicationBundle(organization=sf)
+        bundle.save()
+        job = PDFBundleJobsService.get_or_start_job_for_application_bundle(
+            bundle)
+        build_pdf.assert_called_once_with(bundle)
+        self.assertEqual(job.DONE, job.status)
+        self.assertEqual(
+            job, PDFBundleJobsService.get_or_start_job_for_application_bundle(
+                bundle))
+        self.assertEqual(1, build_pdf.call_count)
@@ -1,8 +1,9 @@
-from unittest.mock import patch, Mock
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch, Mock, ANY
 from django.test import TestCase
 from django.core.exceptions import ObjectDoesNotExist
 from user_accounts.models import Organization
-from intake import models, exceptions
+from intake import models, exceptions, pdfparser
 from intake.services import pdf_service as PDFService
 from intake.tests import factories
 
@@ -43,6 +44,26 @@ class TestFillPdfForApplication(TestCase):
             submission=self.app.form_submission)
 
 
+class TestFillPdfsForApplications(TestCase):
+
+    def test_with_no_fillable_pdf(self):
+        apps = factories.make_apps_for_sf(count=2)
+        with self.assertRaises(exceptions.MissingFillablePDFError):
+            PDFService.fill_pdfs_for_applications(apps)
+
+    @patch('intake.models.FillablePDF.fill_for_submissions')
+    def test_fills_each_fillable_once(self, fill_for_submissions):
+        fillable = factories.FillablePDFFactory()
+        apps = factories.make_apps_for_sf(count=3)
+        fill_for_submissions.return_value = ['filled']
+        result = PDFService.fill_pdfs_for_applications(apps)
+        self.assertEqual(['filled'], result)
+        fill_for_submissions.assert_called_once_with(ANY)
+        args, kwargs = fill_for_submissions.call_args
+        self.assertEqual(
+            [app.form_submission for app in apps], list(args[0]))
+
+
 class TestSetBytesToFilledPdfs(TestCase):
 
     @classmethod
@@ -76,14 +97,14 @@ class TestSetBytesToFilledPdfs(TestCase):
 
 class TestFillAnyUnfilledPdfsForAppIds(TestCase):
 
-    @patch('intake.services.pdf_service.fill_pdf_for_application')
+    @patch('intake.services.pdf_service.fill_pdfs_for_applications')
     @patch('project.alerts.send_email_to_admins')
     def test_if_no_app_ids(self, admin_alert, fill_pdf):
         PDFService.fill_any_unfilled_pdfs_for_app_ids([])
         fill_pdf.assert_not_called()
         admin_alert.assert_not_called()
 
-    @patch('intake.services.pdf_service.fill_pdf_for_application')
+    @patch('intake.services.pdf_service.fill_pdfs_for_applications')
     @patch('project.alerts.send_email_to_admins')
     def test_if_all_apps_have_pdfs(self, admin_alert, fill_pdf):
         app_ids = []
@@ -97,7 +118,7 @@ class TestFillAnyUnfilledPdfsForAppIds(TestCase):
         fill_pdf.assert_not_called()
         admin_alert.assert_not_called()
 
-    @patch('intake.services.pdf_service.fill_pdf_for_application')
+    @patch('intake.services.pdf_service.fill_pdfs_for_applications')
     @patch('project.alerts.send_email_to_admins')
     def test_if_some_apps_have_pdfs(self, admin_alert, fill_pdf):
         app_ids = []
@@ -110,7 +131,7 @@ class TestFillAnyUnfilledPdfsForAppIds(TestCase):
                 factories.FilledPDFFactory(submission=sub)
             app_ids.append(sub.applications.first().id)
         PDFService.fill_any_unfilled_pdfs_for_app_ids(app_ids)
-        fill_pdf.assert_called_once_with(app_ids[2])
+        fill_pdf.assert_called_once_with([subs[2].applications.first()])
         printed_app = str(subs[2].applications.first())
         admin_alert.assert_called_once_with(
             subject='No FilledPDFs for Applications',
@@ -163,40 +184,6 @@ class TestGetPrebuiltPdfBundleForAppIdSet(TestCase):
         self.assertEqual(expected_prebuilt, result)
 
 
-class TestGetOrCreatePrebuiltPdfForAppIds(TestCase):
-
-    @patch(
-        'intake.services.pdf_service.get_prebuilt_pdf_bundle_for_app_id_set')
-    @patch('intake.services.pdf_service.update_pdf_bundle_for_san_francisco')
-    @patch('project.alerts.send_email_to_admins')
-    def test_if_prebuilt_does_not_exist(
-            self, admin_alert, update_pdf, get_prebuilt):
-        get_prebuilt.return_value = None
-        fake_app_ids = [32, 52, 12]
-        result = PDFService.get_or_create_prebuilt_pdf_for_app_ids(
-            fake_app_ids)
-        update_pdf.assert_called_once_with()
-        self.assertEqual(update_pdf.return_value, result)
-        self.assertEqual(1, admin_alert.call_count)
-        get_prebuilt.assert_called_once_with(fake_app_ids)
-
-    @patch(
-        'intake.services.pdf_service.get_prebuilt_pdf_bundle_for_app_id_set')
-    @patch('intake.services.pdf_service.update_pdf_bundle_for_san_francisco')
-    @patch('project.alerts.send_email_to_admins')
-    def test_if_prebuilt_exists(
-            self, admin_alert, update_pdf, get_prebuilt):
-        mock_prebuilt = Mock()
-        get_prebuilt.return_value = mock_prebuilt
-        fake_app_ids = [32, 52, 12]
-        result = PDFService.get_or_create_prebuilt_pdf_for_app_ids(
-            fake_app_ids)
-        self.assertEqual(mock_prebuilt, result)
-        update_pdf.assert_not_called()
-        admin_alert.assert_not_called()
-        get_prebuilt.assert_called_once_with(fake_app_ids)
-
-
 class TestCreateNewPdfBundleForApps(TestCase):
 
     @classmethod
@@ -315,6 +302,79 @@ class TestUpdatePdfBundleForSanFrancisco(TestCase):
         self.assertEqual(1, prebuilt_count)
 
 
+class TestDerivePdfBundleForApps(TestCase):
+
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass()
+        cls.sf = Organization.objects.get(slug='sf_pubdef')
+
+    def make_apps_with_filled_pdfs(self, count):
+        apps = factories.make_apps_for_sf(count=count)
+        for app in apps:
+            factories.FilledPDFFactory(submission=app.form_submission)
+        return apps
+
+    @patch('intake.services.pdf_service.fill_any_unfilled_pdfs_for_app_ids')
+    @patch('intake.models.get_parser')
+    def test_removes_old_and_appends_new_apps(self, get_parser, fill_pdfs):
+        get_parser.return_value.join_pdfs.return_value = b'joined pdf'
+        old_apps = self.make_apps_with_filled_pdfs(3)
+        previous = PDFService.create_new_pdf_bundle_for_apps(
+            self.sf, old_apps)
+        new_apps = self.make_apps_with_filled_pdfs(1)
+        apps = old_apps[1:] + new_apps
+        with patch(
+                'intake.pdfparser.remove_page_ranges',
+                return_value=b'edited pdf') as remove_pages:
+            result = PDFService.derive_pdf_bundle_for_apps(
+                self.sf, previous, apps)
+        remove_pages.assert_called_once_with(previous.pdf, [(0, 1)])
+        get_parser.return_value.join_pdfs.assert_called_with(
+            [b'edited pdf', new_apps[0].form_submission.filled_pdfs.first(
+                ).pdf])
+        fill_pdfs.assert_called_with([new_apps[0].id])
+        self.assertEqual(set(apps), set(result.applications.all()))
+        self.assertEqual(
+            [[app.form_submission_id, 1] for app in apps],
+            result.submission_page_counts)
+        self.assertEqual(b'joined pdf', result.pdf.read())
+
+    @patch('intake.services.pdf_service.fill_any_unfilled_pdfs_for_app_ids')
+    @patch('intake.models.get_parser')
+    def test_only_removing_apps_does_not_join(self, get_parser, fill_pdfs):
+        get_parser.return_value.join_pdfs.return_value = b'joined pdf'
+        apps = self.make_apps_with_filled_pdfs(2)
+        previous = PDFService.create_new_pdf_bundle_for_apps(self.sf, apps)
+        get_parser.reset_mock()
+        with patch(
+                'intake.pdfparser.remove_page_ranges',
+                return_value=b'edited pdf'):
+            result = PDFService.derive_pdf_bundle_for_apps(
+                self.sf, previous, apps[:1])
+        get_parser.assert_not_called()
+        self.assertEqual(b'edited pdf', result.pdf.read())
+        self.assertEqual(
+            [[apps[0].form_submission_id, 1]],
+            result.submission_page_counts)
+
+    @patch(
+        'intake.services.applications_service.get_unread_applications_for_org')
+    @patch('intake.services.pdf_service.derive_pdf_bundle_for_apps')
+    def test_update_derives_from_latest_editable_bundle(
+            self, derive_bundle, get_unread_apps):
+        apps = self.make_apps_with_filled_pdfs(2)
+        previous = factories.PrebuiltPDFBundleFactory(
+            submission_page_counts=[[apps[0].form_submission_id, 1]])
+        previous.set_bytes(b'pdf')
+        previous.save()
+        get_unread_apps.return_value = factories.apps_queryset(apps)
+        result = PDFService.update_pdf_bundle_for_san_francisco()
+        self.assertEqual(derive_bundle.return_value, result)
+        args, kwargs = derive_bundle.call_args
+        self.assertEqual((self.sf, previous), args[:2])
+
+
 class TestRebuildNewappsPdfForRemovedApplication(TestCase):
 
     @patch(
@@ -336,3 +396,60 @@ class TestRebuildNewappsPdfForRemovedApplication(TestCase):
         factories.FillablePDFFactory()
         PDFService.rebuild_pdf_bundle_for_removed_application(app.id)
         update_pdf.assert_not_called()
+
+
+class TestGetConcatenatedPrintoutForApplications(TestCase):
+
+    def get_apps(self, count):
+        return models.Application.objects.filter(
+            id__in=factories.make_app_ids_for('a_pubdef', count=count))
+
+    def test_merges_each_rendered_printout(self):
+        apps = self.get_apps(3)
+        expected_page_count = sum(
+            pdfparser.count_pages(PDFService.get_printout_for_application(
+                app)[1])
+            for app in apps)
+        with self.settings(PRINTOUT_PROCESSES=1):
+            filename, chunks = \
+                PDFService.get_concatenated_printout_for_applications(apps)
+        self.assertIn('3-Applications-CodeForAmerica.pdf', filename)
+        pdf = b''.join(chunks)
+        self.assertEqual(expected_page_count, pdfparser.count_pages(pdf))
+
+    @patch('intake.services.pdf_service.ProcessPoolExecutor')
+    def test_renders_in_shared_process_pool(self, ProcessPoolExecutor):
+        self.addCleanup(PDFService.reset_printout_executor)
+        PDFService.reset_printout_executor()
+        executor = ProcessPoolExecutor.return_value
+        executor.map.side_effect = lambda func, args_list: map(
+            func, args_list)
+        with self.settings(PRINTOUT_PROCESSES=4):
+            for i in range(2):
+                filename, chunks = \
+                    PDFService.get_concatenated_printout_for_applications(
+                        self.get_apps(2))
+                self.assertTrue(b''.join(chunks))
+        ProcessPoolExecutor.assert_called_once_with(max_workers=4)
+        self.assertEqual(2, executor.map.call_count)
+
+    @patch('intake.services.pdf_service.ProcessPoolExecutor')
+    def test_renders_in_this_process_if_pool_breaks(
+            self, ProcessPoolExecutor):
+        self.addCleanup(PDFService.reset_printout_executor)
+        PDFService.reset_printout_executor()
+        executor = ProcessPoolExecutor.return_value
+        executor.map.side_effect = BrokenProcessPool()
+        with self.settings(PRINTOUT_PROCESSES=4):
+            filename, chunks = \
+                PDFService.get_concatenated_printout_for_applications(
+                    self.get_apps(2))
+        self.assertTrue(b''.join(chunks))
+        self.assertIsNone(PDFService._printout_executor)
+
+    def test_single_application_is_not_merged(self):
+        apps = self.get_apps(1)
+        filename, chunks = \
+            PDFService.get_concatenated_printout_for_applications(apps)
+        self.assertIn('CaseDetails.pdf', filename)
+        self.assertEqual(1, len(list(chunks)))
@@ -0,0 +1,96 @@
+import datetime
+from unittest.mock import patch
+from django.test import TestCase
+from intake import models
+from intake.services import pdf_service as PDFService
+from intake.services import printout_cache as PrintoutCacheService
+from intake.tests import factories
+
+
+class TestPrintoutCache(TestCase):
+
+    def setUp(self):
+        self.app = factories.make_apps_for('a_pubdef', count=1)[0]
+        self.args = PDFService.get_printout_args_for_application(self.app)
+
+    def cache(self, pdf_bytes=b'pdf', args=None):
+        args = args or self.args
+        counties, submission, init_data, show_declaration = args
+        key = PrintoutCacheService.get_printout_key(*args)
+        PrintoutCacheService.cache_printout(
+            key, submission, init_data, 'file.pdf', pdf_bytes)
+        return key
+
+    def test_key_depends_on_data_form_class_and_letter(self):
+        counties, submission, init_data, show_declaration = self.args
+        key = PrintoutCacheService.get_printout_key(*self.args)
+        self.assertEqual(
+            key, PrintoutCacheService.get_printout_key(*self.args))
+        edited_data = dict(init_data, first_name='Edited')
+        different_args = [
+            (counties + ['other'], submission, init_data, show_declaration),
+            (counties, submission, edited_data, show_declaration),
+            (counties, submission, init_data, not show_declaration),
+        ]
+        for args in different_args:
+            self.assertNotEqual(
+                key, PrintoutCacheService.get_printout_key(*args))
+
+    def test_key_changes_each_day(self):
+        key = PrintoutCacheService.get_printout_key(*self.args)
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        with patch(
+                'intake.services.printout_cache.utils.get_todays_date',
+                return_value=tomorrow):
+            self.assertNotEqual(
+                key, PrintoutCacheService.get_printout_key(*self.args))
+
+    def test_printouts_from_earlier_days_are_removed(self):
+        self.cache()
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        with patch(
+                'intake.services.printout_cache.utils.get_todays_date',
+                return_value=tomorrow):
+            new_key = self.cache()
+        self.assertEqual(
+            [new_key], list(models.PrintoutCacheEntry.objects.values_list(
+                'key', flat=True)))
+
+    def test_get_cached_printouts(self):
+        key = self.cache()
+        self.assertEqual(
+            {key: ('file.pdf', b'pdf')},
+            PrintoutCacheService.get_cached_printouts([key, 'missing']))
+
+    def test_edited_submissions_invalidate_old_printouts(self):
+        old_key = self.cache()
+        counties, submission, init_data, show_declaration = self.args
+        edited_args = (
+            counties, submission, dict(init_data, first_name='Edited'),
+            show_declaration)
+        new_key = self.cache(args=edited_args)
+        self.assertEqual(
+            [new_key], list(models.PrintoutCacheEntry.objects.values_list(
+                'key', flat=True)))
+        self.assertNotEqual(old_key, new_key)
+
+    def test_evicts_least_recently_used(self):
+        first_key = self.cache(b'1234')
+        other_app = factories.make_apps_for('a_pubdef', count=1)[0]
+        other_args = PDFService.get_printout_args_for_application(other_app)
+        second_key = self.cache(b'5678', args=other_args)
+        PrintoutCacheService.get_cached_printouts([first_key])
+        with self.settings(PRINTOUT_CACHE_MAX_BYTES=6):
+            PrintoutCacheService.evict_if_necessary()
+        self.assertEqual(
+            [first_key], list(models.PrintoutCacheEntry.objects.values_list(
+                'key', flat=True)))
+        self.assertNotEqual(first_key, second_key)
+
+    def test_get_printouts_only_renders_missing_printouts(self):
+        PDFService.get_printout_for_application(self.app)
+        with self.settings(PRINTOUT_PROCESSES=1):
+            with self.assertNumQueries(2):
+                filename, pdf = PDFService.get_printouts([self.args])[0]
+        self.assertIn('CaseDetails.pdf', filename)
+        self.assertTrue(pdf)
@@ -0,0 +1,169 @@
+from django.test import TestCase
+from intake import models
+from intake.services import search_service as SearchService
+from intake.services import transfers_service as TransferService
+from intake.tests import factories
+from user_accounts.tests.factories import UserProfileFactory
+
+
+class TestSearchText(TestCase):
+
+    def test_search_text_is_normalized_on_save(self):
+        sub = factories.FormSubmissionWithOrgsFactory(
+            first_name='Jorge  Luis', last_name='BORGES',
+            email='George@Fictions.book', phone_number='(415) 212-4848',
+            ssn='123-45-6789')
+        lines = sub.search_text.split('\n')
+        self.assertIn('jorge luis borges', lines)
+        self.assertIn('george@fictions.book', lines)
+        self.assertIn('4152124848', lines)
+        self.assertIn('123456789', lines)
+
+    def test_search_text_is_updated_with_update_fields(self):
+        sub = factories.FormSubmissionWithOrgsFactory(first_name='Jorge')
+        sub.first_name = 'Ursula'
+        sub.save(update_fields=['first_name'])
+        sub.refresh_from_db()
+        self.assertIn('ursula', sub.search_text)
+
+    def test_update_search_text(self):
+        sub = factories.FormSubmissionWithOrgsFactory(last_name='Borges')
+        models.FormSubmission.objects.filter(id=sub.id).update(
+            search_text='')
+        SearchService.update_search_text(models.FormSubmission.objects.all())
+        sub.refresh_from_db()
+        self.assertIn('borges', sub.search_text)
+
+
+class TestFilterSubmissionsWithQuerystring(TestCase):
+
+    def setUp(self):
+        self.borges = factories.FormSubmissionWithOrgsFactory(
+            first_name='Jorge Luis', last_name='Borges',
+            phone_number='4152124848', ssn='123456789')
+        self.other = factories.FormSubmissionWithOrgsFactory(
+            first_name='Ursula', last_name='Le Guin',
+            phone_number='5105550000', ssn='987654321')
+
+    def search(self, query):
+        return list(SearchService.get_submissions_with_querystring(query))
+
+    def test_matches_names_regardless_of_case(self):
+        self.assertEqual([self.borges], self.search('LUIS borges'))
+
+    def test_matches_formatted_phone_numbers_and_ssns(self):
+        self.assertEqual([self.borges], self.search('(415) 212-4848'))
+        self.assertEqual([self.borges], self.search('123-45-6789'))
+
+    def test_queries_with_letters_do_not_match_digits(self):
+        self.assertEqual([], self.search('jdoe4152@gmail.com'))
+        self.assertEqual([], self.search('case 123'))
+
+    def test_matches_partial_words(self):
+        borgesian = factories.FormSubmissionWithOrgsFactory(
+            first_name='Borgesian', last_name='Scholar')
+        results = self.search('borges')
+        self.assertEqual(set(results), {self.borges, borgesian})
+
+    def test_applications_are_filtered_by_their_submission(self):
+        apps = SearchService.get_applications_with_query_string('le guin')
+        self.assertEqual(
+            {app.form_submission_id for app in apps}, {self.other.id})
+
+
+class TestGetSearchEntriesWithQueryString(TestCase):
+
+    def setUp(self):
+        self.apps = factories.make_apps_for(
+            'a_pubdef', count=1, first_name='Jorge Luis', last_name='Borges')
+        self.other_apps = factories.make_apps_for(
+            'ebclc', count=1, first_name='Jorge Luis', last_name='Borges')
+
+    def test_entries_are_created_for_new_applications(self):
+        entry = self.apps[0].search_entry
+        sub = self.apps[0].form_submission
+        self.assertEqual(entry.organization_id, self.apps[0].organization_id)
+        self.assertEqual(entry.name, sub.get_full_name())
+        self.assertEqual(entry.url, sub.get_absolute_url())
+        self.assertEqual(entry.search_text, sub.search_text)
+
+    def test_filters_by_organization(self):
+        org_id = self.apps[0].organization_id
+        entries = SearchService.get_search_entries_with_query_string(
+            'borges', org_id)
+        self.assertEqual(
+            [entry.application_id for entry in entries], [self.apps[0].id])
+
+    def test_entries_follow_submission_edits(self):
+        sub = self.apps[0].form_submission
+        sub.answers['last_name'] = 'Cortazar'
+        sub.last_name = 'Cortazar'
+        sub.save()
+        entries = SearchService.get_search_entries_with_query_string(
+            'cortazar')
+        self.assertEqual(
+            [entry.application_id for entry in entries], [self.apps[0].id])
+        self.assertIn('Cortazar', entries[0].name)
+
+    def test_transferred_applications_get_entries(self):
+        author = UserProfileFactory(
+            organization=self.apps[0].organization).user
+        transfer, status_update, new_app = \
+            TransferService.transfer_application(
+                author, self.apps[0], self.other_apps[0].organization,
+                'because')
+        entries = SearchService.get_search_entries_with_query_string(
+            'borges', new_app.organization_id)
+        self.assertIn(
+            new_app.id, [entry.application_id for entry in entries])
+
+
+class TestFuzzyNameSearch(TestCase):
+
+    def make_sub(self, **answers):
+        return factories.FormSubmissionWithOrgsFactory(answers=answers)
+
+    def setUp(self):
+        self.borges = self.make_sub(
+            first_name='Jorge', middle_name='Luis', last_name='Borges')
+        self.le_guin = self.make_sub(first_name='Ursula', last_name='Le Guin')
+
+    def test_finds_misspelled_names(self):
+        matches = SearchService.get_fuzzy_name_matches(
+            models.FormSubmission.objects.all(), 'Borjes')
+        self.assertEqual([self.borges.id], [sub_id for sub_id, s in matches])
+
+    def test_best_match_is_first(self):
+        borgen = self.make_sub(first_name='Jorge', last_name='Borgen')
+        results = SearchService.fuzzy_filter_submissions_with_querystring(
+            models.FormSubmission.objects.all(), 'jorge luis borges')
+        self.assertEqual([self.borges, borgen], results)
+
+    def test_loads_only_the_name_answers(self):
+        results = SearchService.fuzzy_filter_submissions_with_querystring(
+            models.FormSubmission.objects.all(), 'borges')
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.borges.get_full_name(), results[0].get_full_name())
+            self.assertEqual(
+                {'first_name', 'last_name'}, set(results[0].answers))
+
+    def test_applies_cutoff_and_limit(self):
+        for i in range(3):
+            self.make_sub(first_name='Jorge', last_name='Borges')
+        matches = SearchService.get_fuzzy_name_matches(
+            models.FormSubmission.objects.all(), 'borges', limit=2)
+        self.assertEqual(2, len(matches))
+        matches = SearchService.get_fuzzy_name_matches(
+            models.FormSubmission.objects.all(), 'borges', cutoff=1.1)
+        self.assertEqual([], matches)
+
+    def test_empty_query_matches_nothing(self):
+        self.assertEqual([], SearchService.get_fuzzy_name_matches(
+            models.FormSubmission.objects.all(), '  '))
+
+    def test_fuzzy_search_entries_are_filtered_by_organization(self):
+        app = self.borges.applications.first()
+        entries = SearchService.get_fuzzy_search_entries(
+            'borjes', app.organization_id)
+        self.assertEqual([app.id], [entry.application_id for entry in entries])
@@ -1,8 +1,9 @@
 import datetime
 from django.test import TestCase
+from django.utils import timezone
 from intake.constants import PACIFIC_TIME
 from intake.services import statistics
-from intake import utils
+from intake import models, utils
 from intake.tests.factories import FormSubmissionWithOrgsFactory
 from user_accounts.models import Organization
 from intake.tests.base_testcases import ALL_APPLICATION_FIXTURES
@@ -13,6 +14,7 @@ class TestGetOrgDataDict(TestCase):
     fixtures = ALL_APPLICATION_FIXTURES
 
     def test_returns_expected_data(self):
+        statistics.refresh_weekly_application_counts(full=True)
         results = statistics.get_org_data_dict()
         all_orgs = results.pop(0)
         dates = [week['date'] for week in all_orgs['weekly_totals']]
@@ -23,25 +25,82 @@ class TestGetOrgDataDict(TestCase):
             self.assertListEqual(
                 dates, [week['date'] for week in org_data['weekly_totals']])
 
+    def test_does_not_count_applications(self):
+        results = statistics.get_org_data_dict()
+        self.assertEqual(0, results[0]['total'])
+        self.assertFalse(
+            models.WeeklyApplicationCount.objects.exists())
+
+
+class TestRefreshWeeklyApplicationCounts(TestCase):
 
-class TestRollupSubs(TestCase):
+    def setUp(self):
+        self.one_org = Organization(name="House Stark", slug='stark')
+        self.one_org.save()
+        self.other_org = Organization(name="House Tyrell", slug='tyrell')
+        self.other_org.save()
+
+    def get_counts(self):
+        return {
+            org_id: dict(counter) for org_id, counter
+            in statistics.get_weekly_counts().items()}
 
     def test_diff_dates_same_sub_no_change(self):
         # make sure that if the application times differ slightly, it does
         # not affect the count
-        one_org = Organization(name="House Stark", slug='stark')
-        one_org.save()
-        other_org = Organization(name="House Tyrell", slug='tyrell')
-        other_org.save()
         sub = FormSubmissionWithOrgsFactory(
-            organizations=[one_org, other_org],
+            organizations=[self.one_org, self.other_org],
             answers={})
         app = sub.applications.first()
         app.created = app.created + datetime.timedelta(milliseconds=1)
         app.save()
-        results = statistics.rollup_subs(
-            statistics.get_app_dates_sub_ids_org_ids())
-        self.assertEqual(len(results), 1)
+        statistics.refresh_weekly_application_counts(full=True)
+        week = statistics.get_week_start(sub.date_received)
+        self.assertEqual(self.get_counts(), {
+            None: {week: 1},
+            self.one_org.id: {week: 1},
+            self.other_org.id: {week: 1}})
+
+    def test_weeks_start_on_monday_in_pacific_time(self):
+        # late sunday night in california is monday in UTC
+        sunday_night = PACIFIC_TIME.localize(
+            datetime.datetime(year=2017, month=5, day=14, hour=23))
+        FormSubmissionWithOrgsFactory(
+            organizations=[self.one_org], answers={},
+            date_received=sunday_night)
+        statistics.refresh_weekly_application_counts(full=True)
+        self.assertEqual(
+            self.get_counts()[None], {datetime.date(2017, 5, 8): 1})
+
+    def test_week_start_datetime_is_midnight_in_pacific_time(self):
+        monday = datetime.date(2017, 5, 8)
+        self.assertEqual(
+            statistics.get_week_start_datetime(monday),
+            PACIFIC_TIME.localize(datetime.datetime(2017, 5, 8)))
+        self.assertEqual(
+            statistics.get_week_start(
+                statistics.get_week_start_datetime(monday)), monday)
+
+    def test_refresh_counts_changed_applications(self):
+        FormSubmissionWithOrgsFactory(
+            organizations=[self.one_org], answers={})
+        statistics.refresh_weekly_application_counts()
+        sub = FormSubmissionWithOrgsFactory(
+            organizations=[self.one_org], answers={})
+        week = statistics.get_week_start(sub.date_received)
+        self.assertEqual(
+            statistics.get_refresh_start_week(),
+            min(week, statistics.get_week_start(timezone.now())))
+        statistics.refresh_weekly_application_counts()
+        self.assertEqual(
+            2, sum(self.get_counts()[self.one_org.id].values()))
+
+    def test_org_data_reads_only_counts(self):
+        FormSubmissionWithOrgsFactory(
+            organizations=[self.one_org], answers={})
+        statistics.refresh_weekly_application_counts(full=True)
+        with self.assertNumQueries(3):
+            statistics.get_org_data_dict()
 
 
 class TestMakeYearWeeks(TestCase):
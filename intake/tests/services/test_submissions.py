@@ -61,6 +61,43 @@ class TestCreateSubmissions(TestCase):
         for sub in (a, b):
             self.assertIn(sub, dup_set_subs)
 
+    def test_duplicates_are_checked_with_one_query(self):
+        applicant = factories.ApplicantFactory()
+        answers = mock.fake.all_county_answers()
+        org = Organization.objects.filter(is_receiving_agency=True).first()
+        Form = county_form_selector.get_combined_form_class(
+            counties=ALL_COUNTY_SLUGS)
+        a = SubmissionsService.create_submission(
+            Form(answers, validate=True), [org], applicant.id)
+        a.refresh_from_db()
+        self.assertEqual(
+            a.org_set_fingerprint,
+            models.form_submission.get_org_set_fingerprint([org]))
+        self.assertEqual(
+            a.duplicate_name_key,
+            SubmissionsService.get_full_lowercase_name(a))
+        b = models.FormSubmission(
+            answers=answers, applicant_id=applicant.id,
+            org_set_fingerprint=a.org_set_fingerprint)
+        b.save()
+        with self.assertNumQueries(1):
+            duplicates = SubmissionsService.check_for_existing_duplicates(
+                b, applicant.id)
+        self.assertEqual([(a.id, None)], duplicates)
+
+    def test_subs_to_other_orgs_are_not_duplicates(self):
+        applicant = factories.ApplicantFactory()
+        answers = mock.fake.all_county_answers()
+        org, other_org = Organization.objects.filter(
+            is_receiving_agency=True)[:2]
+        Form = county_form_selector.get_combined_form_class(
+            counties=ALL_COUNTY_SLUGS)
+        SubmissionsService.create_submission(
+            Form(answers, validate=True), [org], applicant.id)
+        b = SubmissionsService.create_submission(
+            Form(answers, validate=True), [other_org], applicant.id)
+        self.assertFalse(b.duplicate_set_id)
+
 
 class TestGetPermittedSubmissions(TestCase):
 
@@ -187,6 +224,32 @@ class TestFindDuplicates(TestCase):
             FormSubmission.objects.all())
         self.assertFalse(dups)
 
+    def test_only_queries_names_and_orgs(self):
+        org = Organization.objects.get(slug=Organizations.ALAMEDA_PUBDEF)
+        for i in range(3):
+            factories.FormSubmissionWithOrgsFactory.create(
+                answers=get_answers_for_orgs(
+                    [org], first_name="Joe", last_name="Parabola"),
+                organizations=[org])
+        with self.assertNumQueries(2):
+            dup_id_sets = SubmissionsService.find_duplicate_id_sets(
+                FormSubmission.objects.all())
+        self.assertEqual(1, len(dup_id_sets))
+        self.assertEqual(3, len(dup_id_sets[0]))
+
+    def test_doesnt_pair_subs_to_different_orgs(self):
+        orgs = [
+            Organization.objects.get(slug=slug) for slug in (
+                Organizations.ALAMEDA_PUBDEF, Organizations.COCO_PUBDEF)]
+        for org in orgs:
+            factories.FormSubmissionWithOrgsFactory.create(
+                answers=get_answers_for_orgs(
+                    [org], first_name="Joe", last_name="Parabola"),
+                organizations=[org])
+        dups = SubmissionsService.find_duplicates(
+            FormSubmission.objects.all())
+        self.assertFalse(dups)
+
 
 class TestGetConfirmationFlashMessages(TestCase):
 
@@ -1,6 +1,13 @@
+from io import StringIO
 from unittest.mock import Mock, patch
+from django.core.management import call_command
 from django.test import TestCase
+from intake import models
 from intake.management import commands
+from intake.management.commands import benchmark_pdfs
+from intake.tests.factories import FormSubmissionWithOrgsFactory
+from intake.tests.mock_org_answers import get_answers_for_orgs
+from user_accounts.models import Organization
 
 
 class TestCommands(TestCase):
@@ -15,3 +22,41 @@ class TestCommands(TestCase):
             .assert_called_once_with()
         command.style.SUCCESS.assert_called_once_with(
             "Successfully referred any unopened apps")
+
+    @patch('intake.management.commands.benchmark_pdfs.subprocess.Popen')
+    def test_benchmark_pdfs_counts_subprocesses(self, Popen):
+        def run_parser():
+            parser = benchmark_pdfs.pdfparser.PDFParser()
+            Popen.return_value.communicate.return_value = (b'{}', b'')
+            parser.run_command(['get_fields', 'a.pdf'])
+            parser.run_command(['get_fields', 'b.pdf'])
+
+        result = benchmark_pdfs.run_benchmark(
+            'example', run_parser, repeat=2, count=3)
+        self.assertEqual('example', result['name'])
+        self.assertEqual(dict(count=3), result['params'])
+        self.assertEqual(2, result['subprocess_count'])
+        self.assertEqual(0, result['tmp_file_bytes'])
+        self.assertIn('peak_rss_kb', result)
+
+
+class TestFindAllDuplicates(TestCase):
+
+    fixtures = ['counties', 'organizations']
+
+    def test_extends_existing_sets(self):
+        org = Organization.objects.get(slug='a_pubdef')
+        subs = [
+            FormSubmissionWithOrgsFactory.create(
+                answers=get_answers_for_orgs(
+                    [org], first_name="Joe", last_name="Parabola"),
+                organizations=[org])
+            for i in range(3)]
+        existing = models.DuplicateSubmissionSet.objects.create()
+        subs[0].duplicate_set = existing
+        subs[0].save()
+        call_command('find_all_duplicates', stdout=StringIO())
+        for sub in subs:
+            sub.refresh_from_db()
+            self.assertEqual(existing.id, sub.duplicate_set_id)
+        self.assertEqual(1, models.DuplicateSubmissionSet.objects.count())
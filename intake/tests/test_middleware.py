@@ -1,15 +1,39 @@
 from unittest.mock import Mock, patch
 from django.test import TestCase
+from django.core.signals import request_finished
 from django.core.urlresolvers import reverse
+from django.db import close_old_connections
 
 from intake.middleware import GetCleanIpAddressMiddleware
 from intake import models
+import intake.services.visitors as VisitorsService
+from intake.tests.factories import VisitorFactory
 from django.http import HttpResponseServerError
 from tests.base import respond_with
 
 
+class TestCollectEventsMiddleware(TestCase):
+
+    @patch('intake.services.event_buffer.log_events_to_mixpanel')
+    def test_sends_request_events_together_after_response(self, task):
+        response = self.client.get(reverse('intake-home'))
+        self.assertEqual(1, task.delay.call_count)
+        event_names = [
+            event['event_name'] for event in task.delay.call_args[0][0]]
+        self.assertIn('site_entered', event_names)
+        self.assertIn('page_viewed', event_names)
+        self.assertEqual([], response.wsgi_request.events.events)
+
+
 class TestUserAgentMiddleware(TestCase):
 
+    @patch('intake.middleware.parse_user_agent')
+    def test_user_agent_is_parsed_only_when_used(self, parse_user_agent):
+        request = self.client.get(reverse('health_check-ok')).wsgi_request
+        parse_user_agent.assert_not_called()
+        request.user_agent.is_bot
+        parse_user_agent.assert_called_once_with('')
+
     def test_empty_user_agent_header(self):
         # Make sure that UserAgentMiddleware can still handle an empty
         # http header
@@ -127,29 +151,72 @@ class TestCountUniqueVisitorsMiddleware(TestCase):
 
     def test_new_visitor_is_created_on_pageview(self):
         response = self.client.get(reverse('intake-home'))
-        visitor_id = response.wsgi_request.session.get('visitor_id')
-        self.assertTrue(visitor_id)
-        visitor = models.Visitor.objects.get(pk=visitor_id)
+        visitor_data = response.wsgi_request.session.get('visitor')
+        self.assertTrue(visitor_data['uuid'])
+        visitor = models.Visitor.objects.get(uuid=visitor_data['uuid'])
         self.assertTrue(visitor)
 
-    @patch('intake.middleware.Visitor')
-    def test_visitor_is_created_only_once(self, Visitor):
-        Visitor.return_value = Mock(id=1)
+    @patch('intake.middleware.VisitorsService.create_visitor')
+    def test_visitor_is_created_only_once(self, create_visitor):
+        create_visitor.return_value = models.Visitor()
         response = self.client.get(reverse('intake-home'))
-        visitor_id = response.wsgi_request.session.get('visitor_id')
+        visitor_data = response.wsgi_request.session.get('visitor')
         response_2 = self.client.get(reverse('intake-apply'))
-        visitor_id_2 = response_2.wsgi_request.session.get('visitor_id')
-        self.assertEqual(visitor_id, visitor_id_2)
-        Visitor.assert_called_once_with(
+        visitor_data_2 = response_2.wsgi_request.session.get('visitor')
+        self.assertEqual(visitor_data, visitor_data_2)
+        create_visitor.assert_called_once_with(
             ip_address='127.0.0.1', referrer='', source='', user_agent='',
             locale='en')
 
-    @patch('intake.middleware.Visitor')
-    def test_ignores_health_checks(self, Visitor):
-        Visitor.return_value = Mock(id=1)
+    @patch('intake.services.visitors.get_visitor')
+    def test_visitor_is_not_loaded_to_log_page_views(self, get_visitor):
+        self.client.get(reverse('intake-home'))
+        response = self.client.get(reverse('intake-home'))
+        get_visitor.assert_not_called()
+        self.assertEqual(
+            response.wsgi_request.session['visitor']['uuid'],
+            response.wsgi_request.visitor.get_uuid())
+
+    def test_visitor_loads_from_session_uuid(self):
+        response = self.client.get(reverse('intake-home'))
+        visitor = models.Visitor.objects.get(
+            uuid=response.wsgi_request.session['visitor']['uuid'])
+        VisitorsService._cache.clear()
+        response = self.client.get(reverse('intake-apply'))
+        self.assertEqual(visitor.id, response.wsgi_request.visitor.id)
+
+    def test_sessions_with_only_visitor_id_keep_their_visitor(self):
+        visitor = VisitorFactory()
+        session = self.client.session
+        session['visitor_id'] = visitor.id
+        session.save()
+        response = self.client.get(reverse('intake-home'))
+        self.assertEqual(
+            visitor.get_uuid(),
+            response.wsgi_request.session['visitor']['uuid'])
+        self.assertEqual(1, models.Visitor.objects.count())
+
+    def test_visitors_are_saved_before_connections_are_closed(self):
+        receivers = request_finished._live_receivers(None)
+        self.assertLess(
+            receivers.index(VisitorsService.save_pending_visitors),
+            receivers.index(close_old_connections))
+
+    def test_visitor_is_saved_when_its_pending_insert_was_lost(self):
+        visitor = VisitorsService.create_visitor(
+            ip_address='127.0.0.1', referrer='', source='', user_agent='',
+            locale='en')
+        # as if another thread took the pending visitors and failed
+        del VisitorsService._pending[:]
+        self.assertTrue(visitor.id)
+        self.assertTrue(
+            models.Visitor.objects.filter(uuid=visitor.uuid).exists())
+
+    @patch('intake.middleware.VisitorsService.get_visitor_for_request')
+    def test_ignores_health_checks(self, get_visitor_for_request):
         response = self.client.get(reverse('health_check-ok'))
-        self.assertIsNone(response.wsgi_request.session.get('visitor_id'))
-        Visitor.assert_not_called()
+        self.assertIsNone(response.wsgi_request.session.get('visitor'))
+        get_visitor_for_request.assert_not_called()
 
     def test_response_view_identified(self):
         response = self.client.get(reverse('intake-apply'))
@@ -0,0 +1,237 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from django.conf import settings
+
+from intake import pdfparser
+
+
+FILLED_SAMPLE_FORM_PATH = os.path.join(
+    settings.REPO_DIR, 'tests/sample_pdfs/sample_form_filled.pdf')
+
+
+class TestRunCommand(TestCase):
+
+    @patch('intake.pdfparser.subprocess.Popen')
+    def test_passes_java_options_before_jar(self, Popen):
+        Popen.return_value.communicate.return_value = (b'{}', b'')
+        parser = pdfparser.PDFParser(java_options=['-Xmx64m'])
+        parser.PDFPARSER_PATH = 'parser.jar'
+        result = parser.run_command(['get_fields', 'a.pdf'])
+        self.assertEqual(result, '{}')
+        args, kwargs = Popen.call_args
+        self.assertEqual(
+            args[0],
+            ['java', '-Xmx64m', '-jar', 'parser.jar', 'get_fields', 'a.pdf'])
+
+    @patch('intake.pdfparser.subprocess.Popen')
+    def test_uses_default_java_options(self, Popen):
+        Popen.return_value.communicate.return_value = (b'', b'')
+        parser = pdfparser.PDFParser()
+        parser.run_command(['get_fields', 'a.pdf'])
+        args, kwargs = Popen.call_args
+        for option in pdfparser.DEFAULT_JAVA_OPTIONS:
+            self.assertIn(option, args[0])
+
+    @patch('intake.pdfparser.subprocess.Popen')
+    def test_kills_process_on_timeout(self, Popen):
+        process = Popen.return_value
+        process.communicate.side_effect = [
+            subprocess.TimeoutExpired('java', 5), (b'', b'')]
+        parser = pdfparser.PDFParser(timeout=5)
+        with self.assertRaises(pdfparser.PDFParserError):
+            parser.run_command(['concat_files', 'a.pdf', 'b.pdf'])
+        process.kill.assert_called_once_with()
+
+    @patch('intake.pdfparser.subprocess.Popen')
+    def test_raises_error_on_stderr(self, Popen):
+        Popen.return_value.communicate.return_value = (b'', b'bad pdf')
+        parser = pdfparser.PDFParser()
+        with self.assertRaises(pdfparser.PDFParserError):
+            parser.run_command(['get_fields', 'a.pdf'])
+
+
+class TestPDFIO(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.parser = pdfparser.PDFParser(tmp_path=self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def fake_concat(self, args):
+        # mimics `concat_files` by joining the input files
+        *input_paths, output_path = args[1:]
+        with open(output_path, 'wb') as output:
+            for path in input_paths:
+                with open(path, 'rb') as input_file:
+                    output.write(input_file.read())
+
+    def test_local_files_are_not_copied(self):
+        path = os.path.join(self.tmp_dir, 'local.pdf')
+        with open(path, 'wb') as local_file:
+            local_file.write(b'local')
+        file_obj = Mock(path=path)
+        self.assertEqual(path, self.parser._coerce_to_file_path(file_obj))
+        self.assertEqual([], self.parser._tmp_files)
+
+    def test_remote_files_are_copied(self):
+        file_obj = io.BytesIO(b'remote')
+        path = self.parser._coerce_to_file_path(file_obj)
+        self.assertEqual([path], self.parser._tmp_files)
+        with open(path, 'rb') as tmp_file:
+            self.assertEqual(b'remote', tmp_file.read())
+
+    def test_join_pdfs_returns_bytes(self):
+        with patch.object(
+                self.parser, 'run_command', side_effect=self.fake_concat):
+            result = self.parser.join_pdfs([b'a', io.BytesIO(b'b')])
+        self.assertEqual(b'ab', result)
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+    def test_join_pdfs_can_stream(self):
+        with patch.object(
+                self.parser, 'run_command', side_effect=self.fake_concat):
+            result = self.parser.join_pdfs([b'a', b'b'], stream=True)
+        self.assertEqual(3, len(os.listdir(self.tmp_dir)))
+        self.assertEqual(b'ab', b''.join(result))
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+    def fake_fill(self, args):
+        # mimics `set_fields` by writing the answers json to the output
+        with open(args[2], 'w') as output:
+            output.write(args[3])
+
+    def fake_command(self, args):
+        if args[0] == 'set_fields':
+            return self.fake_fill(args)
+        return self.fake_concat(args)
+
+    def test_batch_fill_pdfs(self):
+        self.parser.CONCURRENCY = 3
+        field_data = {'fields': [{'name': 'name'}]}
+        answers_list = [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+        with patch.object(
+                self.parser, 'run_command',
+                side_effect=self.fake_command) as run_command:
+            filled, joined = self.parser.batch_fill_pdfs(
+                b'template', answers_list, field_data=field_data, join=True)
+        expected = [
+            pdfparser.json.dumps({'fields': [answers]}).encode('utf-8')
+            for answers in answers_list]
+        self.assertEqual(expected, filled)
+        self.assertEqual(b''.join(expected), joined)
+        commands = [call[0][0][0] for call in run_command.call_args_list]
+        self.assertEqual(
+            ['concat_files'] + ['set_fields'] * 3, sorted(commands))
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+    def test_batch_fill_pdfs_without_join(self):
+        with patch.object(
+                self.parser, 'run_command', side_effect=self.fake_command):
+            filled, joined = self.parser.batch_fill_pdfs(
+                b'template', [{}], field_data={'fields': []})
+        self.assertEqual(1, len(filled))
+        self.assertIsNone(joined)
+
+    def test_fill_many_pdfs_cleans_up_after_failed_fill(self):
+        def fail_second_fill(args):
+            if args[0] == 'set_fields' and 'b' in args[3]:
+                raise pdfparser.PDFParserError('java error')
+            return self.fake_command(args)
+
+        with patch.object(
+                self.parser, 'run_command', side_effect=fail_second_fill):
+            with self.assertRaises(pdfparser.PDFParserError):
+                self.parser.fill_many_pdfs(
+                    b'template', [{'name': 'a'}, {'name': 'b'}],
+                    field_data={'fields': [{'name': 'name'}]})
+        self.assertEqual([], os.listdir(self.tmp_dir))
+        self.assertTrue(self.parser.clean_up)
+
+    def test_fill_many_pdfs_can_stream(self):
+        with patch.object(
+                self.parser, 'run_command', side_effect=self.fake_command):
+            result = self.parser.fill_many_pdfs(
+                b'template', [{}, {}], field_data={'fields': []},
+                stream=True)
+            self.assertEqual(
+                2 * pdfparser.json.dumps({'fields': []}).encode('utf-8'),
+                b''.join(result))
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+
+class TestPageFunctions(TestCase):
+
+    def setUp(self):
+        with open(FILLED_SAMPLE_FORM_PATH, 'rb') as pdf_file:
+            self.pdf_bytes = pdf_file.read()
+
+    def make_pdf_with_pages(self, count):
+        writer = pdfparser.PdfFileWriter()
+        for i in range(count):
+            writer.addBlankPage(width=72 * (i + 1), height=72)
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
+
+    def test_count_pages_from_bytes(self):
+        self.assertEqual(1, pdfparser.count_pages(self.pdf_bytes))
+
+    def test_count_pages_rewinds_files(self):
+        file_obj = io.BytesIO(self.pdf_bytes)
+        self.assertEqual(1, pdfparser.count_pages(file_obj))
+        self.assertEqual(0, file_obj.tell())
+
+    def test_remove_page_ranges(self):
+        pdf = self.make_pdf_with_pages(5)
+        result = pdfparser.remove_page_ranges(pdf, [(0, 1), (2, 4)])
+        reader = pdfparser.PdfFileReader(io.BytesIO(result))
+        self.assertEqual(2, reader.getNumPages())
+        widths = [
+            reader.getPage(i).mediaBox.getWidth() for i in range(2)]
+        self.assertEqual([72 * 2, 72 * 5], widths)
+
+    def test_merge_pdfs(self):
+        pdfs = [self.make_pdf_with_pages(2), self.pdf_bytes]
+        merged = pdfparser.merge_pdfs(pdfs, title='Merged')
+        reader = pdfparser.PdfFileReader(merged)
+        self.assertEqual(3, reader.getNumPages())
+        self.assertEqual('Merged', reader.getDocumentInfo().title)
+
+    def test_remove_page_ranges_keeps_form_fields(self):
+        pdf = pdfparser.merge_pdfs(
+            [self.make_pdf_with_pages(1), self.pdf_bytes])
+        result = pdfparser.remove_page_ranges(pdf, [(0, 1)])
+        reader = pdfparser.PdfFileReader(io.BytesIO(result))
+        original = pdfparser.PdfFileReader(io.BytesIO(self.pdf_bytes))
+        self.assertEqual(1, reader.getNumPages())
+        self.assertEqual(
+            set(original.getFields()), set(reader.getFields()))
+
+    def test_remove_page_ranges_drops_fields_of_removed_pages(self):
+        pdf = pdfparser.merge_pdfs(
+            [self.pdf_bytes, self.make_pdf_with_pages(1)])
+        result = pdfparser.remove_page_ranges(pdf, [(0, 1)])
+        reader = pdfparser.PdfFileReader(io.BytesIO(result))
+        self.assertFalse(reader.getFields())
+
+    def test_merge_pdfs_keeps_form_fields(self):
+        merged = pdfparser.merge_pdfs(
+            [self.make_pdf_with_pages(2), self.pdf_bytes])
+        reader = pdfparser.PdfFileReader(merged)
+        original = pdfparser.PdfFileReader(io.BytesIO(self.pdf_bytes))
+        self.assertEqual(
+            set(original.getFields()), set(reader.getFields()))
+
+    def test_iter_file_chunks_closes_file(self):
+        file_obj = io.BytesIO(b'x' * (pdfparser.STREAM_CHUNK_SIZE + 1))
+        chunks = list(pdfparser.iter_file_chunks(file_obj))
+        self.assertEqual(2, len(chunks))
+        self.assertTrue(file_obj.closed)
@@ -1,6 +1,7 @@
 from unittest import TestCase
 from django.core.paginator import Paginator
 from intake import utils
+from intake.services.pagination import CursorPage
 from django.test.testcases import _AssertNumQueriesContext
 from django.test import RequestFactory
 
@@ -68,6 +69,19 @@ class TestGetPageNavigationCounter(TestCase):
             }
         )
 
+    def test_cursor_pages(self):
+        first = CursorPage([1], 3, next_cursor='b')
+        middle = CursorPage([2], 3, next_cursor='c', previous_cursor='a')
+        last = CursorPage([3], 3, previous_cursor='b')
+        only = CursorPage([1], 1)
+        self.assertEqual(['next'], utils.get_page_navigation_counter(first))
+        self.assertEqual(
+            ['first', 'previous', 'next'],
+            utils.get_page_navigation_counter(middle))
+        self.assertEqual(
+            ['first', 'previous'], utils.get_page_navigation_counter(last))
+        self.assertEqual([], utils.get_page_navigation_counter(only))
+
 
 class AssertNumQueriesLessThanContext(_AssertNumQueriesContext):
 
@@ -102,3 +116,73 @@ class TestGetFormDataFromSession(TestCase):
         self.assertEqual(fetched['confirm_county_selection'], 'yes')
         self.assertEqual(
             fetched.getlist('counties'), ['alameda', 'contracosta'])
+
+
+class TestGetIdSetFingerprint(TestCase):
+
+    def test_ignores_order_and_duplicates(self):
+        self.assertEqual(
+            utils.get_id_set_fingerprint([3, 1, 2]),
+            utils.get_id_set_fingerprint(['2', 3, 1, 1]))
+
+    def test_differs_for_different_sets(self):
+        self.assertNotEqual(
+            utils.get_id_set_fingerprint([1, 2]),
+            utils.get_id_set_fingerprint([1, 2, 3]))
+        self.assertNotEqual(
+            utils.get_id_set_fingerprint([12]),
+            utils.get_id_set_fingerprint([1, 2]))
+
+
+class TestUnionFind(TestCase):
+
+    def test_merges_overlapping_pairs(self):
+        groups = utils.UnionFind()
+        for a, b in [(1, 2), (3, 4), (2, 3), (5, 6)]:
+            groups.union(a, b)
+        groups.find(7)
+        self.assertEqual(
+            sorted(map(sorted, groups.get_sets())),
+            [[1, 2, 3, 4], [5, 6], [7]])
+        self.assertEqual(
+            sorted(map(sorted, groups.get_sets(min_size=2))),
+            [[1, 2, 3, 4], [5, 6]])
+
+
+class TestLRUCache(TestCase):
+
+    def test_drops_least_recently_used(self):
+        cache = utils.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual((3, 1), (cache.hits, cache.misses))
+
+    def test_size_zero_stores_nothing(self):
+        cache = utils.LRUCache(0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+
+class TestParseUserAgent(TestCase):
+
+    def setUp(self):
+        utils._user_agent_cache.clear()
+
+    def test_parses_each_string_once(self):
+        user_agent_string = str(
+            'Mozilla/5.0 (Linux; Android 6.0.1; Z831 Build/MMB29M) '
+            'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.83 '
+            'Mobile Safari/537.36')
+        first = utils.parse_user_agent(user_agent_string)
+        second = utils.parse_user_agent(user_agent_string)
+        self.assertIs(first, second)
+        self.assertEqual('Android', second.os.family)
+        info = utils.get_user_agent_cache_info()
+        self.assertEqual(1, info['hits'])
+        self.assertEqual(1, info['misses'])
+        self.assertEqual(1, info['size'])
@@ -47,6 +47,7 @@ class TestThanksView(ApplicantFormViewBaseTestCase):
         visitor_id = self.client.session.get('visitor_id', None)
         self.assertEqual(applicant_id, None)
         self.assertEqual(visitor_id, None)
+        self.assertIsNone(self.client.session.get('visitor'))
 
     def test_shows_flash_messages(self):
         self.set_form_session_data(counties=['contracosta'])
@@ -91,6 +92,7 @@ class TestRAPSheetInstructionsView(ApplicantFormViewBaseTestCase):
         visitor_id = self.client.session.get('visitor_id', None)
         self.assertEqual(applicant_id, None)
         self.assertEqual(visitor_id, None)
+        self.assertIsNone(self.client.session.get('visitor'))
 
     def test_applicant_with_submission(self):
         submission = factories.FormSubmissionWithOrgsFactory.create(
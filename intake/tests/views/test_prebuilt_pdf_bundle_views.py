@@ -7,6 +7,7 @@ from django.test import TestCase
 from project.services import query_params
 from project.tests.utils import login
 from intake import models
+from user_accounts.models import Organization
 from intake.tests import factories as intake_factories
 from user_accounts.tests import factories as user_accounts_factories
 from project.tests.assertions import assertInLogsCount
@@ -195,3 +196,60 @@ class TestPrebuiltPDFBundleFileView(TestCase):
             query_params.get_url_for_ids(self.view_name, app_ids + [918274]))
         self.assertEqual(200, response.status_code)
         email_alert.assert_not_called()
+
+    @patch('django.db.transaction.on_commit', lambda func: func())
+    @patch('intake.tasks.run_pdf_bundle_build_job.delay')
+    @patch('project.alerts.send_email_to_admins')
+    def test_missing_prebuilt_starts_build_job(self, email_alert, delay):
+        app_ids = intake_factories.make_app_ids_for('sf_pubdef')
+        profile = user_accounts_factories.app_reviewer('sf_pubdef')
+        login(self.client, profile)
+        response = self.client.get(
+            query_params.get_url_for_ids(self.view_name, app_ids))
+        self.assertEqual(202, response.status_code)
+        job = models.PDFBundleBuildJob.objects.get()
+        delay.assert_called_once_with(job.id)
+        self.assertContains(
+            response, job.get_status_url(), status_code=202)
+        self.assertFalse(models.PrebuiltPDFBundle.objects.exists())
+
+
+class TestPDFBundleBuildJobStatusView(TestCase):
+    fixtures = ['groups']
+
+    def make_job(self, org_slug, **kwargs):
+        job = models.PDFBundleBuildJob(
+            organization=Organization.objects.get(slug=org_slug),
+            **kwargs)
+        job.save()
+        return job
+
+    def test_returns_job_status(self):
+        job = self.make_job('sf_pubdef', status='running', progress=50)
+        profile = user_accounts_factories.app_reviewer('sf_pubdef')
+        login(self.client, profile)
+        response = self.client.get(job.get_status_url())
+        self.assertEqual(
+            dict(status='running', progress=50, pdf_url=None),
+            response.json())
+
+    def test_includes_pdf_url_when_done(self):
+        prebuilt = intake_factories.PrebuiltPDFBundleFactory()
+        prebuilt.applications.add(
+            *intake_factories.make_app_ids_for('sf_pubdef'))
+        job = self.make_job(
+            'sf_pubdef', status='done', progress=100,
+            prebuilt_pdf_bundle=prebuilt)
+        profile = user_accounts_factories.app_reviewer('sf_pubdef')
+        login(self.client, profile)
+        response = self.client.get(job.get_status_url())
+        self.assertEqual(prebuilt.get_absolute_url(), response.json()[
+            'pdf_url'])
+
+    @patch('project.alerts.send_email_to_admins')
+    def test_user_from_other_org_gets_not_allowed(self, email_alert):
+        job = self.make_job('sf_pubdef')
+        profile = user_accounts_factories.app_reviewer('a_pubdef')
+        login(self.client, profile)
+        response = self.client.get(job.get_status_url())
+        self.assertRedirects(response, reverse('user_accounts-profile'))
@@ -6,6 +6,7 @@ from project.services import query_params
 from project.tests.utils import login
 from project.tests.assertions import assertInLogsCount
 from intake.tests import factories as intake_factories
+import intake.services.pdf_service as PDFService
 from user_accounts.tests import factories as user_accounts_factories
 
 
@@ -59,6 +60,36 @@ class TestCasePrintoutPDFView(TestCase):
         assertInLogsCount(logs, {'event_name=app_opened': 1})
         assertInLogsCount(logs, {'event_name=user_app_opened': 1})
 
+    @patch('intake.notifications.slack_submissions_viewed.send')
+    def test_matching_etag_returns_not_modified(self, slack):
+        profile = user_accounts_factories.app_reviewer('a_pubdef')
+        login(self.client, profile)
+        submission = intake_factories.make_apps_for(
+            'a_pubdef', count=1)[0].form_submission
+        url = reverse(
+            'intake-case_printout', kwargs=dict(submission_id=submission.id))
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response['ETag'])
+
+    @patch(
+        'intake.services.pdf_service.get_printout_args_for_submission',
+        wraps=PDFService.get_printout_args_for_submission)
+    @patch('intake.notifications.slack_submissions_viewed.send')
+    def test_printout_data_is_queried_once(self, slack, get_printout_args):
+        profile = user_accounts_factories.app_reviewer('a_pubdef')
+        login(self.client, profile)
+        submission = intake_factories.make_apps_for(
+            'a_pubdef', count=1)[0].form_submission
+        response = self.client.get(reverse(
+            'intake-case_printout', kwargs=dict(submission_id=submission.id)))
+        self.assertEqual(200, response.status_code)
+        get_printout_args.assert_called_once_with(
+            profile.user, submission)
+
 
 class TestPrintoutForApplicationsView(TestCase):
     view_name = 'intake-pdf_printout_for_apps'
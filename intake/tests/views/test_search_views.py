@@ -109,6 +109,15 @@ class TestApplicantAutocomplete(SearchViewTestCase):
         self.assertContainsComboSub(response)
         self.assertNotContainsOtherSubs(response)
 
+    def test_fuzzy_search_finds_misspelled_names(self):
+        self.login_as_org_user()
+        response = self.client.post(
+            reverse(self.view_name), {'q': 'Borjes', 'fuzzy': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContainsTheseSubs(response)
+        self.assertContainsComboSub(response)
+        self.assertNotContainsOtherSubs(response)
+
 
 class TestFollowupsAutocomplete(SearchViewTestCase):
     view_name = 'followups-autocomplete'
@@ -154,3 +163,12 @@ class TestFollowupsAutocomplete(SearchViewTestCase):
         self.assertContainsTheseSubs(response)
         self.assertContainsComboSub(response)
         self.assertContainsOtherSubs(response)
+
+    def test_fuzzy_search_finds_misspelled_names(self):
+        self.login_as_staff_user()
+        response = self.client.post(
+            reverse(self.view_name), {'q': 'Jorje Borjes', 'fuzzy': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContainsTheseSubs(response)
+        self.assertContainsComboSub(response)
+        self.assertContainsOtherSubs(response)
@@ -125,6 +125,10 @@ urlpatterns = [
         login_required(prebuilt_pdf_bundle_views.file_view),
         name='intake-pdf_bundle_file_view'),
 
+    url(r'^applications/pdf/jobs/(?P<job_id>[0-9]+)/$',
+        login_required(prebuilt_pdf_bundle_views.build_job_status),
+        name='intake-pdf_bundle_build_job_status'),
+
     url(r'^applications/unread/pdf/printout$',
         login_required(printout_views.printout_for_apps),
         name='intake-pdf_printout_for_apps'),
@@ -1,5 +1,10 @@
 import random
+import hashlib
 import datetime
+import threading
+from collections import OrderedDict
+import user_agents
+from django.conf import settings
 from django.db import models
 from django.http.request import QueryDict
 from django.utils import timezone
@@ -91,6 +96,107 @@ def coerce_to_ids(items):
             yield item
 
 
+def get_id_set_fingerprint(items):
+    """Returns a sha256 hex digest identifying a set of ids (or model
+    instances), regardless of order or duplicates
+    """
+    ids = sorted(set(int(item_id) for item_id in coerce_to_ids(items)))
+    id_string = ','.join(str(item_id) for item_id in ids)
+    return hashlib.sha256(id_string.encode('utf-8')).hexdigest()
+
+
+class UnionFind:
+    """Groups items into disjoint sets, for merging overlapping pairs
+    without rescanning the sets found so far
+    """
+
+    def __init__(self):
+        self.parents = {}
+
+    def find(self, item):
+        self.parents.setdefault(item, item)
+        root = item
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # point everything on the path straight at the root
+        while self.parents[item] != root:
+            self.parents[item], item = root, self.parents[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parents[root_b] = root_a
+
+    def get_sets(self, min_size=1):
+        sets = {}
+        for item in self.parents:
+            sets.setdefault(self.find(item), set()).add(item)
+        return [group for group in sets.values() if len(group) >= min_size]
+
+
+class LRUCache:
+    """A thread safe mapping that holds at most `maxsize` items, dropping
+    the least recently used. A maxsize of 0 disables it.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_user_agent_cache = LRUCache(getattr(settings, 'USER_AGENT_CACHE_SIZE', 0))
+
+
+def parse_user_agent(user_agent_string):
+    """Returns `user_agents.parse(user_agent_string)`, from a cache of
+    recently parsed strings when possible, because parsing runs a long
+    series of regular expressions
+    """
+    user_agent = _user_agent_cache.get(user_agent_string)
+    if user_agent is None:
+        user_agent = user_agents.parse(user_agent_string)
+        _user_agent_cache.set(user_agent_string, user_agent)
+    return user_agent
+
+
+def get_user_agent_cache_info():
+    return dict(
+        hits=_user_agent_cache.hits,
+        misses=_user_agent_cache.misses,
+        size=len(_user_agent_cache.items),
+        maxsize=_user_agent_cache.maxsize)
+
+
 def is_the_weekend():
     """datetime.weekday() returns 0 for Monday, 6 for Sunday
     """
@@ -101,7 +207,17 @@ def get_page_navigation_counter(page, wing_size=3, gap_symbol='jump'):
     """Takes a Page object (see django.core.paginator)
         returns a list of page numbers suitable for a pagination nav
         wing_size is at least 3
+
+        For a CursorPage (see intake.services.pagination), which has no
+        page numbers, returns the names of the available links instead
     """
+    if getattr(page, 'is_cursor_page', False):
+        links = []
+        if page.has_previous():
+            links += ['first', 'previous']
+        if page.has_next():
+            links.append('next')
+        return links
     wing_size = max(wing_size, 3)
     total = page.paginator.num_pages
     full_range = list(page.paginator.page_range)
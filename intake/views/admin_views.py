@@ -2,7 +2,7 @@ from django.shortcuts import redirect, get_object_or_404
 from django.core.urlresolvers import reverse_lazy, reverse
 from django.views.generic import View
 from django.views.generic.base import TemplateView
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.template.response import TemplateResponse
 
 from project.services.query_params import get_url_for_ids
@@ -14,9 +14,11 @@ import intake.services.bundles as BundlesService
 import intake.services.tags as TagsService
 import intake.services.pdf_service as PDFService
 import intake.services.display_form_service as DisplayFormService
+import intake.services.pdf_bundle_jobs as PDFBundleJobsService
 
 from intake.views.base_views import (
-    ViewAppDetailsMixin, not_allowed, NoBrowserCacheOnGetMixin)
+    ViewAppDetailsMixin, not_allowed, NoBrowserCacheOnGetMixin,
+    pdf_bundle_build_job_response)
 from intake.views.app_detail_views import ApplicationDetail
 
 
@@ -53,22 +55,22 @@ class FilledPDF(ApplicationDetail):
 
 
 def get_tabs_for_org_user(organization, active_tab):
+    counts = AppsService.get_application_counts_for_org(organization)
     tabs = [
         {
             'url': reverse('intake-app_unread_index'),
             'label': 'Unread',
-            'count': AppsService.get_unread_apps_per_org_count(organization),
+            'count': counts['unread'],
             'is_active': False},
         {
             'url': reverse('intake-app_needs_update_index'),
             'label': 'Needs Status Update',
-            'count': AppsService.get_needs_update_apps_per_org_count(
-                organization),
+            'count': counts['needs_update'],
             'is_active': False},
         {
             'url': reverse('intake-app_all_index'),
             'label': 'All',
-            'count': AppsService.get_all_apps_per_org_count(organization),
+            'count': counts['total'],
             'is_active': False}
     ]
 
@@ -107,32 +109,39 @@ class ApplicationIndex(ViewAppDetailsMixin, TemplateView):
             context['ALL_TAG_NAMES'] = TagsService.get_all_used_tag_names()
             context['results'] = \
                 SubmissionsService.get_submissions_for_followups(
-                    self.request.GET.get('page'))
+                    *self.get_page_args())
             context['app_index_tabs'] = get_tabs_for_staff_user()
             context['app_index_scope_title'] = "All Applications"
         else:
             context['results'] = \
                 AppsService.get_all_applications_for_org_user(
-                    self.request.user, self.request.GET.get('page'))
+                    self.request.user, *self.get_page_args())
             context['app_index_tabs'], count = get_tabs_for_org_user(
                 self.request.user.profile.organization, 'All')
             context['app_index_scope_title'] = "All Applications To {}".format(
                 self.request.user.profile.organization.name)
             if count == 0:
                 context['no_results'] = "You have no applications."
-        context['page_counter'] = \
-            utils.get_page_navigation_counter(
-                page=context['results'],
-                wing_size=9)
+        context['page_counter'] = self.get_page_counter(context['results'])
 
         return context
 
+    def get_page_args(self):
+        """Returns the page number and cursor from the query string. Pages
+        are found by cursor unless a page number is given.
+        """
+        return self.request.GET.get('page'), self.request.GET.get('cursor')
+
+    def get_page_counter(self, results):
+        return utils.get_page_navigation_counter(page=results, wing_size=9)
+
 
 class ApplicationUnreadIndex(NoBrowserCacheOnGetMixin, ApplicationIndex):
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
         context['results'] = AppsService.get_unread_applications_for_org_user(
-                self.request.user, self.request.GET.get('page'))
+                self.request.user, *self.get_page_args())
+        context['page_counter'] = self.get_page_counter(context['results'])
         context['app_index_tabs'], count = get_tabs_for_org_user(
             self.request.user.profile.organization, 'Unread')
         context['app_index_scope_title'] = "{} Unread Applications".format(
@@ -161,7 +170,8 @@ class ApplicationNeedsUpdateIndex(ApplicationUnreadIndex):
         context = super().get_context_data(*args, **kwargs)
         context['results'] = \
             AppsService.get_applications_needing_updates_for_org_user(
-                self.request.user, self.request.GET.get('page'))
+                self.request.user, *self.get_page_args())
+        context['page_counter'] = self.get_page_counter(context['results'])
         context['app_index_tabs'], count = get_tabs_for_org_user(
             self.request.user.profile.organization,
             'Needs Status Update')
@@ -244,7 +254,7 @@ class ApplicationBundleDetail(ApplicationDetail):
             bundle=bundle,
             forms=forms,
             count=len(submissions),
-            show_pdf=bool(bundle.bundled_pdf),
+            show_pdf=bool(bundle.bundled_pdf) or bundle.should_have_a_pdf(),
             app_ids=[sub.id for sub in submissions],
             bundled_pdf_url=bundle.get_pdf_bundle_url())
         BundlesService.mark_opened(bundle, request.user)
@@ -260,11 +270,17 @@ class ApplicationBundleDetailPDFView(ViewAppDetailsMixin, View):
     def get(self, request, bundle_id):
         bundle = get_object_or_404(models.ApplicationBundle, pk=int(bundle_id))
         has_access = request.user.profile.should_have_access_to(bundle)
-        if not bundle.bundled_pdf or not has_access:
+        needs_pdf = not bundle.bundled_pdf and bundle.should_have_a_pdf()
+        if not has_access or not (bundle.bundled_pdf or needs_pdf):
             raise Http404(
                 "There doesn't seem to be a PDF associated with these "
                 "applications. If you think this is an error, please contact "
                 "Code for America.")
+        if needs_pdf:
+            # the pdf is built in the background, never in the request
+            job = PDFBundleJobsService.get_or_start_job_for_application_bundle(
+                bundle)
+            return pdf_bundle_build_job_response(request, job)
         BundlesService.mark_opened(bundle, request.user)
         return HttpResponse(bundle.bundled_pdf, content_type="application/pdf")
 
@@ -356,10 +372,11 @@ class CaseBundlePrintoutPDFView(ViewAppDetailsMixin, View):
             return not_allowed(request)
         BundlesService.mark_opened(
             bundle, request.user, send_slack_notification=False)
-        filename, pdf_bytes = PDFService.get_concatenated_printout_for_bundle(
-            request.user, bundle)
-        response = HttpResponse(
-            pdf_bytes, content_type='application/pdf')
+        filename, pdf_chunks = \
+            PDFService.get_concatenated_printout_for_bundle(
+                request.user, bundle)
+        response = StreamingHttpResponse(
+            pdf_chunks, content_type='application/pdf')
         response['Content-Disposition'] = 'filename="{}"'.format(filename)
         return response
 
@@ -36,7 +36,10 @@ class ApplicationDetail(ViewAppDetailsMixin, TemplateView):
             DisplayFormService.get_display_form_for_user_and_submission(
                 self.request.user, self.submission)
         applications = models.Application.objects.filter(
-            form_submission=self.submission)
+            form_submission=self.submission
+        ).select_related(
+            'latest_status_update__status_type',
+            'latest_status_update__author__profile')
         if not self.request.user.is_staff:
             applications = applications.filter(
                 organization=self.request.user.profile.organization)
@@ -46,11 +49,9 @@ class ApplicationDetail(ViewAppDetailsMixin, TemplateView):
                     applicant_name=self.submission.get_full_name())
                 messages.success(self.request, message)
         for application in applications:
-            if application.status_updates.exists():
-                # latest_status is cached on the model instance
-                # for easier template randering. It is not saved to the db
-                application.latest_status = \
-                    application.status_updates.latest('updated')
+            # latest_status is cached on the model instance
+            # for easier template rendering. It is not saved to the db
+            application.latest_status = application.latest_status_update
         context.update(
             form=display_form,
             submission=self.submission,
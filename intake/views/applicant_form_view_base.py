@@ -116,4 +116,4 @@ class ApplicantFormViewBase(FormView):
 def clear_form_session_data(request):
     utils.clear_session_data(
         request, ApplicantFormViewBase.session_key, 'applicant_id',
-        'visitor_id')
+        'visitor_id', 'visitor')
@@ -2,6 +2,7 @@ from django.shortcuts import redirect
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.core.urlresolvers import reverse
 from django.contrib import messages
+from django.template.response import TemplateResponse
 from project import alerts
 from project.services import query_params
 from project.exceptions import InvalidQueryParamsError
@@ -112,3 +113,11 @@ def not_allowed(
             flash_message=NOT_ALLOWED_MESSAGE,
             error_messages=error_messages))
     return redirect(redirect_view)
+
+
+def pdf_bundle_build_job_response(request, job):
+    """An HTML page that polls the status of a PDFBundleBuildJob and then
+    redirects to the finished pdf
+    """
+    return TemplateResponse(
+        request, "pdf_bundle_build_job.jinja", dict(job=job), status=202)
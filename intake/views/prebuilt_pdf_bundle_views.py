@@ -1,10 +1,15 @@
 from django.views.generic.base import View, TemplateView
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
 from project.services import query_params
-from intake.views.base_views import ViewAppDetailsMixin, AppIDQueryParamMixin
+from intake import models
+from intake.views.base_views import (
+    ViewAppDetailsMixin, AppIDQueryParamMixin, not_allowed,
+    pdf_bundle_build_job_response)
 from intake.services import applications_service as AppsService
 from intake.services import pdf_service as PDFService
 from intake.services import messages_service as MessagesService
+from intake.services import pdf_bundle_jobs as PDFBundleJobsService
 
 
 def get_multiple_apps_read_flash(count):
@@ -43,19 +48,40 @@ class PrebuiltPDFBundleWrapperView(
 class PrebuiltPDFBundleFileView(
         ViewAppDetailsMixin, AppIDQueryParamMixin, View):
     """This view returns the PDF file associated with a NewAppsPDF
-        If the prebuilt pdf does not exist, it emails a warning and then builds
-        one on the fly (which might time out)
+        If the prebuilt pdf does not exist, it emails a warning, starts a
+        background job to build it, and returns a page that waits for the
+        job to finish
     """
-    def dispatch(self, *args, **kwargs):
-        response = super().dispatch(*args, **kwargs)
-        return response
 
     def request_valid(self, request):
-        newapps_pdf = PDFService.get_or_create_prebuilt_pdf_for_app_ids(
-            self.app_ids)
-        return HttpResponse(
-            newapps_pdf.pdf, content_type="application/pdf")
+        app_ids = list(
+            AppsService.get_valid_application_ids_from_set(self.app_ids))
+        newapps_pdf = PDFService.get_prebuilt_pdf_bundle_for_app_id_set(
+            app_ids)
+        if newapps_pdf:
+            return HttpResponse(
+                newapps_pdf.pdf, content_type="application/pdf")
+        job = PDFBundleJobsService.get_or_start_job_for_app_ids(
+            self.organization, app_ids)
+        return pdf_bundle_build_job_response(request, job)
+
+
+class PDFBundleBuildJobStatusView(ViewAppDetailsMixin, View):
+    """Returns the status of a PDFBundleBuildJob as JSON
+    """
+
+    def get(self, request, job_id):
+        job = get_object_or_404(models.PDFBundleBuildJob, pk=int(job_id))
+        has_access = request.user.is_staff or (
+            request.user.profile.organization_id == job.organization_id)
+        if not has_access:
+            return not_allowed(request)
+        return JsonResponse(dict(
+            status=job.status,
+            progress=job.progress,
+            pdf_url=job.get_pdf_url()))
 
 
 wrapper_view = PrebuiltPDFBundleWrapperView.as_view()
 file_view = PrebuiltPDFBundleFileView.as_view()
+build_job_status = PDFBundleBuildJobStatusView.as_view()
@@ -1,4 +1,6 @@
-from django.http import HttpResponse
+from django.http import (
+    HttpResponse, HttpResponseNotModified, StreamingHttpResponse)
+from django.utils.http import parse_etags, quote_etag
 from django.shortcuts import get_object_or_404
 from django.views.generic.base import View
 from intake import models
@@ -13,7 +15,9 @@ class CasePrintoutPDFView(ApplicationDetail):
     """Serves a PDF with full case details, based on the details
     needed by the user's organization
 
-    The PDF is created on the fly
+    The PDF is created on the fly, unless it has been cached. The cache key
+    is used as an ETag so that browsers can reuse printouts they already
+    have.
     """
     def get(self, request, submission_id):
         submission = get_object_or_404(
@@ -25,20 +29,35 @@ class CasePrintoutPDFView(ApplicationDetail):
             submission.applications.all(), request.user)
         AppsService.handle_apps_opened(
             self, apps, send_slack_notification=False)
-        filename, pdf_bytes = PDFService.get_printout_for_submission(
+        # the queries for the printout are made once, for both the key and
+        # the rendering
+        printout_args = PDFService.get_printout_args_for_submission(
             request.user, submission)
-        response = HttpResponse(pdf_bytes, content_type='application/pdf')
-        response['Content-Disposition'] = 'filename="{}"'.format(filename)
+        printout_key = PDFService.get_printout_key(printout_args)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        if printout_key in parse_etags(if_none_match):
+            response = HttpResponseNotModified()
+        else:
+            filename, pdf_bytes = PDFService.get_printout(printout_args)
+            response = HttpResponse(
+                pdf_bytes, content_type='application/pdf')
+            response['Content-Disposition'] = 'filename="{}"'.format(
+                filename)
+        response['ETag'] = quote_etag(printout_key)
+        response['Cache-Control'] = 'private, no-cache'
         return response
 
 
 class PrintoutForApplicationsView(
         ViewAppDetailsMixin, AppIDQueryParamMixin, View):
     def request_valid(self, request, *args, **kwargs):
-        apps = models.Application.objects.filter(id__in=self.app_ids)
-        filename, pdf_bytes = \
+        apps = models.Application.objects.filter(
+            id__in=self.app_ids
+        ).select_related('form_submission', 'organization__county')
+        filename, pdf_chunks = \
             PDFService.get_concatenated_printout_for_applications(apps)
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
+        response = StreamingHttpResponse(
+            pdf_chunks, content_type="application/pdf")
         response['Content-Disposition'] = 'filename="{}"'.format(filename)
         return response
 
@@ -11,6 +11,8 @@ class SearchAPIBaseView(View):
     """A base view that:
         - only accepts POST
         - stores POST 'q' as self.query
+        - stores whether POST 'fuzzy' was set as self.fuzzy, to match
+          misspelled names
         - renders a queryset with a serializer
     """
 
@@ -22,6 +24,7 @@ class SearchAPIBaseView(View):
     def post(self, request):
         self.request = request
         self.query = request.POST.get('q', '')
+        self.fuzzy = bool(request.POST.get('fuzzy'))
         if not self.query:
             return HttpResponse(status=404)
         qset = self.get_queryset()
@@ -34,20 +37,20 @@ class ApplicationSearchAPIView(SearchAPIBaseView):
     """Takes in a POST with `q` querystring,
         returns a JSON of applications with 'name', 'url' attributes
     """
-    serializer = serializers.ApplicationAutocompleteSerializer
+    serializer = serializers.ApplicationSearchEntrySerializer
 
     def user_is_okay(self, user):
         return user.is_authenticated
 
     def get_queryset(self):
-        qset = SearchService.get_applications_with_query_string(
-            self.query
-        ).select_related('form_submission').order_by('-created')
+        organization_id = None
         if not self.request.user.is_staff:
-            qset = qset.filter(
-                organization__profiles__user_id=self.request.user.id
-            )
-        return qset
+            organization_id = self.request.user.profile.organization_id
+        if self.fuzzy:
+            return SearchService.get_fuzzy_search_entries(
+                self.query, organization_id)
+        return SearchService.get_search_entries_with_query_string(
+            self.query, organization_id)
 
     def get_response(self, data):
         json = JSONRenderer().render(data)
@@ -66,6 +69,9 @@ class FollowupSearchAPIView(SearchAPIBaseView, TemplateResponseMixin):
 
     def get_queryset(self):
         submissions = SubmissionsService.get_submissions_for_staff_user()
+        if self.fuzzy:
+            return SearchService.fuzzy_filter_submissions_with_querystring(
+                submissions, self.query)
         return SearchService.filter_submissions_with_querystring(
             submissions, self.query)
 
@@ -22,12 +22,11 @@ class StatusUpdateBase:
         submission_id = int(submission_id)
         self.application = models.Application.objects.filter(
             form_submission=submission_id,
-            organization=request.user.profile.organization).first()
+            organization=request.user.profile.organization
+        ).select_related('latest_status_update').first()
         if self.application:
             self.application.latest_status = \
-                models.StatusUpdate.objects.filter(
-                    application_id=self.application.id
-                ).order_by('-created').first()
+                self.application.latest_status_update
         self.submission = models.FormSubmission.objects.filter(
             id=submission_id).first()
 
@@ -1,20 +1,42 @@
 from django.conf import settings
-from mixpanel import Mixpanel
+from mixpanel import Mixpanel, BufferedConsumer, MixpanelException
 from . import logging_service
 
 
+# the most events that mixpanel accepts in one request
+MIXPANEL_BATCH_LIMIT = 50
+
 _mixpanel_client = None
 
 
+class UnsentEventsError(Exception):
+    """Raised when a batch of events could not be sent to mixpanel. Events
+    in earlier batches were sent, and `events` holds the rest.
+    """
+
+    def __init__(self, events, error):
+        super().__init__(str(error))
+        self.events = events
+
+
+def get_mixpanel_key():
+    return getattr(settings, 'MIXPANEL_KEY', None)
+
+
 def get_mixpanel_client():
     global _mixpanel_client
     if _mixpanel_client is None:
-        mixpanel_key = getattr(settings, 'MIXPANEL_KEY', None)
+        mixpanel_key = get_mixpanel_key()
         if mixpanel_key:
             _mixpanel_client = Mixpanel(mixpanel_key)
     return _mixpanel_client
 
 
+def should_send_to_mixpanel():
+    divert = getattr(settings, 'DIVERT_REMOTE_CONNECTIONS', False)
+    return bool(get_mixpanel_key()) and not divert
+
+
 def log_to_mixpanel(distinct_id, event_name, **data):
     client = get_mixpanel_client()
     divert = getattr(settings, 'DIVERT_REMOTE_CONNECTIONS', False)
@@ -26,3 +48,35 @@ def log_to_mixpanel(distinct_id, event_name, **data):
         client.track(**mixpanel_kwargs)
     logging_service.format_and_log(
         log_type='call_to_mixpanel', **mixpanel_kwargs)
+
+
+def send_batch(events):
+    """Sends up to MIXPANEL_BATCH_LIMIT events in one request to the
+    mixpanel track endpoint
+    """
+    consumer = BufferedConsumer(max_size=MIXPANEL_BATCH_LIMIT)
+    client = Mixpanel(get_mixpanel_key(), consumer=consumer)
+    for event in events:
+        client.track(**event)
+    consumer.flush()
+
+
+def log_events_to_mixpanel(events):
+    """Sends a list of events to mixpanel in as few requests as possible.
+    Each event is a dict of `log_to_mixpanel` keyword arguments, with the
+    event properties in 'properties'.
+
+    Raises UnsentEventsError with the events that were not sent if a
+    request fails.
+    """
+    send = should_send_to_mixpanel()
+    for start in range(0, len(events), MIXPANEL_BATCH_LIMIT):
+        batch = events[start:start + MIXPANEL_BATCH_LIMIT]
+        if send:
+            try:
+                send_batch(batch)
+            except MixpanelException as error:
+                raise UnsentEventsError(events[start:], error)
+        for event in batch:
+            logging_service.format_and_log(
+                log_type='call_to_mixpanel', **event)
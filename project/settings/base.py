@@ -55,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.SessionAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'intake.middleware.CollectEventsMiddleware',
     'intake.middleware.UserAgentMiddleware',
     'intake.middleware.PersistReferrerMiddleware',
     'intake.middleware.PersistSourceMiddleware',
@@ -184,6 +185,28 @@ USE_L10N = True
 USE_TZ = True
 
 PDFPARSER_PATH = os.path.join(REPO_DIR, 'intake', 'pdfparser.jar')
+# seconds before a single pdfparser command is killed
+PDFPARSER_TIMEOUT = 300
+# directory for pdfparser input & output files. Point this at a tmpfs such as
+# /dev/shm to keep them in memory. Defaults to the system temp directory.
+PDFPARSER_TMP_PATH = os.environ.get('PDFPARSER_TMP_PATH')
+# how many pdfparser processes a batch fill may run at once
+PDFPARSER_CONCURRENCY = int(os.environ.get('PDFPARSER_CONCURRENCY', 2))
+# how many processes render case details printouts for many applications
+PRINTOUT_PROCESSES = int(os.environ.get('PRINTOUT_PROCESSES', 2))
+# total size of cached printouts before the least recently used are deleted
+PRINTOUT_CACHE_MAX_BYTES = int(
+    os.environ.get('PRINTOUT_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+# seconds to cache the application counts shown in app index tabs
+APPLICATION_COUNTS_CACHE_TIMEOUT = 60 * 60 * 24
+# mixpanel events are sent in batches of this many events, or this many
+# seconds after the first event in a batch
+MIXPANEL_EVENT_BATCH_SIZE = 50
+MIXPANEL_EVENT_BATCH_SECONDS = 5
+# number of visitors kept in memory by each process
+VISITOR_CACHE_SIZE = 10000
+# number of parsed user agent strings kept in memory by each process
+USER_AGENT_CACHE_SIZE = 1000
 
 # AWS uploads
 AWS_S3_FILE_OVERWRITE = False
@@ -5,6 +5,17 @@ DEBUG = True
 
 INTERNAL_IPS = ['127.0.0.1', '::1']
 CELERY_TASK_ALWAYS_EAGER = True
+# send each mixpanel event as soon as it happens, so that tests can check
+# the logs right away
+MIXPANEL_EVENT_BATCH_SIZE = 1
+
+# test databases are rolled back between tests, but a local memory cache
+# is not, so don't cache between tests
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
 
 DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
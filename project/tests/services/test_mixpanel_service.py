@@ -0,0 +1,43 @@
+from django.test import TestCase, override_settings
+from mixpanel import MixpanelException
+from project.services import mixpanel_service
+from unittest.mock import patch
+from logging import INFO
+
+
+def make_events(count):
+    return [
+        dict(distinct_id=str(i), event_name='tested', properties={'i': i})
+        for i in range(count)]
+
+
+@override_settings(MIXPANEL_KEY='key', DIVERT_REMOTE_CONNECTIONS=False)
+class TestLogEventsToMixpanel(TestCase):
+
+    @patch('project.services.mixpanel_service.send_batch')
+    def test_sends_events_in_batches(self, send_batch):
+        events = make_events(120)
+        with self.assertLogs(
+                'project.services.logging_service', INFO) as logs:
+            mixpanel_service.log_events_to_mixpanel(events)
+        self.assertEqual(
+            [50, 50, 20],
+            [len(call[0][0]) for call in send_batch.call_args_list])
+        self.assertEqual(120, len(logs.output))
+
+    @patch('project.services.mixpanel_service.send_batch')
+    def test_raises_unsent_events(self, send_batch):
+        send_batch.side_effect = [None, MixpanelException('down')]
+        events = make_events(120)
+        with self.assertRaises(mixpanel_service.UnsentEventsError) as context:
+            mixpanel_service.log_events_to_mixpanel(events)
+        self.assertEqual(events[50:], context.exception.events)
+
+    @override_settings(DIVERT_REMOTE_CONNECTIONS=True)
+    @patch('project.services.mixpanel_service.send_batch')
+    def test_does_not_send_diverted_events(self, send_batch):
+        with self.assertLogs(
+                'project.services.logging_service', INFO) as logs:
+            mixpanel_service.log_events_to_mixpanel(make_events(2))
+        send_batch.assert_not_called()
+        self.assertEqual(2, len(logs.output))
@@ -31,11 +31,16 @@ class OrganizationManager(models.Manager):
                 for org_id in coerce_to_ids(orgs)
             ]
             intake_models.Application.objects.bulk_create(applications)
+            intake_models.ApplicationSearchEntry.sync_for_submissions([sub])
+            intake_models.FormSubmission.update_org_set_fingerprints([sub.id])
+            intake_models.ApplicationCounts.refresh(coerce_to_ids(orgs))
 
     def remove_orgs_from_sub(self, *orgs):
         sub = self.extract_sub()
         if sub and orgs:
             sub.applications.filter(organization__in=orgs).delete()
+            intake_models.FormSubmission.update_org_set_fingerprints([sub.id])
+            intake_models.ApplicationCounts.refresh(coerce_to_ids(orgs))
 
 
 class Organization(models.Model):
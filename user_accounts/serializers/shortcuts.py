@@ -1,5 +1,5 @@
+from intake.serializers.shortcuts import plain_serializer
 from .user_serializer import UserMixpanelSerializer
 
 
-def mixpanel_user_data(user):
-    return UserMixpanelSerializer(user).data
+mixpanel_user_data = plain_serializer(UserMixpanelSerializer)